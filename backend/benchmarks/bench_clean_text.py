@@ -0,0 +1,57 @@
+"""
+clean_text microbenchmark on the messages of data/dataset/dataset.csv.
+
+Compares the precompiled single-pass normalizer against the original
+six-pass regex implementation.
+
+Run from the backend directory:
+    python -m benchmarks.bench_clean_text [--repeat 5] [--output results.json]
+"""
+import re
+import argparse
+
+from benchmarks.common import load_messages, time_call, summarize, write_results
+from src.utils.email_utils import clean_text
+
+
+def legacy_clean_text(text):
+    if not isinstance(text, str):
+        return text
+    text = re.sub(r'\$', ' dollar ', text)
+    text = re.sub(r'\£', ' pound ', text)
+    text = re.sub(r'\€', ' euro ', text)
+    text = re.sub(r'\b\d{3,}\b', ' num ', text)
+    text = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\u200B\u200C\u200D\u200E\u200F\uFEFF]', '', text)
+    text = text.encode("utf-16", "surrogatepass").decode("utf-16", "ignore")
+    text = text[:32767]
+    if text.startswith(("=", "+", "-", "@")):
+        text = "'" + text
+    return text
+
+
+def bench(fn, messages, repeat):
+    timings = summarize(time_call(lambda: [fn(text) for text in messages], repeat=repeat))
+    timings['messages_per_second'] = len(messages) / (timings['median_ms'] / 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_text microbenchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    messages = load_messages()['text'].tolist()
+    legacy = bench(legacy_clean_text, messages, args.repeat)
+    current = bench(clean_text, messages, args.repeat)
+    results = {
+        'messages': len(messages),
+        'legacy': legacy,
+        'current': current,
+        'speedup': legacy['median_ms'] / current['median_ms'],
+    }
+    write_results("clean_text", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cold-start benchmark.
+
+Every scenario runs in a fresh interpreter so imports, unpickling and page
+cache effects are measured the way an autoscaled instance sees them:
+- `eager_legacy`: the old startup path, loading the outputs/models pickles
+  before the app can answer anything.
+- `bundle` / `bundle_no_verify`: loading the same models from a versioned
+  joblib bundle, with and without checksum verification.
+- `background`: importing `main` and starting the app with background
+  loading; reports time to liveness, to readiness and to the first prediction.
+
+Run from the backend directory:
+    python -m benchmarks.bench_cold_start [--repeat 5] [--output results.json]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+from benchmarks.common import summarize, write_results
+from src.config.config import Config
+from src.utils.model_store import load_legacy_bundle, write_bundle
+
+PIPELINE_SCRIPT = """
+import time, json
+started = time.perf_counter()
+from src.pipeline.prediction_pipeline import PredictionPipeline
+imported = time.perf_counter()
+pipeline = PredictionPipeline(load_models=False)
+pipeline.config.bundle_dir = {bundle_dir!r}
+pipeline.config.auto_discover_bundles = False
+pipeline.config.verify_bundle_checksums = {verify!r}
+pipeline.ensure_loaded()
+loaded = time.perf_counter()
+pipeline.predict_single_email("Congratulations! You have won a free prize")
+print(json.dumps({{'import_ms': (imported - started) * 1000, 'ready_ms': (loaded - started) * 1000,
+                  'first_prediction_ms': (time.perf_counter() - started) * 1000}}))
+"""
+
+APP_SCRIPT = """
+import time, json
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+import main
+imported = time.perf_counter()
+with TestClient(main.app) as client:
+    client.get("/health/live").raise_for_status()
+    live = time.perf_counter()
+    while client.get("/health/ready").status_code != 200:
+        time.sleep(0.005)
+    ready = time.perf_counter()
+    client.post("/predict", json={'content': "Congratulations! You have won a free prize"}).raise_for_status()
+    first = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'live_ms': (live - started) * 1000,
+                  'ready_ms': (ready - started) * 1000, 'first_prediction_ms': (first - started) * 1000}))
+"""
+
+
+def run_script(script: str) -> Dict[str, float]:
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def measure(script: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    runs: List[Dict[str, float]] = [run_script(script) for _ in range(repeat)]
+    return {metric: summarize([run[metric] for run in runs]) for metric in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for model loading and API readiness")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    config = Config()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy = load_legacy_bundle(config.models_dir, config.feature_path, config.available_models, mmap=False)
+        bundle_dir = os.path.join(tmp_dir, "bundle")
+        write_bundle(bundle_dir, legacy.feature_transformer, legacy.models)
+
+        results = {
+            'models': list(legacy.models),
+            'eager_legacy': measure(PIPELINE_SCRIPT.format(bundle_dir=None, verify=False), args.repeat),
+            'bundle': measure(PIPELINE_SCRIPT.format(bundle_dir=bundle_dir, verify=True), args.repeat),
+            'bundle_no_verify': measure(PIPELINE_SCRIPT.format(bundle_dir=bundle_dir, verify=False), args.repeat),
+            'background': measure(APP_SCRIPT, args.repeat),
+        }
+    write_results("cold_start", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Linear fast path benchmark.
+
+Scores the loaded linear models (Logistic Regression, Naive Bayes, linear
+SVMs) two ways for several batch sizes: through sklearn (TF-IDF transform,
+then one predict_proba/decision_function call per model) and through the
+folded token->weight table of LinearScorer. Also reports the largest
+confidence difference between the two over the whole corpus.
+
+Run from the backend directory:
+    python -m benchmarks.bench_linear_scorer [--repeat 50] [--output results.json]
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.common import load_messages, time_call, summarize, write_results
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.email_utils import clean_text
+from src.utils.linear_scorer import LinearScorer
+from src.utils.scoring import inspect_model, score_single_pass
+
+
+def sklearn_score(vectorizer, models, texts):
+    features = vectorizer.transform(texts)
+    return {name: score_single_pass(model, inspect_model(model), features) for name, model in models.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Linear fast path benchmark")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    pipeline = PredictionPipeline(load_models=True)
+    vectorizer = pipeline.feature_transformer
+    scorer = LinearScorer.compile(vectorizer, pipeline.models)
+    if scorer is None:
+        raise SystemExit("None of the loaded models is linear")
+    models = {name: pipeline.models[name] for name in scorer.model_names}
+
+    texts = [clean_text(text) for text in load_messages()['text']]
+    fast, slow = scorer.score(texts), sklearn_score(vectorizer, models, texts)
+    agreement = {
+        name: {
+            'label_mismatches': sum(a != b for a, b in zip(fast[name][0], slow[name][0])),
+            'max_confidence_diff': float(np.max(np.abs(np.array(fast[name][1]) - slow[name][1]))),
+        }
+        for name in models
+    }
+
+    latency = {}
+    for batch_size in (1, 8, 64, 512):
+        batch = texts[:batch_size]
+        sklearn_timings = summarize(time_call(lambda: sklearn_score(vectorizer, models, batch), repeat=args.repeat))
+        fast_timings = summarize(time_call(lambda: scorer.score(batch), repeat=args.repeat))
+        latency[batch_size] = {
+            'sklearn': sklearn_timings,
+            'linear_scorer': fast_timings,
+            'speedup': sklearn_timings['median_ms'] / fast_timings['median_ms'],
+        }
+
+    results = {'models': list(models), 'messages': len(texts), 'agreement': agreement, 'latency': latency}
+    write_results("linear_scorer", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
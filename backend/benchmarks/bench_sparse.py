@@ -0,0 +1,110 @@
+"""
+Dense vs sparse feature benchmark.
+
+Compares memory footprint and latency of feeding the TF-IDF output to the
+models as a dense ndarray (the old `.toarray()` path) against feeding the CSR
+matrix directly, for both inference and training.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sparse [--output results.json]
+"""
+import argparse
+import time
+import tracemalloc
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+
+from benchmarks.common import load_messages, time_call, summarize, write_results
+from src.utils.email_utils import clean_text
+
+
+def matrix_nbytes(matrix) -> int:
+    if hasattr(matrix, "indptr"):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return matrix.nbytes
+
+
+def make_models():
+    return {
+        "SVM": SVC(kernel='sigmoid', gamma=1.0, probability=True),
+        "Naive_Bayes": MultinomialNB(),
+        "Random_Forest": RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=1),
+        "Logistic_Regression": LogisticRegression(max_iter=1000),
+    }
+
+
+def bench_training(X_sparse, y):
+    results = {}
+    for layout in ("dense", "sparse"):
+        for name, model in make_models().items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            X = X_sparse.toarray() if layout == "dense" else X_sparse
+            model.fit(X, y)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.setdefault(name, {})[layout] = {
+                'fit_seconds': elapsed,
+                'peak_traced_mb': peak / 1e6,
+            }
+    return results
+
+
+def bench_inference(vectorizer, X_train, y, emails, repeat):
+    results = {}
+    for layout in ("dense", "sparse"):
+        # Models must be fitted on the same layout they are served with (libsvm requirement)
+        X_fit = X_train.toarray() if layout == "dense" else X_train
+        for name, model in make_models().items():
+            model.fit(X_fit, y)
+
+            def score_one(model=model):
+                for email in emails:
+                    features = vectorizer.transform([clean_text(email)])
+                    if layout == "dense":
+                        features = features.toarray()
+                    model.predict_proba(features)
+
+            timings = summarize(time_call(score_one, repeat=repeat))
+            per_email_us = timings['median_ms'] * 1000 / len(emails)
+            results.setdefault(name, {})[layout] = dict(timings, per_email_us=per_email_us)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dense vs sparse TF-IDF benchmark")
+    parser.add_argument("--limit", type=int, default=None, help="Number of dataset rows to use")
+    parser.add_argument("--emails", type=int, default=200, help="Emails scored per inference run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    df = load_messages(args.limit)
+    cleaned = df['text'].apply(clean_text)
+    vectorizer = TfidfVectorizer(max_features=5000)
+    X_sparse = vectorizer.fit_transform(cleaned)
+    y = df['target']
+
+    single_row = vectorizer.transform([cleaned.iloc[0]])
+    results = {
+        'rows': X_sparse.shape[0],
+        'features': X_sparse.shape[1],
+        'memory': {
+            'train_matrix_dense_mb': X_sparse.shape[0] * X_sparse.shape[1] * 8 / 1e6,
+            'train_matrix_sparse_mb': matrix_nbytes(X_sparse) / 1e6,
+            'single_row_dense_bytes': matrix_nbytes(single_row.toarray()),
+            'single_row_sparse_bytes': matrix_nbytes(single_row),
+        },
+        'training': bench_training(X_sparse, y),
+        'inference': bench_inference(vectorizer, X_sparse, y, df['text'].head(args.emails).tolist(), args.repeat),
+    }
+    write_results("sparse_vs_dense", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+End-to-end benchmark suite on reproducible workloads.
+
+Measures, in one run:
+- `text`: clean_text throughput on the dataset messages and extract_body
+  throughput on seeded synthetic plain/HTML/multipart emails.
+- `pipeline`: single-email vs batch PredictionPipeline latency for each
+  model on its own and for the full ensemble (prediction cache disabled).
+- `api`: /predict latency percentiles under concurrent load, through an
+  in-process ASGI client with the app's lifespan (and micro-batcher) running.
+- `mbox`: scan rate of stream_mbox_predictions over a synthetic mbox.
+- `load`: in-process bundle load time, plus cold start from a fresh interpreter.
+
+Everything runs offline. Save a run with --output and pass it to a later
+run with --compare to print the change of every timing.
+
+Run from the backend directory:
+    python -m benchmarks.bench_suite [--quick] [--only text,api] [--output results.json] [--compare baseline.json]
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import load_messages, percentiles, summarize, time_call, write_results
+from benchmarks.workloads import synthetic_messages, synthetic_texts, write_synthetic_mbox
+from benchmarks.bench_cold_start import APP_SCRIPT, PIPELINE_SCRIPT, measure
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.email_utils import clean_text, extract_body
+from src.utils.linear_scorer import LinearScorer
+from src.utils.model_store import ModelBundle
+
+WORKLOADS = ("text", "pipeline", "api", "mbox", "load")
+# Larger is better for these metrics; for every other number smaller is better
+THROUGHPUT_SUFFIX = "_per_second"
+
+
+def throughput(fn, items: List[Any], repeat: int) -> Dict[str, float]:
+    timings = summarize(time_call(lambda: [fn(item) for item in items], repeat=repeat))
+    timings['items'] = len(items)
+    timings['items_per_second'] = len(items) / (timings['median_ms'] / 1000)
+    return timings
+
+
+def bench_text(sizes: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    messages = load_messages()['text'].tolist()
+    emails = synthetic_messages(sizes['emails'])
+    return {
+        'clean_text': throughput(clean_text, messages, repeat),
+        'extract_body': throughput(extract_body, emails, repeat),
+    }
+
+
+def load_pipeline() -> PredictionPipeline:
+    pipeline = PredictionPipeline(load_models=False)
+    # Every call must score; cache hits would measure a dictionary lookup
+    pipeline.cache = None
+    pipeline.ensure_loaded()
+    return pipeline
+
+
+def restrict(pipeline: PredictionPipeline, bundle: ModelBundle, names: List[str]) -> None:
+    """Serve only `names` from `bundle`, scored the way the full bundle scores them"""
+    subset = ModelBundle(version=bundle.version, path=bundle.path, feature_transformer=bundle.feature_transformer,
+                         models={name: bundle.models[name] for name in names}, manifest=bundle.manifest)
+    subset.tag_models()
+    if bundle.linear_scorer is not None:
+        subset.linear_scorer = LinearScorer.compile(subset.feature_transformer, subset.models)
+    pipeline.bundle = subset
+
+
+def bench_pipeline(sizes: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    pipeline = load_pipeline()
+    bundle = pipeline.bundle
+    texts = synthetic_texts(sizes['batch'], seed=1)
+    singles = texts[:sizes['single']]
+    results = {'model_version': bundle.version, 'batch_size': len(texts), 'models': {}}
+
+    for label, names in [(name, [name]) for name in bundle.models] + [("ensemble", list(bundle.models))]:
+        restrict(pipeline, bundle, names)
+        single = summarize(time_call(lambda: [pipeline.predict_single_email(text) for text in singles], repeat=repeat))
+        batch = summarize(time_call(lambda: pipeline.predict_batch(texts), repeat=repeat))
+        results['models'][label] = {
+            'single_ms_per_email': single['median_ms'] / len(singles),
+            'batch_ms': batch['median_ms'],
+            'batch_ms_per_email': batch['median_ms'] / len(texts),
+            'batch_emails_per_second': len(texts) / (batch['median_ms'] / 1000),
+        }
+    pipeline.bundle = bundle
+    return results
+
+
+async def _load_api(requests: int, concurrency: int) -> Dict[str, Any]:
+    import httpx
+    import main
+
+    if main.pipeline is None:
+        raise RuntimeError("The API has no model pipeline")
+    main.pipeline.cache = None
+    texts = synthetic_texts(requests, seed=2)
+    latencies: List[float] = []
+    errors = 0
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            while (await client.get("/health/ready")).status_code != 200:
+                if main.pipeline.load_error:
+                    raise RuntimeError(main.pipeline.load_error)
+                await asyncio.sleep(0.01)
+            queue = iter(texts)
+
+            async def worker() -> None:
+                nonlocal errors
+                for text in queue:
+                    started = time.perf_counter()
+                    response = await client.post("/predict", json={'content': text})
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    errors += response.status_code != 200
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+    return dict(percentiles(latencies), requests=requests, concurrency=concurrency, errors=errors,
+                batching=main.config.batching_enabled,
+                requests_per_second=requests / elapsed)
+
+
+def bench_api(sizes: Dict[str, int]) -> Dict[str, Any]:
+    return asyncio.run(_load_api(sizes['requests'], sizes['concurrency']))
+
+
+def bench_mbox(sizes: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    pipeline = load_pipeline()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_synthetic_mbox(os.path.join(tmp_dir, "bench.mbox"), sizes['mbox'], seed=3)
+        output_path = os.path.join(tmp_dir, "predictions.csv")
+        parse = summarize(time_call(lambda: sum(1 for _ in pipeline.iter_mailbox(path)), repeat=repeat))
+        scan = summarize(time_call(lambda: pipeline.stream_mbox_predictions(path, output_path, workers=1), repeat=repeat))
+        size_mb = os.path.getsize(path) / 2 ** 20
+    return {
+        'messages': sizes['mbox'],
+        'size_mb': size_mb,
+        'reader': pipeline.config.mbox_reader,
+        'parse_messages_per_second': sizes['mbox'] / (parse['median_ms'] / 1000),
+        'scan_ms': scan['median_ms'],
+        'scan_messages_per_second': sizes['mbox'] / (scan['median_ms'] / 1000),
+        'scan_mb_per_second': size_mb / (scan['median_ms'] / 1000),
+    }
+
+
+def bench_load(repeat: int) -> Dict[str, Any]:
+    pipeline = PredictionPipeline(load_models=False)
+    bundle_dir = pipeline._find_bundle()
+    verify = pipeline.config.verify_bundle_checksums
+    return {
+        'bundle_dir': bundle_dir,
+        'load': summarize(time_call(lambda: pipeline._read_bundle(bundle_dir), repeat=repeat)),
+        'cold_start_pipeline': measure(PIPELINE_SCRIPT.format(bundle_dir=bundle_dir, verify=verify), repeat),
+        'cold_start_app': measure(APP_SCRIPT, repeat),
+    }
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Relative change of every timing and rate present in both runs; positive `improvement` is better"""
+    now, before = flatten(current), flatten(baseline)
+    changes = {}
+    for name in sorted(set(now) & set(before)):
+        timing = "_ms" in name.rsplit(".", 1)[-1]
+        if not (timing or name.endswith(THROUGHPUT_SUFFIX)) or before[name] == 0:
+            continue
+        change = now[name] / before[name] - 1
+        changes[name] = {
+            'baseline': before[name],
+            'current': now[name],
+            'change': change,
+            'improvement': change if name.endswith(THROUGHPUT_SUFFIX) else -change,
+        }
+    return changes
+
+
+def run(workloads: List[str], quick: bool, repeat: Optional[int] = None) -> Dict[str, Any]:
+    sizes = ({'emails': 200, 'single': 20, 'batch': 64, 'requests': 200, 'concurrency': 16, 'mbox': 200} if quick else
+             {'emails': 2000, 'single': 100, 'batch': 256, 'requests': 2000, 'concurrency': 64, 'mbox': 5000})
+    repeat = repeat or (2 if quick else 5)
+    results = {'sizes': sizes, 'repeat': repeat}
+    for workload in workloads:
+        started = time.perf_counter()
+        if workload == "text":
+            results[workload] = bench_text(sizes, repeat)
+        elif workload == "pipeline":
+            results[workload] = bench_pipeline(sizes, repeat)
+        elif workload == "api":
+            results[workload] = bench_api(sizes)
+        elif workload == "mbox":
+            results[workload] = bench_mbox(sizes, repeat)
+        elif workload == "load":
+            results[workload] = bench_load(repeat)
+        print(f"{workload}: done in {time.perf_counter() - started:.1f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for text processing, scoring, the API and mbox scans")
+    parser.add_argument("--only", default=",".join(WORKLOADS), help=f"Comma-separated subset of {', '.join(WORKLOADS)}")
+    parser.add_argument("--quick", action="store_true", help="Small workloads for a fast smoke run")
+    parser.add_argument("--repeat", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    parser.add_argument("--compare", default=None, help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    workloads = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    results = run(workloads, args.quick, args.repeat)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        results['comparison'] = {'baseline_commit': baseline.get('commit'),
+                                 'changes': compare(results, baseline['results'])}
+    write_results("suite", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
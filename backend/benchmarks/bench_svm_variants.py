@@ -0,0 +1,73 @@
+"""
+SVM variant comparison report.
+
+Trains every `Config.svm_variant` on the same split of data/dataset/dataset.csv
+and reports accuracy, spam F1, training time, per-email latency (one
+predict_proba call per email, as /predict does without batching) and batch
+throughput. Variants the linear fast path can fold (see LinearScorer) also
+report their per-email latency through it, which is what the API pays.
+
+Run from the backend directory:
+    python -m benchmarks.bench_svm_variants [--emails 200] [--output results.json]
+"""
+import time
+import argparse
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from benchmarks.common import load_messages, time_call, summarize, write_results
+from src.components.model_factory import SVM_VARIANTS, build_svm
+from src.config.config import Config
+from src.utils.email_utils import clean_text
+from src.utils.linear_scorer import LinearScorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the SVM variants of Config.svm_variant")
+    parser.add_argument("--emails", type=int, default=200, help="Emails timed one at a time")
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    df = load_messages()
+    texts = [clean_text(text) for text in df['text']]
+    vectorizer = TfidfVectorizer(max_features=5000)
+    X = vectorizer.fit_transform(texts)
+    indices = list(range(len(texts)))
+    train_index, test_index = train_test_split(indices, test_size=0.2, random_state=42)
+    X_train, X_test = X[train_index], X[test_index]
+    y_train, y_test = df['target'].iloc[train_index], df['target'].iloc[test_index]
+    test_texts = [texts[index] for index in test_index[:args.emails]]
+
+    config = Config()
+    results = {'train_samples': X_train.shape[0], 'test_samples': X_test.shape[0], 'variants': {}}
+    for variant in SVM_VARIANTS:
+        model = build_svm(variant, config.svm_approx_components)
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        train_seconds = time.perf_counter() - started
+
+        y_pred = model.predict(X_test)
+        rows = [X_test[index] for index in range(min(args.emails, X_test.shape[0]))]
+        per_email = summarize([time_call(lambda: model.predict_proba(row), repeat=1)[0] for row in rows])
+        batch = summarize(time_call(lambda: model.predict_proba(X_test), repeat=3))
+
+        scorer = LinearScorer.compile(vectorizer, {"SVM": model})
+        fast_path = None
+        if scorer is not None:
+            fast_path = summarize([time_call(lambda: scorer.score([text]), repeat=1)[0] for text in test_texts])
+
+        results['variants'][variant] = {
+            'accuracy': accuracy_score(y_test, y_pred),
+            'spam_f1': f1_score(y_test, y_pred, pos_label=0),
+            'train_seconds': train_seconds,
+            'per_email_latency': per_email,
+            'per_email_fast_path_latency': fast_path,
+            'batch_emails_per_second': X_test.shape[0] / (batch['median_ms'] / 1000),
+        }
+    write_results("svm_variants", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Per-worker memory benchmark for serve.py.
+
+Starts the launcher with and without model preloading, sends a few requests
+to every worker, then reads /proc/<pid>/smaps_rollup for each worker. PSS
+(proportional set size) splits shared pages between the processes that map
+them, so the sum of PSS is the real memory cost of the deployment.
+
+Linux only. Run from the backend directory:
+    python -m benchmarks.bench_worker_rss --workers 4 [--output results.json]
+"""
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import subprocess
+import urllib.request
+from typing import Dict, List
+
+from benchmarks.common import write_results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def child_pids(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        'rss_kb': fields.get("Rss", 0),
+        'pss_kb': fields.get("Pss", 0),
+        'shared_kb': fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        'private_kb': fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def wait_until_ready(port: int, timeout: float = 120) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("Server did not become ready")
+
+
+def send_requests(port: int, count: int) -> None:
+    body = json.dumps({"content": "Congratulations! You have won a free prize, call now"}).encode("utf-8")
+    for _ in range(count):
+        request = urllib.request.Request(f"http://127.0.0.1:{port}/predict", data=body,
+                                         headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=10).read()
+
+
+def measure(workers: int, preload: bool, requests: int) -> Dict:
+    port = free_port()
+    command = [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port), "--host", "127.0.0.1"]
+    if not preload:
+        command.append("--no-preload")
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        # Workers that lazily finish loading need a moment after the first one answers
+        time.sleep(2)
+        send_requests(port, requests)
+        workers_memory = [memory_kb(pid) for pid in child_pids(process.pid)]
+        return {
+            'preload': preload,
+            'parent': memory_kb(process.pid),
+            'workers': workers_memory,
+            'total_pss_mb': (memory_kb(process.pid)['pss_kb'] + sum(w['pss_kb'] for w in workers_memory)) / 1024,
+            'mean_worker_pss_mb': sum(w['pss_kb'] for w in workers_memory) / len(workers_memory) / 1024,
+            'mean_worker_rss_mb': sum(w['rss_kb'] for w in workers_memory) / len(workers_memory) / 1024,
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker RSS/PSS benchmark for serve.py")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Optional path for the JSON results")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("This benchmark needs Linux /proc/<pid>/smaps_rollup")
+
+    results = {
+        'workers': args.workers,
+        'preloaded': measure(args.workers, preload=True, requests=args.requests),
+        'independent': measure(args.workers, preload=False, requests=args.requests),
+    }
+    write_results("worker_rss", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
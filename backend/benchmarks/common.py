@@ -0,0 +1,73 @@
+import json
+import time
+import platform
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.config.config import Config
+
+
+def load_messages(limit: Optional[int] = None) -> pd.DataFrame:
+    """Load the labeled SMS corpus as a DataFrame with `text` and `target` columns."""
+    df = pd.read_csv(Config().training_data_path)
+    df = df.rename(columns={'Category': 'target', 'Message': 'text'})
+    df['target'] = df['target'].map({'spam': 0, 'ham': 1})
+    if limit:
+        df = df.head(limit)
+    return df
+
+
+def time_call(fn: Callable, repeat: int = 5) -> List[float]:
+    """Run `fn` `repeat` times and return the wall-clock duration of each run in ms."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings_ms)
+    return {
+        'min_ms': ordered[0],
+        'median_ms': ordered[len(ordered) // 2],
+        'max_ms': ordered[-1],
+    }
+
+
+def percentiles(timings_ms: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 of per-request latencies in ms."""
+    ordered = sorted(timings_ms)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {'p50_ms': rank(50), 'p95_ms': rank(95), 'p99_ms': rank(99), 'max_ms': ordered[-1]}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def write_results(name: str, results: Dict, output_path: Optional[str] = None) -> None:
+    payload = {
+        'benchmark': name,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'commit': git_commit(),
+        'results': results,
+    }
+    text = json.dumps(payload, indent=2)
+    if output_path:
+        with open(output_path, 'w') as f:
+            f.write(text)
+    print(text)
@@ -0,0 +1,74 @@
+"""
+Seeded synthetic workloads for the benchmarks.
+
+The same seed always produces the same emails, so results from two commits
+are measured on identical inputs without shipping a mailbox with the repo.
+"""
+import random
+import mailbox
+from email.message import EmailMessage
+from typing import List
+
+SPAM_WORDS = [
+    "free", "winner", "prize", "claim", "urgent", "offer", "cash", "credit", "guaranteed", "click",
+    "congratulations", "exclusive", "limited", "bonus", "discount", "viagra", "lottery", "$1000", "£500",
+]
+HAM_WORDS = [
+    "meeting", "lunch", "tomorrow", "project", "report", "thanks", "call", "review", "schedule", "team",
+    "attached", "notes", "weekend", "dinner", "family", "update", "question", "draft", "agenda",
+]
+FILLER_WORDS = ["the", "a", "to", "and", "of", "for", "you", "your", "is", "on", "in", "we", "at", "this", "with"]
+KINDS = ("plain", "html", "multipart")
+
+
+def synthetic_text(rng: random.Random, min_words: int = 8, max_words: int = 120) -> str:
+    vocabulary = SPAM_WORDS if rng.random() < 0.3 else HAM_WORDS
+    words = [rng.choice(vocabulary) if rng.random() < 0.35 else rng.choice(FILLER_WORDS)
+             for _ in range(rng.randint(min_words, max_words))]
+    if rng.random() < 0.2:
+        words.append(str(rng.randint(10000, 99999999)))
+    return " ".join(words).capitalize() + "."
+
+
+def synthetic_texts(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [synthetic_text(rng) for _ in range(n)]
+
+
+def synthetic_message(rng: random.Random, index: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = f"sender{rng.randint(1, 500)}@example.com"
+    message["To"] = f"user{rng.randint(1, 50)}@example.org"
+    message["Subject"] = synthetic_text(rng, 2, 8)
+    message["Date"] = "Mon, 06 Jan 2025 10:00:00 +0000"
+    message["Message-ID"] = f"<bench-{index}@example.com>"
+    text = synthetic_text(rng)
+    html = f"<html><body><p>{text}</p><style>p {{color: red}}</style><a href='http://example.com'>link</a></body></html>"
+    kind = rng.choice(KINDS)
+    if kind == "plain":
+        message.set_content(text)
+    elif kind == "html":
+        message.set_content(html, subtype="html")
+    else:
+        message.set_content(text)
+        message.add_alternative(html, subtype="html")
+    return message
+
+
+def synthetic_messages(n: int, seed: int = 0) -> List[EmailMessage]:
+    """A mix of plain-text, HTML-only and multipart/alternative messages"""
+    rng = random.Random(seed)
+    return [synthetic_message(rng, index) for index in range(n)]
+
+
+def write_synthetic_mbox(path: str, n: int, seed: int = 0) -> str:
+    box = mailbox.mbox(path)
+    box.lock()
+    try:
+        for message in synthetic_messages(n, seed):
+            box.add(message)
+        box.flush()
+    finally:
+        box.unlock()
+        box.close()
+    return path
@@ -1,11 +1,49 @@
+import os
+import secrets
 import uvicorn
-from typing import Dict
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
 from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.pipeline.batcher import MicroBatcher, QueueFullError
+from src.utils.feedback import FeedbackStore
+from src.utils.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from src.utils.logger import logging_stats
+from src.config.config import Config
 
-app = FastAPI(title="Spam Email Detection API")
+config = Config()
+batcher = None
+feedback_store = FeedbackStore(config.feedback_path)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global batcher
+    if pipeline is not None and not pipeline.is_ready():
+        # Serve liveness probes right away; /health/ready flips once the models are in
+        pipeline.start_background_load()
+    if pipeline is not None and config.watch_bundles:
+        pipeline.start_bundle_watcher()
+    if pipeline is not None and config.batching_enabled:
+        batcher = MicroBatcher(
+            pipeline.predict_batch,
+            max_batch_size=config.batch_max_size,
+            max_wait_ms=config.batch_max_wait_ms,
+            max_queue_size=config.batch_queue_size,
+            max_concurrent_batches=config.batch_concurrency
+        )
+        await batcher.start()
+    yield
+    if pipeline is not None:
+        pipeline.stop_bundle_watcher()
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+
+app = FastAPI(title="Spam Email Detection API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -15,17 +53,41 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # Initialize pipeline
 try:
-    pipeline = PredictionPipeline(load_models=True)
+    pipeline = PredictionPipeline(load_models=not config.background_model_loading)
 except Exception as e:
     print(f"Error loading models: {e}")
     pipeline = None
 
+def cache_counter(name: str):
+    # The cache keeps its own counters; read them at scrape time instead of counting twice
+    def read() -> Optional[float]:
+        if pipeline is None or pipeline.cache is None:
+            return None
+        return pipeline.cache_stats()[name]
+    return read
+
+REGISTRY.callback("spam_cache_hits_total", "Prediction cache hits", cache_counter('hits'), kind="counter")
+REGISTRY.callback("spam_cache_misses_total", "Prediction cache misses", cache_counter('misses'), kind="counter")
+REGISTRY.callback("spam_cache_entries", "Results held in the prediction cache", cache_counter('entries'))
+REGISTRY.callback("spam_batcher_queue_depth", "Requests waiting for a micro-batch",
+                  lambda: batcher.queue_depth() if batcher is not None else None)
+REGISTRY.callback("spam_models_ready", "1 once the model bundle is loaded",
+                  lambda: float(pipeline is not None and pipeline.is_ready()))
+REGISTRY.callback("spam_log_records_dropped_total", "Log records dropped because the log queue was full",
+                  lambda: logging_stats()['dropped'], kind="counter")
+REGISTRY.callback("spam_log_records_sampled_out_total", "Log records dropped by per-call-site sampling",
+                  lambda: logging_stats()['sampled_out'], kind="counter")
+
 class EmailRequest(BaseModel):
     content: str
 
+class BatchEmailRequest(BaseModel):
+    emails: List[str]
+
 class DetailedResult(BaseModel):
     prediction: str
     confidence: float
@@ -37,6 +99,50 @@ class PredictionResponse(BaseModel):
     spam_score: str
     detailed_results: Dict[str, DetailedResult]
 
+class BatchPredictionResponse(BaseModel):
+    results: List[PredictionResponse]
+
+class FeedbackRequest(BaseModel):
+    content: str
+    label: str
+
+class ReloadRequest(BaseModel):
+    bundle_dir: Optional[str] = None
+
+def to_response(result: Dict) -> PredictionResponse:
+    return PredictionResponse(
+        prediction=result['prediction'],
+        confidence=result.get('confidence', 0.0),
+        is_spam=result['prediction'] == "Spam",
+        spam_score=result.get('spam_score', "N/A"),
+        detailed_results=result.get('detailed_results', {})
+    )
+
+def require_pipeline() -> PredictionPipeline:
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Model pipeline not initialized")
+    if not pipeline.is_ready():
+        raise HTTPException(status_code=503, detail=pipeline.load_error or "Models are still loading")
+    return pipeline
+
+def check_admin_token(token: Optional[str]) -> None:
+    # Without a configured token the admin endpoints don't exist
+    if config.admin_token is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(token or "", config.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def resolve_bundle_dir(bundle_dir: str) -> str:
+    """
+    Bundles are unpickled on load, so only directories under Config.bundles_dir
+    may be named by a client. Relative paths are taken relative to it.
+    """
+    root = os.path.realpath(config.bundles_dir)
+    resolved = os.path.realpath(os.path.join(root, bundle_dir))
+    if resolved == root or os.path.commonpath([root, resolved]) != root:
+        raise HTTPException(status_code=400, detail=f"bundle_dir must be a bundle inside {config.bundles_dir}")
+    return resolved
+
 @app.get("/")
 def read_root():
     """
@@ -44,31 +150,151 @@ def read_root():
     """
     return {"message": "Spam Email Detection API is running"}
 
+@app.get("/health/live")
+def liveness():
+    """
+    Liveness probe: the process is up and serving HTTP, whether or not the models are loaded.
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness():
+    """
+    Readiness probe: 200 once the model bundle is loaded, 503 until then.
+    """
+    if pipeline is None or not pipeline.is_ready():
+        detail = "Model pipeline not initialized" if pipeline is None else pipeline.load_error or "Models are still loading"
+        raise HTTPException(status_code=503, detail=detail)
+    return {"status": "ready", "model_version": pipeline.model_version, "models": list(pipeline.models)}
+
 @app.post("/predict", response_model=PredictionResponse)
-def predict_email(email: EmailRequest):
+async def predict_email(email: EmailRequest):
     """
     Predict whether an email is spam or ham.
 
+    Concurrent requests are queued and scored together in micro-batches.
+
     Args:
         email (EmailRequest): The email content to analyze.
 
     Returns:
         PredictionResponse: The prediction result including confidence and details.
     """
-    if pipeline is None:
-        raise HTTPException(status_code=503, detail="Model pipeline not initialized")
+    require_pipeline()
     
     try:
-        result = pipeline.predict_single_email(email.content)
-        return PredictionResponse(
-            prediction=result['prediction'],
-            confidence=result.get('confidence', 0.0),
-            is_spam=result['prediction'] == "Spam",
-            spam_score=result.get('spam_score', "N/A"),
-            detailed_results=result.get('detailed_results', {})
-        )
+        if batcher is not None:
+            # Queued and scored together with concurrent requests
+            result = await batcher.submit(email.content)
+        else:
+            result = await run_in_threadpool(pipeline.predict_single_email, email.content)
+        return to_response(result)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_email_batch(batch: BatchEmailRequest):
+    """
+    Predict spam or ham for a batch of emails in one vectorized pass.
+
+    Args:
+        batch (BatchEmailRequest): The email contents to analyze.
+
+    Returns:
+        BatchPredictionResponse: One prediction result per email, in request order.
+    """
+    require_pipeline()
+
+    max_batch_size = config.max_batch_size
+    if len(batch.emails) > max_batch_size:
+        raise HTTPException(status_code=413, detail=f"Batch size exceeds limit of {max_batch_size} emails")
+
+    try:
+        results = pipeline.predict_batch(batch.emails)
+        return BatchPredictionResponse(results=[to_response(result) for result in results])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/feedback")
+def submit_feedback(feedback: FeedbackRequest):
+    """
+    Record the correct label for an email.
+
+    Labels are appended to `Config.feedback_path`; `update_model.py` trains
+    the partial_fit models on them and writes a new bundle version.
+
+    Args:
+        feedback (FeedbackRequest): The email content and its label, "Spam" or "Ham".
+
+    Returns:
+        dict: Confirmation that the label was stored.
+    """
+    try:
+        feedback_store.append(feedback.content, feedback.label)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"stored": True, "label": feedback.label}
+
+@app.get("/cache/stats")
+def cache_stats():
+    """
+    Report prediction cache hit/miss counters and occupancy.
+    """
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Model pipeline not initialized")
+    return pipeline.cache_stats()
+
+@app.get("/metrics")
+def metrics():
+    """
+    Per-stage and per-model latency histograms, request, error, cache and batch-size
+    counters in the Prometheus text exposition format. Each worker process reports its own.
+    """
+    return Response(REGISTRY.expose(), media_type=CONTENT_TYPE)
+
+@app.get("/admin/bundle")
+def current_bundle(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Describe the model bundle being served.
+    """
+    check_admin_token(x_admin_token)
+    bundle = require_pipeline().bundle
+    return {
+        'model_version': bundle.version,
+        'bundle_dir': bundle.path,
+        'models': list(bundle.models),
+        'manifest': bundle.manifest,
+    }
+
+@app.post("/admin/reload")
+async def reload_bundle(request: Optional[ReloadRequest] = None, x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Load a model bundle, warm it up and swap it in without dropping requests.
+
+    Requests already being scored finish on the previous bundle. With several
+    serve.py workers each process holds its own bundle; use `Config.watch_bundles`
+    so every worker picks up new bundles.
+
+    Args:
+        request (ReloadRequest): Optional bundle directory under `Config.bundles_dir`; defaults to the newest bundle.
+
+    Returns:
+        dict: The previous and new bundle versions.
+    """
+    check_admin_token(x_admin_token)
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Model pipeline not initialized")
+
+    bundle_dir = request.bundle_dir if request is not None else None
+    if bundle_dir is not None:
+        bundle_dir = resolve_bundle_dir(bundle_dir)
+    try:
+        # Loading and warm-up run off the event loop; predictions keep being served meanwhile
+        return await run_in_threadpool(pipeline.reload_bundle, bundle_dir)
+    except Exception as e:
+        raise HTTPException(status_code=409, detail=f"Reload failed, still serving {pipeline.model_version}: {e}")
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,23 @@
+import argparse
+from src.config.config import Config
+from src.pipeline.prediction_pipeline import PredictionPipeline
+
+
+def main():
+    config = Config()
+    parser = argparse.ArgumentParser(description="Scan an mbox file and write spam predictions to CSV")
+    parser.add_argument("mailbox", nargs="?", default=config.validation_data_path, help="Path to the .mbox file")
+    parser.add_argument("-o", "--output", default="data/predictions.csv", help="Output CSV path")
+    parser.add_argument("-w", "--workers", type=int, default=config.scan_workers,
+                        help="Worker processes scanning byte-range shards of the mailbox")
+    parser.add_argument("-b", "--batch-size", type=int, default=config.mbox_batch_size,
+                        help="Messages scored per micro-batch")
+    args = parser.parse_args()
+
+    pipeline = PredictionPipeline(load_models=True)
+    count = pipeline.stream_mbox_predictions(args.mailbox, args.output, batch_size=args.batch_size, workers=args.workers)
+    print(f"Wrote predictions for {count} emails to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Production launcher: preload the models once, then fork the API workers.
+
+The parent process imports `main` and loads every model before forking,
+so the workers share the model memory copy-on-write instead of each
+unpickling its own copy. Models exported with `python -m src.utils.model_store`
+are additionally memory-mapped, so their large arrays stay in the shared page
+cache even after a worker touches them.
+
+Usage (from the backend directory):
+    python serve.py --workers 4 --port 8000
+"""
+import gc
+import os
+import sys
+import signal
+import socket
+import argparse
+import importlib
+
+import uvicorn
+
+from src.utils.logger import configure_logging, shutdown_logging, worker_log_file
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, preload: bool, log_level: str, index: int) -> None:
+    # A file per worker: workers can't rotate a shared file safely, and the parent barely logs
+    configure_logging(log_file=worker_log_file(f"worker-{index}"))
+    module = importlib.import_module("main")
+    if preload and module.pipeline is not None:
+        # Thread pools and locks don't survive fork; rebuild them in the child, with the configured ensemble workers
+        module.pipeline.reset_after_fork(workers=module.config.ensemble_workers)
+    config = uvicorn.Config(module.app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked workers sharing model memory")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="Load models separately in every worker (for comparison)")
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    if args.preload:
+        module = importlib.import_module("main")
+        if module.pipeline is not None:
+            # Load in the parent (not in a background thread) so every worker inherits the models
+            module.pipeline.ensure_loaded()
+        # Move every object loaded so far out of the collector's generations so
+        # gc passes in the workers don't write to (and un-share) their pages
+        gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    children = []
+    for index in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                run_worker(sock, args.preload, args.log_level, index)
+            finally:
+                # os._exit skips atexit; write out the queued log records first
+                shutdown_logging()
+                os._exit(0)
+        children.append(pid)
+
+    print(f"Serving on {args.host}:{args.port} with {len(children)} workers "
+          f"(parent pid {os.getpid()}, preload={args.preload})", flush=True)
+
+    def stop(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    exit_code = 0
+    for child in children:
+        _, status = os.waitpid(child, 0)
+        exit_code = exit_code or os.waitstatus_to_exitcode(status)
+    sock.close()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,47 @@
 import pandas as pd
+from typing import Iterator, Optional
 from src.utils.logger import get_logger
 from src.config.config import Config
 from src.utils.state import TrainingState
+from src.utils.feature_store import FeatureStore, dataset_digest
+from src.components.data_transformation import DataTransformation
 
 logger = get_logger(__name__)
 
+# Explicit dtypes: pandas neither infers types per chunk nor builds object columns
+TRAINING_COLUMNS = ['Category', 'Message']
+TRAINING_DTYPES = {'Category': 'category', 'Message': 'string'}
+
 class DataIngestion:
     def __init__(self):
         self.config = Config()
     
     def load_data(self, state: TrainingState) -> TrainingState:
         try:
+            if self.config.feature_store_enabled:
+                state.feature_key = DataTransformation().feature_key(dataset_digest(self.config.training_data_path))
+                state.features_cached = FeatureStore(self.config.feature_store_dir).has(state.feature_key)
+                if state.features_cached:
+                    # DataTransformation loads the stored features; the CSV is not needed
+                    logger.info(f"Feature store hit for {state.feature_key}, skipping data loading")
+                    return state
+
             logger.info("Loading data")
-            state.training_data = pd.read_csv(self.config.training_data_path)
+            state.training_data = pd.read_csv(self.config.training_data_path, usecols=TRAINING_COLUMNS,
+                                              dtype=TRAINING_DTYPES)
             logger.info("Data loaded successfully")
             return state
         except Exception as e:
             logger.error(f"Failed to load data: {str(e)}")
             raise e
-    
\ No newline at end of file
+
+    def iter_chunks(self, path: Optional[str] = None, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream the labeled corpus `chunk_size` rows at a time, for corpora that do not fit in memory"""
+        path = path or self.config.training_data_path
+        chunk_size = chunk_size or self.config.ingestion_chunk_size
+        rows = 0
+        with pd.read_csv(path, usecols=TRAINING_COLUMNS, dtype=TRAINING_DTYPES, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                yield chunk
+        logger.info(f"Streamed {rows} rows from {path}")
@@ -1,53 +1,95 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
 from src.utils.logger import get_logger
 from src.config.config import Config
 from src.utils.state import TrainingState
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from src.components.model_factory import build_vectorizer
+from src.utils.feature_store import FeatureSet, FeatureStore, feature_key
 
 logger = get_logger(__name__)
 
+LABELS = {'spam': 0, 'ham': 1}
+
+# Train/test split of the training data
+TEST_SIZE = 0.3
+RANDOM_STATE = 42
+
 class DataTransformation:
     def __init__(self):
         self.config = Config()
+        self.feature_store = FeatureStore(self.config.feature_store_dir)
+    
+    @staticmethod
+    def encode_labels(categories: pd.Series) -> np.ndarray:
+        # Mapped into a new array; the input frame is neither copied nor modified
+        return categories.astype(str).str.lower().map(LABELS).to_numpy(dtype=int)
+    
+    def transform_chunk(self, chunk: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+        """Texts and encoded labels of one streamed chunk; rows with another label are dropped"""
+        chunk = chunk[chunk['Category'].astype(str).str.lower().isin(LABELS)]
+        return chunk['Message'].fillna("").tolist(), self.encode_labels(chunk['Category'])
+    
+    def build_vectorizer(self):
+        # TF-IDF over hashed features when Config.feature_mode is "hashing"
+        return build_vectorizer(self.config, lowercase=True, stop_words='english')
+    
+    def feature_key(self, dataset_digest: str) -> str:
+        split = {'test_size': TEST_SIZE, 'random_state': RANDOM_STATE, 'stratify': True}
+        return feature_key(dataset_digest, self.build_vectorizer(), split)
+    
+    def load_cached_features(self, state: TrainingState) -> TrainingState:
+        features = self.feature_store.load(state.feature_key)
+        state.X_train = pd.Series(features.train_texts, index=features.train_index)
+        state.X_test = pd.Series(features.test_texts, index=features.test_index)
+        state.y_train = features.y_train
+        state.y_test = features.y_test
+        state.X_train_tfidf = features.X_train
+        state.X_test_tfidf = features.X_test
+        state.tfidf_vectorizer = features.vectorizer
+        logger.info(f"Loaded cached features {state.feature_key}. Feature shape: {state.X_train_tfidf.shape}")
+        return state
     
     def transform_data(self, state: TrainingState) -> TrainingState:
         logger.info("Data transformation started")
         try:
-            data = state.training_data.copy()
+            if state.features_cached:
+                return self.load_cached_features(state)
             
-            # Encode labels: spam -> 0, ham -> 1
-            data.loc[data['Category'] == 'spam', 'Category'] = 0
-            data.loc[data['Category'] == 'ham', 'Category'] = 1
+            data = state.training_data
             
-            # Ensure Category column is integer type
-            data['Category'] = data['Category'].astype(int)
+            # Encode labels: spam -> 0, ham -> 1
+            y = self.encode_labels(data['Category'])
             
             logger.info(f"Label encoding completed. Data shape: {data.shape}")
-            logger.info(f"Unique labels: {data['Category'].unique()}")
-            logger.info(f"Label dtype: {data['Category'].dtype}")
+            logger.info(f"Unique labels: {np.unique(y)}")
             
             # Split features and target
             X = data['Message']
-            y = data['Category']
-            
-            # Convert y to numpy array of integers to ensure proper type
-            import numpy as np
-            y = np.array(y, dtype=int)
             
             # Split into train and test sets (70:30 ratio)
             X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.3, random_state=42, stratify=y
+                X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
             )
             
             logger.info(f"Train/test split completed. Train size: {len(X_train)}, Test size: {len(X_test)}")
             
             # Apply TF-IDF vectorization
-            tfidf_vectorizer = TfidfVectorizer(lowercase=True, stop_words='english')
+            tfidf_vectorizer = self.build_vectorizer()
             X_train_tfidf = tfidf_vectorizer.fit_transform(X_train)
             X_test_tfidf = tfidf_vectorizer.transform(X_test)
             
             logger.info(f"TF-IDF transformation completed. Feature shape: {X_train_tfidf.shape}")
             
+            if state.feature_key:
+                self.feature_store.save(state.feature_key, FeatureSet(
+                    train_texts=X_train.tolist(), test_texts=X_test.tolist(),
+                    train_index=X_train.index.to_numpy(), test_index=X_test.index.to_numpy(),
+                    y_train=y_train, y_test=y_test, X_train=X_train_tfidf, X_test=X_test_tfidf,
+                    vectorizer=tfidf_vectorizer
+                ))
+            
             # Save to state
             state.transformed_data = data
             state.X_train = X_train
@@ -0,0 +1,199 @@
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from joblib import effective_n_jobs
+from scipy.stats import rankdata
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (registers the Halving* searches)
+from sklearn.model_selection import (
+    GridSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV, ParameterGrid, ParameterSampler, RandomizedSearchCV,
+    StratifiedKFold
+)
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Config.search_strategy / ModelConfig.search_strategies values
+GRID = "grid"
+RANDOM = "random"
+HALVING_GRID = "halving_grid"
+HALVING_RANDOM = "halving_random"
+SEARCH_STRATEGIES = (GRID, RANDOM, HALVING_GRID, HALVING_RANDOM)
+
+
+class _TimeBudgetMixin:
+    """
+    Stops a search once `time_budget` seconds have passed, using only the
+    public sklearn API.
+
+    With a budget the candidates are drawn up front (a shuffled grid, or the
+    sample a randomized search would take) and evaluated in chunks, each by an
+    ordinary search over just those candidates: n_jobs candidates per chunk,
+    or n_jobs * factor for successive halving so every chunk has a round to
+    eliminate in. No chunk starts after the deadline. The chunks' results are
+    merged, best_params_ is the best candidate evaluated (for halving, the
+    best finalist of the chunks run) and it is refitted on all data.
+    """
+    time_budget: Optional[float] = None
+    budget_exhausted_: bool = False
+
+    def fit(self, X, y=None, **fit_params):
+        self.budget_exhausted_ = False
+        if self.time_budget is None:
+            return super().fit(X, y, **fit_params)
+
+        deadline = time.perf_counter() + self.time_budget
+        candidates = self._budget_candidates()
+        chunk_size = max(1, effective_n_jobs(self.n_jobs))
+        if isinstance(self, (HalvingGridSearchCV, HalvingRandomSearchCV)):
+            chunk_size *= self.factor
+
+        searches, evaluated = [], 0
+        for start in range(0, len(candidates), chunk_size):
+            if searches and time.perf_counter() > deadline:
+                self.budget_exhausted_ = True
+                logger.warning(f"Search time budget of {self.time_budget:.0f}s reached after {evaluated} candidates")
+                break
+            chunk = candidates[start:start + chunk_size]
+            search = self._chunk_search(chunk)
+            search.fit(X, y, **fit_params)
+            searches.append(search)
+            evaluated += len(chunk)
+
+        self._merge_chunks(searches)
+        if self.refit:
+            started = time.perf_counter()
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y, **fit_params)
+            self.refit_time_ = time.perf_counter() - started
+        return self
+
+    def _budget_candidates(self) -> List[Dict[str, Any]]:
+        rng = np.random.RandomState(getattr(self, "random_state", None))
+        if isinstance(self, RandomizedSearchCV):
+            return list(ParameterSampler(self.param_distributions, self.n_iter, random_state=rng))
+        if isinstance(self, HalvingRandomSearchCV):
+            n_candidates = self.n_candidates if isinstance(self.n_candidates, int) \
+                else len(ParameterGrid(self.param_distributions))
+            return list(ParameterSampler(self.param_distributions, n_candidates, random_state=rng))
+        # A grid cut short by the deadline should be a random sample of it, not its first rows
+        grid = list(ParameterGrid(self.param_grid))
+        return [grid[i] for i in rng.permutation(len(grid))]
+
+    def _chunk_search(self, candidates: List[Dict[str, Any]]) -> Any:
+        """An ordinary search over exactly `candidates`, without the refit"""
+        grid = [{name: [value] for name, value in params.items()} for params in candidates]
+        common = dict(scoring=self.scoring, cv=self.cv, n_jobs=self.n_jobs, refit=False, error_score=self.error_score)
+        if isinstance(self, (HalvingGridSearchCV, HalvingRandomSearchCV)):
+            return HalvingGridSearchCV(self.estimator, grid, factor=self.factor, resource=self.resource,
+                                       min_resources=self.min_resources, random_state=self.random_state, **common)
+        return GridSearchCV(self.estimator, grid, **common)
+
+    def _merge_chunks(self, searches: List[Any]) -> None:
+        params = [candidate for search in searches for candidate in search.cv_results_['params']]
+        keys = set.intersection(*(set(search.cv_results_) for search in searches))
+        results: Dict[str, Any] = {'params': params}
+        for key in sorted(keys):
+            if key != 'params' and not key.startswith(('param_', 'rank_')):
+                results[key] = np.concatenate([np.asarray(search.cv_results_[key]) for search in searches])
+        for name in sorted({name for candidate in params for name in candidate}):
+            results[f"param_{name}"] = np.ma.MaskedArray([candidate.get(name) for candidate in params],
+                                                         mask=[name not in candidate for candidate in params],
+                                                         dtype=object)
+        means = np.nan_to_num(results['mean_test_score'], nan=-np.inf)
+        results['rank_test_score'] = (rankdata(-means, method="min")).astype(np.int32)
+
+        best = max(searches, key=lambda search: search.best_score_)
+        offset = sum(len(search.cv_results_['params']) for search in searches[:searches.index(best)])
+        self.cv_results_ = results
+        self.best_index_ = offset + best.best_index_
+        self.best_params_ = best.best_params_
+        self.best_score_ = best.best_score_
+        self.scorer_ = best.scorer_
+        self.multimetric_ = best.multimetric_
+        self.n_splits_ = best.n_splits_
+
+
+class BudgetedGridSearchCV(_TimeBudgetMixin, GridSearchCV):
+    pass
+
+
+class BudgetedRandomizedSearchCV(_TimeBudgetMixin, RandomizedSearchCV):
+    pass
+
+
+class BudgetedHalvingGridSearchCV(_TimeBudgetMixin, HalvingGridSearchCV):
+    pass
+
+
+class BudgetedHalvingRandomSearchCV(_TimeBudgetMixin, HalvingRandomSearchCV):
+    pass
+
+
+# ----------------------------------------------------------------------------
+# Function to compute the cross-validation folds once for every search
+# ----------------------------------------------------------------------------
+def cached_folds(y: Any, n_splits: int = 5, random_state: int = 42) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Passing the same explicit folds to every model's search means the splits
+    are computed once, and CV scores are comparable across models because
+    they all saw the same partitions.
+    """
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+# ----------------------------------------------------------------------------
+# Function to build the hyperparameter search for one model
+# ----------------------------------------------------------------------------
+def build_search(estimator: Any, param_grid: Dict[str, List[Any]], strategy: str = GRID, cv: Any = 5,
+                 scoring: str = 'f1', n_jobs: int = -1, n_iter: int = 20, factor: int = 3,
+                 time_budget: Optional[float] = None, random_state: int = 42) -> Any:
+    """
+    `grid` tries every combination; `random` samples `n_iter` of them.
+    The halving strategies start every candidate on a small subsample of the
+    training data and keep the best 1/`factor` for each larger round, so most
+    combinations are only ever fitted on a fraction of the data.
+    """
+    if strategy == GRID:
+        search = BudgetedGridSearchCV(estimator, param_grid, scoring=scoring, cv=cv, n_jobs=n_jobs)
+    elif strategy == RANDOM:
+        search = BudgetedRandomizedSearchCV(estimator, param_grid, n_iter=n_iter, scoring=scoring, cv=cv,
+                                            n_jobs=n_jobs, random_state=random_state)
+    elif strategy == HALVING_GRID:
+        search = BudgetedHalvingGridSearchCV(estimator, param_grid, factor=factor, scoring=scoring, cv=cv,
+                                             n_jobs=n_jobs, random_state=random_state)
+    elif strategy == HALVING_RANDOM:
+        search = BudgetedHalvingRandomSearchCV(estimator, param_grid, factor=factor, scoring=scoring, cv=cv,
+                                               n_jobs=n_jobs, random_state=random_state)
+    else:
+        raise ValueError(f"Unknown search strategy {strategy!r}; expected one of {SEARCH_STRATEGIES}")
+    search.time_budget = time_budget
+    return search
+
+
+def candidates_evaluated(search: Any) -> int:
+    return len(search.cv_results_['params'])
+
+
+# ----------------------------------------------------------------------------
+# Function to estimate how many full-data fits a search will run
+# ----------------------------------------------------------------------------
+def estimated_fits(search: Any, n_splits: int) -> float:
+    """
+    Grid and randomized searches fit every candidate on every fold. Halving
+    spends about the same resources in each of its rounds, so its cost is
+    rounds * candidates / factor**(rounds - 1) full fits per fold. Candidate
+    counts of halving random search are only known during fit; the grid size
+    stands in for them.
+    """
+    n_candidates = len(ParameterGrid(search.param_distributions if hasattr(search, 'param_distributions')
+                                     else search.param_grid))
+    if isinstance(search, RandomizedSearchCV):
+        n_candidates = min(n_candidates, search.n_iter)
+    if isinstance(search, (HalvingGridSearchCV, HalvingRandomSearchCV)):
+        rounds = 1 + int(math.floor(math.log(max(n_candidates, 1), search.factor)))
+        n_candidates = rounds * n_candidates / search.factor ** (rounds - 1)
+    return n_candidates * n_splits
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.logger import get_logger
+from src.config.config import Config
+from src.utils.email_utils import clean_text
+from src.utils.model_store import BundleError, find_latest_bundle, load_bundle, new_bundle_dir, write_bundle
+
+logger = get_logger(__name__)
+
+class IncrementalTraining:
+    """
+    Updates the models of an existing bundle with newly labeled emails only.
+
+    Models that implement partial_fit (MultinomialNB, SGDClassifier) take one
+    pass per `Config.incremental_epochs` over the new samples; the others and
+    the vectorizer are carried over unchanged. The result is written as a new
+    bundle whose manifest records the bundle it was derived from.
+    """
+
+    def __init__(self):
+        self.config = Config()
+
+    def update_bundle(self, emails: List[str], labels: List[int], bundle_dir: Optional[str] = None,
+                      output_dir: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if not emails:
+            raise ValueError("No labeled emails to train on")
+        bundle_dir = bundle_dir or find_latest_bundle(self.config.bundles_dir)
+        if bundle_dir is None:
+            raise BundleError(f"No bundle found in {self.config.bundles_dir}; create one with `model_store bundle`")
+
+        # partial_fit updates arrays in place, so they must not be read-only memory maps
+        bundle = load_bundle(bundle_dir, mmap=False, verify=self.config.verify_bundle_checksums)
+        logger.info(f"Updating bundle {bundle.version} with {len(emails)} labeled emails")
+
+        features = bundle.feature_transformer.transform([clean_text(email) for email in emails])
+        y = np.asarray(labels, dtype=int)
+
+        updated = []
+        for name, model in bundle.models.items():
+            if not hasattr(model, "partial_fit"):
+                logger.info(f"{name} does not support partial_fit; kept unchanged")
+                continue
+            for _ in range(self.config.incremental_epochs):
+                model.partial_fit(features, y, classes=model.classes_)
+            updated.append(name)
+            logger.info(f"Updated {name}")
+
+        if not updated:
+            raise BundleError(f"No model in bundle {bundle.version} supports partial_fit")
+
+        output_dir = output_dir or new_bundle_dir(self.config.bundles_dir)
+        manifest = write_bundle(
+            output_dir, bundle.feature_transformer, bundle.models,
+            metadata=dict(metadata or {}, incremental=True, samples=len(emails), updated_models=updated,
+                          spam_samples=int((y == 0).sum())),
+            parent_version=bundle.version
+        )
+        logger.info(f"Wrote bundle {manifest['version']} (from {bundle.version}) to {output_dir}")
+        return manifest
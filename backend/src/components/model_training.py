@@ -12,11 +12,15 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier, StackingClassifier
-from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, cross_val_score
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
 
 from src.utils.logger import get_logger
 from src.utils.state import TrainingState
+from src.utils.features import HashingTfidfVectorizer
+from src.utils.model_store import save_features, write_manifest
+from src.components.model_factory import SVM_KERNEL, build_svm
+from src.components.hyperparameter_search import build_search, cached_folds, candidates_evaluated, estimated_fits
+from src.components.training_scheduler import SearchJob, TrainingScheduler
 from src.config.config import Config, ModelConfig
 
 logger = get_logger(__name__)
@@ -25,6 +29,8 @@ class ModelTraining:
     def __init__(self):
         self.config = Config()
         self.param_grids = ModelConfig.models
+        self.search_strategies = ModelConfig.search_strategies
+        self.fit_costs = ModelConfig.fit_costs
     
     def save_pickle_files(self, state: TrainingState):
         try:
@@ -36,10 +42,16 @@ class ModelTraining:
             os.makedirs(models_dir, exist_ok=True)
             os.makedirs(observations_dir, exist_ok=True)
 
-            vectorizer_path = os.path.join(models_dir, "vectorizer.pkl")
-            with open(vectorizer_path, 'wb') as f:
-                pickle.dump(state.tfidf_vectorizer, f)
-            logger.info(f"Saved TF-IDF vectorizer: {vectorizer_path}")
+            if isinstance(state.tfidf_vectorizer, HashingTfidfVectorizer):
+                # Hashed features have no vocabulary to pickle; only the idf vector is stored
+                feature_file, feature_info = save_features(state.tfidf_vectorizer, models_dir)
+                logger.info(f"Saved hashing TF-IDF idf vector: {os.path.join(models_dir, feature_file)}")
+            else:
+                feature_file, feature_info = "vectorizer.pkl", None
+                vectorizer_path = os.path.join(models_dir, feature_file)
+                with open(vectorizer_path, 'wb') as f:
+                    pickle.dump(state.tfidf_vectorizer, f)
+                logger.info(f"Saved TF-IDF vectorizer: {vectorizer_path}")
         
             best_model_path = os.path.join(models_dir, f"{state.best_model_name}_model.pkl")
             with open(best_model_path, 'wb') as f:
@@ -60,6 +72,10 @@ class ModelTraining:
             metadata_path = os.path.join(observations_dir, "model_metadata.csv")
             pd.DataFrame([metadata]).to_csv(metadata_path, index=False)
             logger.info(f"Saved metadata: {metadata_path}")
+
+            # The manifest makes models_dir a versioned bundle the API can load and verify
+            write_manifest(models_dir, feature_file, {state.best_model_name: f"{state.best_model_name}_model.pkl"},
+                           metadata={key: str(value) for key, value in metadata.items()}, feature_info=feature_info)
             
             return output_dir
 
@@ -82,6 +98,9 @@ class ModelTraining:
                 'Recall': metrics['recall'],
                 'F1_Score': metrics['f1_score'],
                 'CV_Score': metrics.get('best_cv_score', 'N/A'),
+                'Search_Strategy': metrics.get('search_strategy', 'N/A'),
+                'Candidates': metrics.get('candidates', 'N/A'),
+                'Search_Time_Seconds': metrics.get('search_seconds', 'N/A'),
                 'Is_Best_Model': '1' if model_name == state.best_model_name else '0'
             })
         
@@ -159,7 +178,7 @@ class ModelTraining:
 
     def train_models(self, state: TrainingState, cv_folds: int = 5) -> TrainingState:
         logger.info("Model training started")
-        logger.info(f"Using GridSearchCV with {cv_folds}-fold CV")
+        logger.info(f"Using {cv_folds}-fold CV, default search strategy: {self.config.search_strategy}")
         
         try:
             X_train = state.X_train_tfidf
@@ -169,30 +188,48 @@ class ModelTraining:
             
             trained_models, model_metrics, cv_results = {}, {}, {}
             
+            svm_variant = self.config.svm_variant
+            # Every search reuses the same precomputed folds
+            folds = cached_folds(y_train, n_splits=cv_folds)
+
             # Define model instances
             models = {
                 'LogisticRegression': LogisticRegression(random_state=42),
                 'DecisionTree': DecisionTreeClassifier(random_state=42),
-                'SVM': SVC(random_state=42),
+                'SVM': SVC(random_state=42) if svm_variant == SVM_KERNEL else build_svm(svm_variant, self.config.svm_approx_components),
                 'KNN': KNeighborsClassifier(),
                 'RandomForest': RandomForestClassifier(random_state=42)
             }
             
+            jobs = []
             for model_name, model in models.items():
+                grid_name = f"SVM_{svm_variant}" if model_name == 'SVM' and svm_variant != SVM_KERNEL else model_name
+                param_grid = self.param_grids.get(grid_name, {})
+                strategy = self.search_strategies.get(model_name, self.config.search_strategy)
+                
+                search = build_search(model,
+                                      param_grid=param_grid,
+                                      strategy=strategy,
+                                      cv=folds,
+                                      scoring='f1',
+                                      n_jobs=-1,
+                                      n_iter=self.config.search_n_iter,
+                                      factor=self.config.search_halving_factor,
+                                      time_budget=self.config.search_time_budget
+                                      )
+                cost = estimated_fits(search, cv_folds) * self.fit_costs.get(model_name, 1.0)
+                jobs.append(SearchJob(model_name, search, cost))
+            
+            scheduler = TrainingScheduler(self.config.training_cpu_budget, parallel=self.config.parallel_training)
+            searches = scheduler.run(jobs, X_train, y_train)
+            
+            for model_name in models:
                 start_time = time.time()
                 logger.info(f"\n{'='*60}")
-                logger.info(f"Training {model_name}...")
-                
-                param_grid = self.param_grids.get(model_name, {})
-                
-                search = GridSearchCV(model,
-                                    param_grid=param_grid,
-                                    cv=cv_folds,
-                                    scoring='f1',
-                                    n_jobs=-1
-                                    )
+                logger.info(f"Evaluating {model_name}...")
                 
-                search.fit(X_train, y_train)
+                search, search_seconds = searches[model_name]
+                strategy = self.search_strategies.get(model_name, self.config.search_strategy)
                 best_model = search.best_estimator_
                 
                 y_pred = best_model.predict(X_test)
@@ -203,7 +240,11 @@ class ModelTraining:
                     'recall': recall_score(y_test, y_pred, average='weighted', zero_division=0),
                     'f1_score': f1_score(y_test, y_pred, average='weighted', zero_division=0),
                     'best_params': search.best_params_,
-                    'best_cv_score': search.best_score_
+                    'best_cv_score': search.best_score_,
+                    'search_strategy': strategy,
+                    'candidates': candidates_evaluated(search),
+                    'search_seconds': round(search_seconds, 2),
+                    'budget_exhausted': search.budget_exhausted_
                 }
                 
                 trained_models[model_name] = best_model
@@ -216,7 +257,9 @@ class ModelTraining:
                 
                 end_time = time.time()
                 
-                logger.info(f"{model_name} - Training time: {end_time - start_time:.2f} seconds")
+                logger.info(f"{model_name} - Evaluation time: {end_time - start_time:.2f} seconds")
+                logger.info(f"{model_name} - Search: {strategy}, {metrics['candidates']} candidates in {search_seconds:.2f} seconds"
+                            + (" (time budget reached)" if search.budget_exhausted_ else ""))
                 logger.info(f"{model_name} - Best Parameters: {search.best_params_}")
                 logger.info(f"{model_name} - CV Score: {search.best_score_:.4f}")
                 logger.info(f"{model_name} - Test Accuracy: {metrics['accuracy']:.4f}")
@@ -233,6 +276,8 @@ class ModelTraining:
             logger.info(f"BEST MODEL: {best_model_name}")
             logger.info(f"Best F1-Score: {model_metrics[best_model_name]['f1_score']:.4f}")
             logger.info(f"Best Parameters: {best_params}")
+            for model_name, metrics in model_metrics.items():
+                logger.info(f"Search time - {model_name}: {metrics['search_seconds']:.2f} seconds ({metrics['search_strategy']})")
             logger.info(f"{'='*60}")
             
             state.trained_models = trained_models
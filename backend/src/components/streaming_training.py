@@ -0,0 +1,118 @@
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.naive_bayes import MultinomialNB
+
+from src.utils.logger import get_logger
+from src.config.config import Config
+from src.utils.features import HashingTfidfVectorizer
+from src.utils.model_store import new_bundle_dir, write_bundle
+from src.components.model_factory import LOGISTIC_SGD, build_logistic
+from src.components.data_transformation import DataTransformation
+
+logger = get_logger(__name__)
+
+CLASSES = np.array([0, 1])
+
+
+class StreamingTraining:
+    """
+    Trains on a labeled corpus that does not fit in memory.
+
+    The corpus is read in chunks (`DataIngestion.iter_chunks`) and never held
+    whole. A first pass accumulates the document frequencies of a
+    HashingTfidfVectorizer, which needs no vocabulary; each later pass
+    vectorizes one chunk at a time and feeds it to the partial_fit models
+    (MultinomialNB and a log-loss SGDClassifier). A fixed fraction of rows,
+    chosen by a hash of their text, is held out of training and scored at
+    the end. Memory is bounded by the chunk size and `Config.hashing_n_features`.
+    """
+
+    def __init__(self):
+        self.config = Config()
+        self.transformation = DataTransformation()
+
+    def build_vectorizer(self) -> HashingTfidfVectorizer:
+        return HashingTfidfVectorizer(n_features=self.config.hashing_n_features, lowercase=True, stop_words='english')
+
+    def build_models(self) -> Dict[str, Any]:
+        # Named like the ensemble members the API serves
+        return {"Naive_Bayes": MultinomialNB(), "Logistic_Regression": build_logistic(LOGISTIC_SGD)}
+
+    def is_test(self, texts: List[str]) -> np.ndarray:
+        # Deterministic per text, so every pass and every run holds out the same rows
+        threshold = self.config.streaming_test_fraction * 2 ** 32
+        return np.array([zlib.crc32(text.encode("utf-8")) < threshold for text in texts], dtype=bool)
+
+    def iter_batches(self, chunks: Callable[[], Iterator[pd.DataFrame]]) -> Iterator[Tuple[List[str], np.ndarray, np.ndarray]]:
+        for chunk in chunks():
+            texts, labels = self.transformation.transform_chunk(chunk)
+            if texts:
+                yield texts, labels, self.is_test(texts)
+
+    def train(self, chunks: Callable[[], Iterator[pd.DataFrame]], output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """`chunks` returns a fresh iterator over the corpus for every pass"""
+        vectorizer = self.build_vectorizer()
+        train_rows = 0
+        for texts, _, test_mask in self.iter_batches(chunks):
+            train_texts = [text for text, is_test in zip(texts, test_mask) if not is_test]
+            if train_texts:
+                vectorizer.partial_fit(train_texts)
+                train_rows += len(train_texts)
+        if not train_rows:
+            raise ValueError("No labeled training rows in the corpus")
+        logger.info(f"Document frequencies accumulated over {train_rows} rows")
+
+        models = self.build_models()
+        for epoch in range(1, self.config.streaming_epochs + 1):
+            for chunk_index, (texts, labels, test_mask) in enumerate(self.iter_batches(chunks), start=1):
+                train_mask = ~test_mask
+                if not train_mask.any():
+                    continue
+                features = vectorizer.transform([text for text, keep in zip(texts, train_mask) if keep])
+                for model in models.values():
+                    model.partial_fit(features, labels[train_mask], classes=CLASSES)
+                logger.info(f"Epoch {epoch}, chunk {chunk_index}: trained on {int(train_mask.sum())} rows")
+
+        metrics = self.evaluate(chunks, vectorizer, models)
+        output_dir = output_dir or new_bundle_dir(self.config.bundles_dir)
+        manifest = write_bundle(output_dir, vectorizer, models, metadata={
+            'streaming': True,
+            'train_samples': train_rows,
+            'epochs': self.config.streaming_epochs,
+            'metrics': metrics,
+        })
+        logger.info(f"Wrote streamed bundle {manifest['version']} to {output_dir}")
+        return manifest
+
+    def evaluate(self, chunks: Callable[[], Iterator[pd.DataFrame]], vectorizer: HashingTfidfVectorizer,
+                 models: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        # Only labels and predictions of the held-out rows are kept, one small int array each
+        y_true, y_pred = [], {name: [] for name in models}
+        for texts, labels, test_mask in self.iter_batches(chunks):
+            if not test_mask.any():
+                continue
+            features = vectorizer.transform([text for text, keep in zip(texts, test_mask) if keep])
+            y_true.append(labels[test_mask])
+            for name, model in models.items():
+                y_pred[name].append(model.predict(features))
+
+        if not y_true:
+            logger.warning("No held-out rows to evaluate on")
+            return {}
+        y_true = np.concatenate(y_true)
+        metrics = {}
+        for name in models:
+            predicted = np.concatenate(y_pred[name])
+            metrics[name] = {
+                'accuracy': accuracy_score(y_true, predicted),
+                'precision': precision_score(y_true, predicted, average='weighted', zero_division=0),
+                'recall': recall_score(y_true, predicted, average='weighted', zero_division=0),
+                'f1_score': f1_score(y_true, predicted, average='weighted', zero_division=0),
+                'test_samples': int(len(y_true)),
+            }
+            logger.info(f"{name} - Held-out accuracy: {metrics[name]['accuracy']:.4f}, F1: {metrics[name]['f1_score']:.4f}")
+        return metrics
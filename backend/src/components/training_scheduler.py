@@ -0,0 +1,139 @@
+import os
+import time
+import threading
+import multiprocessing
+from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from joblib.externals.loky import get_reusable_executor
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SearchJob:
+    """One model family's hyperparameter search"""
+    name: str
+    search: Any
+    cost: float # Relative cost, e.g. estimated fits * cost of one fit
+    cores: int = 1
+
+
+class CpuBudget:
+    """Counts cores in use by running searches and blocks until enough are free"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.available = total
+        self._condition = threading.Condition()
+
+    def acquire(self, cores: int) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self.available >= cores)
+            self.available -= cores
+
+    def release(self, cores: int) -> None:
+        with self._condition:
+            self.available += cores
+            self._condition.notify_all()
+
+
+def _fit_search(search: Any, X: Any, y: Any) -> Tuple[Any, float]:
+    started = time.time()
+    search.fit(X, y)
+    return search, time.time() - started
+
+
+def _fit_search_in_worker(search: Any, X: Any, y: Any) -> Tuple[Any, float]:
+    try:
+        return _fit_search(search, X, y)
+    finally:
+        # The idle joblib workers would otherwise keep this process from exiting until they time out
+        get_reusable_executor().shutdown(wait=True)
+
+
+class TrainingScheduler:
+    """
+    Runs the searches of several model families at the same time within a
+    global CPU budget.
+
+    Jobs start in decreasing order of cost (longest first), so the expensive
+    searches are never left running alone at the end. Each job gets a share
+    of the budget proportional to its cost, at least one core, which becomes
+    its search's n_jobs. A job starts once its cores are free and hands them
+    back when it finishes.
+
+    Every search runs in its own process. joblib shares one worker pool per
+    process, so concurrent searches in threads would all be resized to the
+    last n_jobs requested instead of keeping their own share.
+    """
+
+    def __init__(self, cpu_budget: Optional[int] = None, parallel: bool = True):
+        self.cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
+        self.parallel = parallel
+
+    def allocate(self, jobs: List[SearchJob]) -> List[SearchJob]:
+        """Sort `jobs` by decreasing cost and give each its share of the budget"""
+        jobs = sorted(jobs, key=lambda job: job.cost, reverse=True)
+        total_cost = sum(job.cost for job in jobs) or 1.0
+        for job in jobs:
+            job.cores = min(self.cpu_budget, max(1, round(self.cpu_budget * job.cost / total_cost)))
+        return jobs
+
+    def run(self, jobs: List[SearchJob], X: Any, y: Any) -> Dict[str, Tuple[Any, float]]:
+        """Fit every job's search on (X, y); returns {name: (fitted search, seconds)}"""
+        if not self.parallel or len(jobs) == 1:
+            return self.run_sequential(jobs, X, y)
+
+        jobs = self.allocate(jobs)
+        budget = CpuBudget(self.cpu_budget)
+        run_start = time.time()
+        logger.info(f"Scheduling {len(jobs)} searches on {self.cpu_budget} cores: "
+                    + ", ".join(f"{job.name} ({job.cores} cores, cost {job.cost:.0f})" for job in jobs))
+
+        def on_done(future: Future, job: SearchJob) -> None:
+            budget.release(job.cores)
+            with done_lock:
+                done.append(job.name)
+                if future.exception() is None:
+                    logger.info(f"[{job.name}] finished in {future.result()[1]:.2f}s "
+                                f"({len(done)}/{len(jobs)} done, {time.time() - run_start:.2f}s elapsed)")
+                else:
+                    logger.error(f"[{job.name}] failed: {future.exception()}")
+
+        done, done_lock = [], threading.Lock()
+        # spawn: a forked child would inherit this process's threads and locks mid-use
+        with ProcessPoolExecutor(max_workers=len(jobs), mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {}
+            for job in jobs:
+                budget.acquire(job.cores)
+                job.search.set_params(n_jobs=job.cores)
+                logger.info(f"[{job.name}] started with {job.cores} cores after {time.time() - run_start:.2f}s")
+                future = executor.submit(_fit_search_in_worker, job.search, X, y)
+                future.add_done_callback(lambda future, job=job: on_done(future, job))
+                futures[job.name] = future
+
+            results = {name: future.result() for name, future in futures.items()}
+
+        self._log_summary(results, time.time() - run_start)
+        return results
+
+    def run_sequential(self, jobs: List[SearchJob], X: Any, y: Any) -> Dict[str, Tuple[Any, float]]:
+        """One search at a time in this process, each with the whole budget"""
+        results = {}
+        run_start = time.time()
+        for index, job in enumerate(jobs, start=1):
+            job.search.set_params(n_jobs=self.cpu_budget)
+            logger.info(f"[{job.name}] started with {self.cpu_budget} cores ({index}/{len(jobs)})")
+            results[job.name] = _fit_search(job.search, X, y)
+            logger.info(f"[{job.name}] finished in {results[job.name][1]:.2f}s")
+        self._log_summary(results, time.time() - run_start)
+        return results
+
+    def _log_summary(self, results: Dict[str, Tuple[Any, float]], wall_seconds: float) -> None:
+        serial_seconds = sum(seconds for _, seconds in results.values())
+        logger.info(f"All searches finished in {wall_seconds:.2f}s wall-clock "
+                    f"({serial_seconds:.2f}s of search time, {serial_seconds / max(wall_seconds, 1e-9):.1f}x overlap)")
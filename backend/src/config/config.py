@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
 @dataclass
 class Config:
@@ -9,9 +9,87 @@ class Config:
     model_path: str = "outputs/models/SVM_model.pkl"
     feature_path: str = "outputs/models/vectorizer.pkl"
     models_dir: str = "outputs/models"
+    feature_store_enabled: bool = True # Reuse cleaned text, vectorizer and TF-IDF matrices while data and settings are unchanged
+    feature_store_dir: str = "outputs/feature_store"
+    ingestion_chunk_size: int = 50000 # Rows per chunk when streaming the training CSV
+    streaming_epochs: int = 1 # partial_fit passes over the corpus in streaming training
+    streaming_test_fraction: float = 0.2 # Rows held out for evaluation in streaming training
     available_models: List[str] = field(default_factory=lambda: ["SVM", "Naive_Bayes", "Random_Forest", "Logistic_Regression"])
+    mmap_models: bool = True # Memory-map the arrays of .joblib model exports so forked workers share them
+    bundle_dir: Optional[str] = None # Versioned model bundle (directory with a manifest.json) to serve
+    bundles_dir: str = "outputs/bundles" # Where train_model.py and `model_store bundle` write bundles
+    auto_discover_bundles: bool = True # Without bundle_dir, serve the newest bundle in bundles_dir, else models_dir
+    verify_bundle_checksums: bool = True
+    background_model_loading: bool = True # Start the API before the models finish loading; see /health/ready
+    watch_bundles: bool = False # Poll for a newer bundle and hot-swap it in without a restart
+    bundle_watch_interval: float = 10.0 # Seconds between polls
+    admin_token: Optional[str] = None # Required in the X-Admin-Token header of /admin/* requests when set
+    feedback_path: str = "outputs/feedback/feedback.jsonl" # Labels submitted to /feedback
+    incremental_epochs: int = 1 # partial_fit passes over new samples per incremental update
+    warmup_emails: List[str] = field(default_factory=lambda: [
+        "Congratulations! You have won a free prize, call now to claim",
+        "Are we still meeting for lunch tomorrow?",
+    ]) # Scored by a new bundle before it is swapped in
+    max_batch_size: int = 1000
+    scoring_mode: str = "single_pass" # "single_pass" or "two_pass" (labels from predict); confidences are the same in both
+    linear_fast_path: bool = True # Score linear models (LR, NB, linear SVM) from a folded token->weight table
+    svm_variant: str = "svc" # "svc" (sigmoid-kernel SVC), "nystroem" (kernel approximation) or "linear_svc"
+    svm_approx_components: int = 1000 # Nystroem components for the "nystroem" SVM variant
+    logistic_variant: str = "lbfgs" # "lbfgs" (LogisticRegression) or "sgd" (SGDClassifier, supports partial_fit)
+    feature_mode: str = "tfidf" # "tfidf" (fitted vocabulary) or "hashing" (hashed counts + stored idf vector)
+    hashing_n_features: int = 2 ** 18 # Columns of the "hashing" feature mode
+    search_strategy: str = "grid" # Default ModelTraining search: "grid", "random", "halving_grid" or "halving_random"
+    search_n_iter: int = 20 # Candidates sampled by the "random" strategy
+    search_halving_factor: int = 3 # Halving strategies keep the best 1/factor of the candidates per round
+    search_time_budget: Optional[float] = None # Seconds per model before its search stops trying new candidates
+    parallel_training: bool = True # Run the model families' searches concurrently, each in its own process
+    training_cpu_budget: Optional[int] = None # Cores shared by all searches; None uses every core
+    ensemble_workers: int = 4 # Threads scoring models concurrently; 1 scores them sequentially
+    model_timeout: Optional[float] = 5.0 # Seconds a batch waits for its models; unfinished ones are reported as "Timeout"
+    ensemble_fast_path: bool = False # Return once the majority vote can no longer change
+    cache_enabled: bool = True
+    cache_max_entries: int = 10000
+    cache_ttl_seconds: Optional[float] = 3600.0
+    batching_enabled: bool = True # Queue /predict requests and score them in micro-batches
+    batch_max_size: int = 64 # Requests per micro-batch
+    batch_max_wait_ms: float = 5.0 # Longest a request waits for its batch to fill
+    batch_queue_size: int = 10000 # Pending requests before /predict answers 503
+    batch_concurrency: int = 2 # Micro-batches scored at the same time
+    mbox_batch_size: int = 256 # Messages scored per micro-batch when streaming a mailbox
+    mbox_reader: str = "mmap" # "mmap" (offset-indexed, persisted sidecar index) or "mailbox" (stdlib mailbox.mbox)
+    html_extractor: str = "fast" # "fast" (streaming html.parser tag stripper) or "bs4" (BeautifulSoup)
+    max_part_bytes: int = 256 * 1024 # Decoded bytes kept per MIME part of a message
+    scan_workers: int = 1 # Processes scanning byte-range shards of a mailbox
+    scan_shards_per_worker: int = 4
+    log_level: str = "INFO"
+    log_format: str = "json" # "json" (one object per line) or "text"
+    log_file: Optional[str] = "logs/spam-detection.log" # None logs to stderr
+    log_rotation: str = "size" # "size" (log_max_bytes) or "time" (log_rotate_when, e.g. "midnight")
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_rotate_when: str = "midnight"
+    log_backup_count: int = 5 # Rotated files kept
+    log_queue_size: int = 10000 # Records waiting for the writer thread; further records are dropped, not waited on
+    log_sample_limit: Optional[int] = 100 # Records per call site per window, up to ERROR; None logs everything
+    log_sample_window: float = 60.0 # Seconds
 
 class ModelConfig:
+    # Per-model overrides of Config.search_strategy, for the grids too large to search exhaustively
+    search_strategies = {
+        'DecisionTree': 'halving_grid',
+        'KNN': 'halving_grid',
+        'RandomForest': 'halving_random',
+    }
+
+    # Rough cost of one fit relative to LogisticRegression; with the number of fits a search
+    # runs, this orders the searches and splits the CPU budget between them
+    fit_costs = {
+        'LogisticRegression': 1.0,
+        'DecisionTree': 2.0,
+        'SVM': 10.0,
+        'KNN': 3.0,
+        'RandomForest': 20.0,
+    }
+
     models = {
         'LogisticRegression': {
             'C': [0.01, 0.1, 1, 10, 100],
@@ -29,6 +107,15 @@ class ModelConfig:
             'kernel': ['linear', 'rbf'],
             'gamma': ['scale', 'auto']
         },
+        # Grids for Config.svm_variant "nystroem" and "linear_svc"
+        'SVM_nystroem': {
+            'nystroem__n_components': [300, 1000],
+            'nystroem__gamma': [0.5, 1.0],
+            'svm__estimator__C': [0.1, 1, 10]
+        },
+        'SVM_linear_svc': {
+            'estimator__C': [0.1, 1, 10]
+        },
         'KNN': {
             'n_neighbors': [3, 5, 7, 9, 11],
             'weights': ['uniform', 'distance'],
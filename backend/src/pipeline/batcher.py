@@ -0,0 +1,145 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+from src.utils.logger import get_logger
+from src.utils.metrics import BATCHER_BATCH_SIZE
+
+logger = get_logger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the batcher queue is at capacity and cannot accept a request."""
+
+
+class MicroBatcher:
+    """
+    Collects individual prediction requests into micro-batches.
+
+    Requests are queued on an asyncio.Queue. A background task takes up to
+    `max_batch_size` of them, waiting at most `max_wait_ms` after the first
+    one arrives, and scores the batch with one `predict_fn` call on a thread
+    pool so the event loop never blocks on CPU-bound work. At most
+    `max_concurrent_batches` batches are scored at the same time.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[str]], List[Dict]], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_queue_size: int = 10000, max_concurrent_batches: int = 2):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_batches, thread_name_prefix="batcher")
+        self._collector = asyncio.create_task(self._collect())
+        logger.info(f"Micro-batcher started (batch size {self.max_batch_size}, wait {self.max_wait * 1000:.1f} ms)")
+
+    async def stop(self) -> None:
+        if self._collector is not None:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+        # Fail anything still queued instead of leaving callers waiting forever
+        while self.queue is not None and not self.queue.empty():
+            _, future = self.queue.get_nowait()
+            _fail([future], RuntimeError("Batcher stopped"))
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        logger.info("Micro-batcher stopped")
+
+    def queue_depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    async def submit(self, content: str) -> Dict:
+        if self.queue is None:
+            raise RuntimeError("Batcher not started")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((content, future))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Prediction queue is full ({self.max_queue_size} pending requests)")
+        return await future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # The requests taken off the queue but not yet handed to _score
+            batch: List[tuple] = []
+            getter: Optional[asyncio.Future] = None
+            try:
+                batch.append(await self.queue.get())
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    getter = asyncio.ensure_future(self.queue.get())
+                    done, _ = await asyncio.wait({getter}, timeout=remaining)
+                    if not done:
+                        # A cancelled Queue.get never removes an item; one that won the race still counts
+                        getter.cancel()
+                        await asyncio.gather(getter, return_exceptions=True)
+                        if not getter.cancelled():
+                            batch.append(getter.result())
+                        break
+                    batch.append(getter.result())
+                    getter = None
+
+                await self._slots.acquire()
+            except asyncio.CancelledError:
+                # stop() cancelled us while holding a batch: its callers would otherwise wait forever
+                if getter is not None:
+                    getter.cancel()
+                    if getter.done() and not getter.cancelled():
+                        batch.append(getter.result())
+                _fail([future for _, future in batch], RuntimeError("Batcher stopped"))
+                raise
+
+            task = asyncio.create_task(self._score(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _score(self, batch: List[tuple]) -> None:
+        try:
+            # Requests whose callers gave up don't need scoring
+            batch = [(content, future) for content, future in batch if not future.done()]
+            if not batch:
+                return
+            contents = [content for content, _ in batch]
+            BATCHER_BATCH_SIZE.observe(len(contents))
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(self._executor, self.predict_fn, contents)
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} failed: {e}")
+                _fail([future for _, future in batch], e)
+                return
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+def _fail(futures: List[asyncio.Future], error: Exception) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
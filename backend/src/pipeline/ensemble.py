@@ -0,0 +1,146 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Outcome markers for models that did not produce (labels, confidences)
+ERROR = "Error"
+TIMEOUT = "Timeout"
+SKIPPED = "Skipped"
+
+ModelOutput = Union[Tuple[List[str], List[float]], str]
+ScoringTask = Callable[[], Tuple[List[str], List[float]]]
+
+
+class EnsembleExecutor:
+    """
+    Runs the per-model scoring tasks of one batch, optionally in parallel.
+
+    With `max_workers > 1`, tasks are submitted to a bounded thread pool
+    shared by all requests (sklearn releases the GIL in most of its numeric
+    kernels); otherwise they run one after another on the calling thread.
+    The batch waits at most `model_timeout` seconds from its start. In
+    parallel, every model not finished by then, whether running or still
+    queued behind a busy pool, is reported as TIMEOUT and its queued task is
+    cancelled. Run sequentially, a model cannot be interrupted, so the
+    deadline is checked between models and the ones not yet started are
+    reported as TIMEOUT. With `fast_path` enabled, the executor returns as
+    soon as the majority vote of every email in the batch can no longer
+    change; models still pending at that point are reported as SKIPPED.
+    """
+
+    def __init__(self, max_workers: int = 1, model_timeout: Optional[float] = None, fast_path: bool = False):
+        self.max_workers = max_workers
+        self.model_timeout = model_timeout
+        self.fast_path = fast_path
+        self.pool = None
+        if max_workers > 1:
+            self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ensemble")
+
+    def run(self, tasks: Dict[str, ScoringTask], batch_size: int,
+            decided: Optional[Dict[str, ModelOutput]] = None) -> Dict[str, ModelOutput]:
+        """
+        `decided` holds the outputs of models of the same vote that were scored
+        elsewhere (the linear fast path); the fast path counts them, so models
+        are only skipped once the vote of the whole ensemble is settled.
+        """
+        tally = _VoteTally(len(tasks) + len(decided or {}), batch_size)
+        for output in (decided or {}).values():
+            tally.add(output)
+        if self.pool is None:
+            return self._run_sequential(tasks, tally)
+        return self._run_parallel(tasks, tally)
+
+    def shutdown(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_sequential(self, tasks: Dict[str, ScoringTask], tally: "_VoteTally") -> Dict[str, ModelOutput]:
+        deadline = None if self.model_timeout is None else time.perf_counter() + self.model_timeout
+        outputs = {}
+        timed_out = []
+        for name, task in tasks.items():
+            if self.fast_path and tally.settled():
+                outputs[name] = SKIPPED
+                continue
+            if deadline is not None and time.perf_counter() >= deadline:
+                outputs[name] = TIMEOUT
+                tally.add(TIMEOUT)
+                timed_out.append(name)
+                continue
+            outputs[name] = _call(name, task)
+            tally.add(outputs[name])
+        if timed_out:
+            logger.warning(f"{', '.join(timed_out)} not started within the {self.model_timeout}s model timeout")
+        return outputs
+
+    def _run_parallel(self, tasks: Dict[str, ScoringTask], tally: "_VoteTally") -> Dict[str, ModelOutput]:
+        deadline = None if self.model_timeout is None else time.perf_counter() + self.model_timeout
+        futures: Dict[Future, str] = {}
+        for name, task in tasks.items():
+            futures[self.pool.submit(_call, name, task)] = name
+
+        outputs = {}
+        pending = set(futures)
+
+        while pending:
+            timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                outputs[futures[future]] = future.result()
+                tally.add(outputs[futures[future]])
+
+            if self.fast_path and pending and tally.settled():
+                for future in pending:
+                    future.cancel()
+                    outputs[futures[future]] = SKIPPED
+                break
+
+            if pending and deadline is not None and time.perf_counter() >= deadline:
+                for future in pending:
+                    # Frees the pool of queued tasks; a running thread cannot be
+                    # interrupted, so it is no longer waited for
+                    future.cancel()
+                    outputs[futures[future]] = TIMEOUT
+                timed_out = sorted(futures[future] for future in pending)
+                logger.warning(f"{', '.join(timed_out)} exceeded the {self.model_timeout}s model timeout")
+                break
+
+        return {name: outputs[name] for name in tasks}
+
+
+class _VoteTally:
+    """Tracks spam votes per email to detect when the majority is decided."""
+
+    def __init__(self, model_count: int, batch_size: int):
+        self.model_count = model_count
+        self.remaining = model_count
+        self.spam_votes = np.zeros(batch_size, dtype=int)
+
+    def add(self, output: ModelOutput) -> None:
+        self.remaining -= 1
+        if isinstance(output, tuple):
+            labels, _ = output
+            votes = (label == "Spam" for label in labels)
+            self.spam_votes += np.fromiter(votes, dtype=bool, count=len(self.spam_votes))
+
+    def settled(self) -> bool:
+        # Spam needs a strict majority of all models, mirroring the consensus rule
+        majority = self.model_count / 2
+        spam_decided = self.spam_votes > majority
+        ham_decided = self.spam_votes + self.remaining <= majority
+        return bool(np.all(spam_decided | ham_decided))
+
+
+def _call(name: str, task: ScoringTask) -> ModelOutput:
+    try:
+        return task()
+    except Exception as e:
+        # One record; the writer thread formats the traceback, and repeats are sampled
+        logger.error(f"Prediction failed for {name}: {e}", exc_info=True)
+        return ERROR
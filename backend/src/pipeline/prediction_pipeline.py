@@ -1,101 +1,380 @@
+import csv
+import contextlib
 import mailbox
-import pickle
 import os
 import time
+import shutil
+import tempfile
+import threading
+import multiprocessing
 import pandas as pd
-from typing import Dict, List, Optional
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
 
 from src.utils.state import PredictionState
 from src.utils.logger import get_logger
 from src.config.config import Config
-from src.utils.email_utils import extract_body, all_recipients, clean_text
+from src.utils.email_utils import extract_mail_record, clean_text, MAIL_RECORD_FIELDS
+from src.pipeline.ensemble import EnsembleExecutor, ERROR, TIMEOUT
+from src.utils.cache import PredictionCache
+from src.utils.model_store import BundleError, ModelBundle, find_latest_bundle, load_bundle, load_legacy_bundle, read_manifest
+from src.utils.mbox_utils import MmapMbox, find_shards, iter_mbox_range
+from src.utils.linear_scorer import LinearScorer
+from src.utils.metrics import (
+    CLEAN_SECONDS, CONSENSUS_SECONDS, LINEAR_FAST_PATH_SECONDS, MODEL_FAILURES, MODEL_SECONDS,
+    PIPELINE_BATCH_SIZE, VECTORIZE_SECONDS
+)
+from src.utils.scoring import ScoringSpec, inspect_model, score_single_pass, score_two_pass
 
 logger = get_logger(__name__)
 
+def _score_model_task(name: str, score_model: Callable, model: object, spec: ScoringSpec, features: object, batch_size: int):
+    started = time.perf_counter()
+    labels, confidences = score_model(model, spec, features)
+    MODEL_SECONDS.labels(name).observe(time.perf_counter() - started)
+    if len(labels) != batch_size:
+        raise ValueError(f"Model {name} returned {len(labels)} predictions for {batch_size} emails")
+    return labels, confidences
+
 class PredictionPipeline:
     def __init__(self, load_models: bool = True):
         self.config = Config()
         self.mailbox = None
-        self.feature_transformer = None
-        self.models = {} # Dictionary to store all models
+        # Models, vectorizer and version live in one bundle so they are always replaced together
+        self.bundle = ModelBundle()
         # self.model = None # Deprecated single model reference
+        self.ensemble = EnsembleExecutor(
+            max_workers=self.config.ensemble_workers,
+            model_timeout=self.config.model_timeout,
+            fast_path=self.config.ensemble_fast_path
+        )
+        self.cache = PredictionCache(
+            max_entries=self.config.cache_max_entries,
+            ttl_seconds=self.config.cache_ttl_seconds
+        ) if self.config.cache_enabled else None
+        self.load_error: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._watch_stop: Optional[threading.Event] = None
         
         if load_models:
             self._load_models()
-    
-    def _load_models(self) -> None:
-        logger.info(f"Loading models from {self.config.models_dir}")
-        self.feature_transformer = pickle.load(open(self.config.feature_path, "rb"))
-        
-        # Load all available models
-        for model_name in self.config.available_models:
+
+    @property
+    def models(self) -> Dict[str, object]:
+        return self.bundle.models
+
+    @models.setter
+    def models(self, models: Dict[str, object]) -> None:
+        self.bundle.models = models
+        self.bundle.scoring_specs = {}
+        self.bundle.linear_scorer = None
+
+    @property
+    def feature_transformer(self) -> object:
+        return self.bundle.feature_transformer
+
+    @feature_transformer.setter
+    def feature_transformer(self, feature_transformer: object) -> None:
+        self.bundle.feature_transformer = feature_transformer
+        self.bundle.linear_scorer = None
+
+    @property
+    def scoring_specs(self) -> Dict[str, ScoringSpec]:
+        return self.bundle.scoring_specs
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Identifies the loaded bundle; part of every cache key"""
+        return self.bundle.version
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def ensure_loaded(self) -> None:
+        """Load the models unless they already are; safe to call from several threads"""
+        if self._ready.is_set():
+            return
+        with self._load_lock:
+            if not self._ready.is_set():
+                self._load_models()
+
+    def start_background_load(self) -> threading.Thread:
+        """Load the models on a daemon thread so the process can answer liveness probes meanwhile"""
+        def load() -> None:
             try:
-                path = os.path.join(self.config.models_dir, f"{model_name}_model.pkl")
-                if os.path.exists(path):
-                    self.models[model_name] = pickle.load(open(path, "rb"))
-                    logger.info(f"Loaded {model_name}")
-                else:
-                    logger.warning(f"Model file not found: {path}")
+                self.ensure_loaded()
             except Exception as e:
-                logger.error(f"Failed to load {model_name}: {e}")
-                
-        if not self.models:
+                self.load_error = str(e)
+                logger.error(f"Background model loading failed: {e}")
+
+        thread = threading.Thread(target=load, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def _find_bundle(self) -> Optional[str]:
+        if self.config.bundle_dir:
+            return self.config.bundle_dir
+        if self.config.auto_discover_bundles:
+            return find_latest_bundle(self.config.bundles_dir)
+        return None
+
+    def _read_bundle(self, bundle_dir: Optional[str]) -> ModelBundle:
+        if bundle_dir is not None:
+            logger.info(f"Loading model bundle from {bundle_dir}")
+            bundle = load_bundle(bundle_dir, mmap=self.config.mmap_models, verify=self.config.verify_bundle_checksums)
+        else:
+            logger.info(f"No model bundle found, loading models from {self.config.models_dir}")
+            bundle = load_legacy_bundle(self.config.models_dir, self.config.feature_path,
+                                        self.config.available_models, mmap=self.config.mmap_models)
+
+        if not bundle.models:
             logger.error("No models loaded!")
-            
-        logger.info("All models loaded successfully")
-    
+        if self.config.linear_fast_path:
+            bundle.linear_scorer = LinearScorer.compile(bundle.feature_transformer, bundle.models)
+        fast_models = bundle.linear_scorer.model_names if bundle.linear_scorer is not None else []
+        for name, spec in bundle.scoring_specs.items():
+            method = "linear fast path" if name in fast_models else spec.method
+            logger.info(f"{name} scored via {method}{' (dense input)' if spec.dense_input else ''}")
+        return bundle
+
+    def _install_bundle(self, bundle: ModelBundle) -> None:
+        # A single reference assignment: requests already scoring keep the bundle they started with
+        self.bundle = bundle
+        self.load_error = None
+        if self.cache is not None:
+            # Results from the previous models must not be served after a reload
+            self.cache.clear()
+        self._ready.set()
+
+    def _load_models(self) -> None:
+        started = time.perf_counter()
+        self._install_bundle(self._read_bundle(self._find_bundle()))
+        logger.info(f"All models loaded successfully (version {self.model_version}) in {time.perf_counter() - started:.2f}s")
+
+    def _warm_up(self, bundle: ModelBundle) -> None:
+        """Score a few sample emails so the first real requests don't pay for lazy initialization"""
+        if not bundle.models:
+            raise BundleError(f"Bundle {bundle.version} contains no models")
+        for result in self._score_cleaned([clean_text(email) for email in self.config.warmup_emails], bundle):
+            if not self._is_cacheable(result):
+                raise BundleError(f"Warm-up prediction failed for bundle {bundle.version}: {result['detailed_results']}")
+
+    def reload_bundle(self, bundle_dir: Optional[str] = None) -> Dict:
+        """
+        Load a bundle next to the one being served, warm it up and swap it in.
+
+        Without `bundle_dir` the configured or newest bundle is used. If loading
+        or warm-up fails the current bundle stays in place and the error is raised.
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            bundle = self._read_bundle(bundle_dir or self._find_bundle())
+            self._warm_up(bundle)
+
+            previous_version = self.model_version
+            self._install_bundle(bundle)
+            elapsed = time.perf_counter() - started
+            logger.info(f"Swapped model bundle {previous_version} -> {bundle.version} in {elapsed:.2f}s")
+            return {
+                'previous_version': previous_version,
+                'model_version': bundle.version,
+                'bundle_dir': bundle.path,
+                'models': list(bundle.models),
+                'reload_seconds': round(elapsed, 3),
+            }
+
+    def start_bundle_watcher(self, interval: Optional[float] = None) -> threading.Thread:
+        """
+        Poll for a newer bundle every `interval` seconds and reload when its
+        manifest version differs from the one being served.
+        """
+        interval = interval or self.config.bundle_watch_interval
+        self._watch_stop = threading.Event()
+        stop = self._watch_stop
+
+        def watch() -> None:
+            failed_version = None
+            while not stop.wait(interval):
+                bundle_dir = self._find_bundle()
+                if bundle_dir is None:
+                    continue
+                try:
+                    version = read_manifest(bundle_dir)['version']
+                except (OSError, ValueError, KeyError, BundleError) as e:
+                    logger.warning(f"Unreadable bundle manifest in {bundle_dir}: {e}")
+                    continue
+                if version in (self.model_version, failed_version):
+                    continue
+                try:
+                    self.reload_bundle(bundle_dir)
+                except Exception as e:
+                    # Don't retry a broken bundle every interval; a newer one replaces it
+                    failed_version = version
+                    logger.error(f"Bundle watcher failed to reload {bundle_dir}: {e}")
+
+        thread = threading.Thread(target=watch, name="bundle-watcher", daemon=True)
+        thread.start()
+        logger.info(f"Watching for new model bundles every {interval}s")
+        return thread
+
+    def stop_bundle_watcher(self) -> None:
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
     def predict_single_email(self, email_body: str) -> Dict:
+        return self.predict_batch([email_body])[0]
+
+    def predict_batch(self, emails: List[str]) -> List[Dict]:
+        """
+        Score a batch of emails with every loaded model.
+
+        The whole batch is cleaned and vectorized into a single feature matrix,
+        and each model is invoked once on that matrix instead of once per email.
+        With `Config.scoring_mode == "single_pass"` labels and confidences come
+        from a single predict_proba/decision_function call per model.
+        """
         if not self.models or self.feature_transformer is None:
-            self._load_models()
+            self.ensure_loaded()
 
-        cleaned_body = clean_text(email_body)
-        features = self.feature_transformer.transform([cleaned_body]).toarray()
-        
-        results = {}
-        total_confidence = 0
-        spam_votes = 0
-        
-        # Run prediction on all models
-        for name, model in self.models.items():
+        if not emails:
+            return []
+
+        started = time.perf_counter()
+        cleaned_bodies = [clean_text(email_body) for email_body in emails]
+        CLEAN_SECONDS.observe(time.perf_counter() - started)
+        return self._predict_cleaned(cleaned_bodies)
+
+    def _predict_cleaned(self, cleaned_bodies: List[str]) -> List[Dict]:
+        # Read the bundle reference once: a concurrent reload never mixes two bundles in one request
+        bundle = self.bundle
+        PIPELINE_BATCH_SIZE.observe(len(cleaned_bodies))
+        if self.cache is None:
+            return self._score_cleaned(cleaned_bodies, bundle)
+
+        results: List[Optional[Dict]] = [None] * len(cleaned_bodies)
+        keys = [PredictionCache.make_key(body, bundle.version) for body in cleaned_bodies]
+
+        # Score each distinct uncached body once, even if it repeats within the batch
+        missing: Dict[str, List[int]] = {}
+        for index, key in enumerate(keys):
+            if key in missing:
+                missing[key].append(index)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                missing[key] = [index]
+
+        if missing:
+            miss_bodies = [cleaned_bodies[indexes[0]] for indexes in missing.values()]
+            for (key, indexes), result in zip(missing.items(), self._score_cleaned(miss_bodies, bundle)):
+                if self._is_cacheable(result):
+                    self.cache.put(key, result)
+                results[indexes[0]] = result
+                for index in indexes[1:]:
+                    results[index] = PredictionCache.copy_result(result)
+
+        return results
+
+    @staticmethod
+    def _is_cacheable(result: Dict) -> bool:
+        # Failed or timed-out models may succeed next time, so don't pin those results.
+        # Skipped models are fine: they are only skipped once the whole ensemble's vote is settled
+        return result['prediction'] != "Error" and all(
+            detail['prediction'] not in (ERROR, TIMEOUT) for detail in result['detailed_results'].values()
+        )
+
+    def cache_stats(self) -> Dict:
+        if self.cache is None:
+            return {'enabled': False}
+        return dict(self.cache.stats(), enabled=True, model_version=self.model_version)
+
+    def _score_cleaned(self, cleaned_bodies: List[str], bundle: ModelBundle) -> List[Dict]:
+        batch_size = len(cleaned_bodies)
+
+        # Linear models are scored straight from the folded token table, skipping the TF-IDF matrix
+        fast_outputs = {}
+        if bundle.linear_scorer is not None:
             try:
-                prediction = model.predict(features)
-                if len(prediction) == 0:
-                     logger.error(f"Model {name} returned empty prediction")
-                     results[name] = {"prediction": "Error", "confidence": 0}
-                     continue
-
-                prediction_label = "Spam" if str(prediction[0]) == "0" else "Ham"
-                
-                confidence = 0.0
-                if hasattr(model, "predict_proba"):
-                    try:
-                        proba = model.predict_proba(features)
-                        if len(proba) > 0 and len(proba[0]) > 0:
-                             confidence = float(max(proba[0])) * 100
-                    except Exception as proba_error:
-                        logger.warning(f"predict_proba failed for {name}: {proba_error}")
-
-                results[name] = {
-                    "prediction": prediction_label,
-                    "confidence": confidence
-                }
-                
-                if prediction_label == "Spam":
-                    spam_votes += 1
-                
+                started = time.perf_counter()
+                fast_outputs = bundle.linear_scorer.score(cleaned_bodies)
+                LINEAR_FAST_PATH_SECONDS.observe(time.perf_counter() - started)
             except Exception as e:
-                logger.error(f"Prediction failed for {name}: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                results[name] = {"prediction": "Error", "confidence": 0}
+                logger.error(f"Linear fast path failed, falling back to sklearn: {e}")
+
+        score_model = score_single_pass if self.config.scoring_mode == "single_pass" else score_two_pass
+
+        tasks = {}
+        features = None
+        dense_features = None
+        for name, model in bundle.models.items():
+            if name in fast_outputs:
+                continue
+            spec = bundle.scoring_specs.get(name)
+            if spec is None:
+                # Models assigned after load are tagged once, on first use
+                spec = bundle.scoring_specs[name] = inspect_model(model)
+
+            if features is None:
+                # Keep the TF-IDF output as a CSR matrix; only densify for models fitted on dense input
+                started = time.perf_counter()
+                features = bundle.feature_transformer.transform(cleaned_bodies)
+                VECTORIZE_SECONDS.observe(time.perf_counter() - started)
+            model_features = features
+            if spec.dense_input:
+                if dense_features is None:
+                    dense_features = features.toarray()
+                model_features = dense_features
+
+            tasks[name] = partial(_score_model_task, name, score_model, model, spec, model_features, batch_size)
+
+        # model name -> (labels, confidences) for the whole batch, or an Error/Timeout/Skipped marker
+        slow_outputs = self.ensemble.run(tasks, batch_size, decided=fast_outputs) if tasks else {}
+        model_outputs = {
+            name: fast_outputs[name] if name in fast_outputs else slow_outputs[name]
+            for name in bundle.models
+        }
+        for name, output in model_outputs.items():
+            if isinstance(output, str):
+                MODEL_FAILURES.labels(name, output).inc()
+
+        primary_model = "SVM" if "SVM" in bundle.models else next(iter(bundle.models), None)
+        started = time.perf_counter()
+        results = [self._build_result(model_outputs, index, primary_model) for index in range(batch_size)]
+        CONSENSUS_SECONDS.observe(time.perf_counter() - started)
+        return results
+
+    def _build_result(self, model_outputs: Dict, index: int, primary_model: Optional[str]) -> Dict:
+        results = {}
+        spam_votes = 0
+
+        for name, output in model_outputs.items():
+            if isinstance(output, str):
+                results[name] = {"prediction": output, "confidence": 0}
+                continue
+
+            labels, confidences = output
+            results[name] = {
+                "prediction": labels[index],
+                "confidence": confidences[index]
+            }
+
+            if labels[index] == "Spam":
+                spam_votes += 1
 
         # Consensus Logic
         # If majority say Spam, it's Spam. (Spam=0 in our mapping, but label is "Spam")
         # Actually in our mapping: Spam = 0, Ham = 1.
         # Logic above: label "Spam" if '0'.
         
-        vote_count = len(self.models)
+        vote_count = len(model_outputs)
         is_spam_consensus = spam_votes > (vote_count / 2)
         consensus_prediction = "Spam" if is_spam_consensus else "Ham"
         
@@ -108,7 +387,6 @@ class PredictionPipeline:
             }
 
         # Use Best Model (SVM) for primary stats if available, else average or consensus
-        primary_model = "SVM" if "SVM" in self.models else list(self.models.keys())[0]
         primary_result = results.get(primary_model, {"confidence": 0})
         
         return {
@@ -122,10 +400,14 @@ class PredictionPipeline:
         """Load MBOX file"""
 
         logger.info(f"Loading mailbox from {mailbox_path}")
-        self.mailbox = mailbox.mbox(mailbox_path)
+        if self.config.mbox_reader == "mmap":
+            self.mailbox = MmapMbox(mailbox_path)
+        else:
+            self.mailbox = mailbox.mbox(mailbox_path)
         logger.info(f"Loaded mailbox from {mailbox_path}")
 
-    def process_mailbox(self, mailbox_path: Optional[str] = None) -> List[Dict]:
+    def iter_mailbox(self, mailbox_path: Optional[str] = None) -> Iterator[Dict]:
+        """Yield one cleaned record per message without materializing the mailbox"""
         if mailbox_path:
             self.load_mailbox(mailbox_path)
         
@@ -133,66 +415,178 @@ class PredictionPipeline:
             raise ValueError("No mailbox loaded. Call load_mailbox() first.")
         
         logger.info("Processing mailbox")
-        data = []
-        
-        for message in self.mailbox:
-            labels = (message.get("X-Gmail-Labels") or "").lower()
-            category = (
-                "Spam" if "spam" in labels else
-                "Promotions" if "category_promotions" in labels else
-                "Social" if "category_social" in labels else
-                "Updates" if "category_updates" in labels else
-                "Inbox"
-            )
-            time_str = message.get("Date", "")
-            recipients = clean_text(all_recipients(message))
-            subject = clean_text(message.get("Subject", ""))
-            body = clean_text(extract_body(message))
-            direction = "Sent" if "Sent" in (message.get("X-Gmail-Labels") or "") else "Received"
-            
-            data.append({
-                "Time": time_str,
-                "Recipients": recipients,
-                "Subject": subject,
-                "Body": body,
-                "Category": category,
-                "Direction": direction
-            })
-        
-        logger.info(f"Processed {len(data)} emails from mailbox")
-        self.mailbox.close()
-        
-        return data
+        count = 0
+        try:
+            for message in self.mailbox:
+                yield self.extract_record(message)
+                count += 1
+        finally:
+            logger.info(f"Processed {count} emails from mailbox")
+            self.mailbox.close()
+
+    def extract_record(self, message: object) -> Dict:
+        return extract_mail_record(message, self.config.max_part_bytes, self.config.html_extractor)
+
+    def process_mailbox(self, mailbox_path: Optional[str] = None) -> List[Dict]:
+        return list(self.iter_mailbox(mailbox_path))
+
+    def iter_predictions(self, mail_records: Iterable[Dict], batch_size: Optional[int] = None) -> Iterator[Dict]:
+        """Score records in fixed-size micro-batches, yielding each with its "Prediction" set"""
+        if not self.models or self.feature_transformer is None:
+            self.ensure_loaded()
+
+        batch_size = batch_size or self.config.mbox_batch_size
+        records = iter(mail_records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            # Bodies are already cleaned by extract_mail_record
+            results = self._predict_cleaned([mail.get('Body', '') or '' for mail in batch])
+            for mail, result in zip(batch, results):
+                mail["Prediction"] = result['prediction']
+                yield mail
     
     def run_prediction(self, mail_data: List[Dict]) -> List[Dict]:
-        if self.model is None or self.feature_transformer is None:
-            self._load_models()
-        
-        start_time = time.time()
+        start_time = time.perf_counter()
         logger.info("Running predictions")
         
-        for mail in mail_data:
-            body_text = mail.get('Body', '')
-            features = self.feature_transformer.transform([body_text])
-            prediction = self.model.predict(features)
-            prediction_label = "Spam" if str(prediction[0]) == "0" else "Ham"
-            mail["Prediction"] = prediction_label
+        mail_data = list(self.iter_predictions(mail_data))
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         logger.info(f"Prediction completed in {end_time - start_time:.2f} seconds")
         
         return mail_data
+
+    def stream_mbox_predictions(self, mailbox_path: str, output_path: str, batch_size: Optional[int] = None,
+                                workers: Optional[int] = None) -> int:
+        """
+        Parse, clean and score a mailbox in micro-batches, appending each batch
+        to `output_path` as it completes. Memory use does not grow with the
+        size of the mailbox. With more than one worker the file is split into
+        byte-range shards scanned by separate processes. Returns the number of
+        messages written.
+        """
+        workers = workers or self.config.scan_workers
+        start_time = time.time()
+        if workers > 1:
+            count = self._scan_mailbox_parallel(mailbox_path, output_path, batch_size, workers)
+        else:
+            with open(output_path, "w", newline="", encoding="utf-8") as f:
+                writer = _prediction_writer(f)
+                writer.writeheader()
+                count = _write_predictions(writer, self.iter_predictions(self.iter_mailbox(mailbox_path), batch_size))
+
+        logger.info(f"Predictions for {count} emails saved to {output_path} in {time.time() - start_time:.2f} seconds")
+        return count
+
+    def _scan_mailbox_parallel(self, mailbox_path: str, output_path: str, batch_size: Optional[int], workers: int) -> int:
+        if not self.models or self.feature_transformer is None:
+            self.ensure_loaded()
+
+        # Several shards per worker so one slow shard doesn't idle the rest
+        shard_count = workers * self.config.scan_shards_per_worker
+        reader = self.config.mbox_reader
+        if reader == "mmap":
+            # Builds (or reuses) the persisted offset index that the workers then load
+            with MmapMbox(mailbox_path) as box:
+                shards = box.shards(shard_count)
+        else:
+            shards = find_shards(mailbox_path, shard_count)
+        logger.info(f"Scanning {mailbox_path} in {len(shards)} shards with {workers} workers")
+
+        tmp_dir = tempfile.mkdtemp(prefix="mbox_scan_", dir=os.path.dirname(os.path.abspath(output_path)))
+        jobs = [
+            (mailbox_path, reader, start, end, os.path.join(tmp_dir, f"shard_{index:05d}.csv"), batch_size)
+            for index, (start, end) in enumerate(shards)
+        ]
+
+        # Forked workers inherit the loaded models; spawned workers load their own
+        use_fork = "fork" in multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if use_fork else "spawn")
+        count = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_shard_worker, initargs=(self if use_fork else None,)) as executor, \
+                    open(output_path, "w", newline="", encoding="utf-8") as out:
+                _prediction_writer(out).writeheader()
+                # map() yields in submission order, so shards are merged in mailbox order
+                for shard_path, shard_count in executor.map(_scan_shard, jobs):
+                    with open(shard_path, newline="", encoding="utf-8") as shard_file:
+                        shutil.copyfileobj(shard_file, out)
+                    os.remove(shard_path)
+                    count += shard_count
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return count
+
+    def reset_after_fork(self, workers: Optional[int] = None) -> None:
+        """
+        Replace thread-backed state that does not survive os.fork(). The
+        ensemble gets `workers` threads, by default `Config.ensemble_workers`.
+        """
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watch_stop = None
+        self.ensemble = EnsembleExecutor(
+            max_workers=self.config.ensemble_workers if workers is None else workers,
+            model_timeout=self.config.model_timeout,
+            fast_path=self.config.ensemble_fast_path
+        )
+        if self.cache is not None:
+            self.cache = PredictionCache(
+                max_entries=self.config.cache_max_entries,
+                ttl_seconds=self.config.cache_ttl_seconds
+            )
     
     def predict_mbox_file(self, mailbox_path: str, output_path: Optional[str] = None) -> pd.DataFrame:
-        mail_data = self.process_mailbox(mailbox_path)
-        mail_data = self.run_prediction(mail_data)
-        df = pd.DataFrame(mail_data)
+        """Score a mailbox into a DataFrame; use stream_mbox_predictions for large mailboxes"""
+        df = pd.DataFrame(self.iter_predictions(self.iter_mailbox(mailbox_path)))
         if output_path:
             df.to_csv(output_path, index=False)
             logger.info(f"Predictions saved to {output_path}")
         return df
 
 
+def _prediction_writer(f) -> csv.DictWriter:
+    return csv.DictWriter(f, fieldnames=MAIL_RECORD_FIELDS + ["Prediction"], lineterminator="\n")
+
+
+def _write_predictions(writer: csv.DictWriter, mails: Iterable[Dict]) -> int:
+    count = 0
+    for mail in mails:
+        writer.writerow(mail)
+        count += 1
+    return count
+
+
+# Pipeline used by the current mailbox scan worker process
+_SHARD_PIPELINE: Optional[PredictionPipeline] = None
+
+
+def _init_shard_worker(pipeline: Optional[PredictionPipeline]) -> None:
+    global _SHARD_PIPELINE
+    if pipeline is None:
+        pipeline = PredictionPipeline(load_models=True)
+    # Parallelism comes from the worker processes; score models sequentially inside each
+    pipeline.reset_after_fork(workers=1)
+    _SHARD_PIPELINE = pipeline
+
+
+def _scan_shard(job: tuple) -> tuple:
+    mailbox_path, reader, start, end, shard_path, batch_size = job
+    with contextlib.ExitStack() as stack:
+        if reader == "mmap":
+            messages = stack.enter_context(MmapMbox(mailbox_path)).iter_byte_range(start, end)
+        else:
+            messages = iter_mbox_range(mailbox_path, start, end)
+        records = (_SHARD_PIPELINE.extract_record(message) for message in messages)
+        with open(shard_path, "w", newline="", encoding="utf-8") as f:
+            count = _write_predictions(_prediction_writer(f), _SHARD_PIPELINE.iter_predictions(records, batch_size))
+    return shard_path, count
+
+
 def run_legacy_pipeline(state: PredictionState) -> None:
     pipeline = PredictionPipeline(load_models=False)
     pipeline.load_mailbox(state.mailbox_path)
@@ -1,6 +1,7 @@
 from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
 from src.components.model_training import ModelTraining
+from src.components.streaming_training import StreamingTraining
 from src.utils.state import TrainingState
 from src.utils.logger import get_logger
 
@@ -17,9 +18,10 @@ class TrainingPipeline:
             logger.info("Initiating training pipeline")
             ingestion = DataIngestion()
             self.state = ingestion.load_data(self.state)
-            logger.info(f"Data loaded successfully: {self.state.training_data.shape}")
-            logger.info(f"Columns: {self.state.training_data.columns.tolist()}")
-            logger.info(f"Sample size: {len(self.state.training_data)} emails")
+            if self.state.training_data is not None:
+                logger.info(f"Data loaded successfully: {self.state.training_data.shape}")
+                logger.info(f"Columns: {self.state.training_data.columns.tolist()}")
+                logger.info(f"Sample size: {len(self.state.training_data)} emails")
 
             transformation = DataTransformation()
             self.state = transformation.transform_data(self.state)
@@ -47,6 +49,27 @@ class TrainingPipeline:
             logger.error(f"Pipeline failed: {str(e)}")
             raise e
 
+    def run_streaming_pipeline(self, data_path: str = None, output_dir: str = None):
+        """Out-of-core training: the corpus is streamed in chunks into partial_fit models"""
+        try:
+            logger.info("Initiating streaming training pipeline")
+            ingestion = DataIngestion()
+            manifest = StreamingTraining().train(lambda: ingestion.iter_chunks(data_path), output_dir=output_dir)
+            logger.info(f"Streaming training completed: bundle {manifest['version']}")
+            return manifest
+        except Exception as e:
+            logger.error(f"Streaming pipeline failed: {str(e)}")
+            raise e
+
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Train the spam classifiers")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Stream the training CSV in chunks into partial_fit models (corpora larger than RAM)")
+    args = parser.parse_args()
+
     pipeline = TrainingPipeline()
-    pipeline.run_pipeline(cv_folds=5)
\ No newline at end of file
+    if args.streaming:
+        pipeline.run_streaming_pipeline()
+    else:
+        pipeline.run_pipeline(cv_folds=5)
\ No newline at end of file
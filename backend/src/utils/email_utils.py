@@ -1,35 +1,109 @@
 import re
+from email.message import Message
 from html import unescape
+from html.parser import HTMLParser
 from email.utils import getaddresses
-from bs4 import BeautifulSoup
 from typing import Any
 
+# Decoded bytes kept per MIME part; anything beyond is spam padding or attachments
+MAX_PART_BYTES = 256 * 1024
+
+_WHITESPACE_RE = re.compile(r'[\\\s]+')
+
+# ----------------------------------------------------------------------------
+# Streaming tag stripper for HTML parts
+# ----------------------------------------------------------------------------
+class _HTMLTextExtractor(HTMLParser):
+    # Matches BeautifulSoup.get_text(): script/style contents and comments are dropped
+    _SKIPPED_TAGS = {"script", "style", "template"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    extractor = _HTMLTextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return " ".join(extractor.parts)
+
+
+def _capped_payload(part: Any, max_part_bytes: int) -> Any:
+    """
+    The part's decoded payload. Base64 and quoted-printable parts are cut to
+    what `max_part_bytes` of output needs before decoding, so a huge part
+    costs no full decode; other encodings are passed through undecoded.
+    """
+    encoding = str(part.get("content-transfer-encoding", "")).strip().lower()
+    if encoding == "base64":
+        # Standard wrapping: 57 bytes per 76-character line plus CRLF
+        limit = -(-max_part_bytes // 57) * 78
+    elif encoding == "quoted-printable":
+        # Up to three characters ("=XX") per byte
+        limit = max_part_bytes * 3
+    else:
+        return part.get_payload(decode=True)
+
+    # Both encodings are plain ASCII, so this is the raw payload
+    raw = part.get_payload()
+    if not isinstance(raw, str) or len(raw) <= limit:
+        return part.get_payload(decode=True)
+    capped = Message()
+    capped["Content-Transfer-Encoding"] = encoding
+    capped.set_payload(raw[:limit])
+    return capped.get_payload(decode=True)
+
+
+def _part_text(payload: bytes, content_type: str, max_part_bytes: int, html_extractor: str) -> str:
+    text = unescape(payload[:max_part_bytes].decode(errors="ignore"))
+    if content_type == "text/plain":
+        return text
+    if html_extractor == "bs4":
+        # Opt-in fallback for markup the stdlib parser handles poorly
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(text, "html.parser").get_text(" ")
+    return html_to_text(text)
+
 # ----------------------------------------------------------------------------
 # Function to extract email body content
 # ----------------------------------------------------------------------------
-def extract_body(msg: object) -> str:
+def extract_body(msg: object, max_part_bytes: int = MAX_PART_BYTES, html_extractor: str = "fast") -> str:
+    """
+    Plain-text parts are used as-is, HTML parts go through a streaming tag
+    stripper (or BeautifulSoup with html_extractor="bs4"), and every part is
+    capped at `max_part_bytes`, both before the transfer decoding and before
+    the text decoding.
+    """
     texts = []
 
     if msg.is_multipart():
         for part in msg.walk():
-            if part.get_content_type() in ("text/plain", "text/html"):
-                payload = part.get_payload(decode=True)
+            content_type = part.get_content_type()
+            if content_type in ("text/plain", "text/html"):
+                payload = _capped_payload(part, max_part_bytes)
                 if payload:
-                    text = payload.decode(errors="ignore")
-                    text = unescape(text)
-                    text = BeautifulSoup(text, "html.parser").get_text(" ")
-                    texts.append(text)
+                    texts.append(_part_text(payload, content_type, max_part_bytes, html_extractor))
     else:
-        payload = msg.get_payload(decode=True)
+        payload = _capped_payload(msg, max_part_bytes)
         if payload:
-            text = unescape(payload.decode(errors="ignore"))
-            text = BeautifulSoup(text, "html.parser").get_text(" ")
-            texts.append(text)
-
-    clean = " ".join(texts)
-    clean = re.sub(r'\\+', ' ', clean)
-    clean = re.sub(r'[\r\n\t]+', ' ', clean)
-    clean = re.sub(r'\s+', ' ', clean)
+            texts.append(_part_text(payload, msg.get_content_type(), max_part_bytes, html_extractor))
+
+    # Backslashes and any whitespace run collapse to a single space
+    clean = _WHITESPACE_RE.sub(' ', " ".join(texts))
     return clean.strip()
 
 # ----------------------------------------------------------------------------
@@ -42,25 +116,71 @@ def all_recipients(msg: object) -> str:
     return ", ".join(sorted(set(addr for _, addr in fields if addr)))
 
 
+# ----------------------------------------------------------------------------
+# Function to turn a mailbox message into a cleaned CSV record
+# ----------------------------------------------------------------------------
+MAIL_RECORD_FIELDS = ["Time", "Recipients", "Subject", "Body", "Category", "Direction"]
+
+def extract_mail_record(message: object, max_part_bytes: int = MAX_PART_BYTES, html_extractor: str = "fast") -> dict:
+    labels = (message.get("X-Gmail-Labels") or "").lower()
+    category = (
+        "Spam" if "spam" in labels else
+        "Promotions" if "category_promotions" in labels else
+        "Social" if "category_social" in labels else
+        "Updates" if "category_updates" in labels else
+        "Inbox"
+    )
+    direction = "Sent" if "Sent" in (message.get("X-Gmail-Labels") or "") else "Received"
+
+    return {
+        "Time": message.get("Date", ""),
+        "Recipients": clean_text(all_recipients(message)),
+        "Subject": clean_text(message.get("Subject", "")),
+        "Body": clean_text(extract_body(message, max_part_bytes, html_extractor)),
+        "Category": category,
+        "Direction": direction
+    }
+
+
+# ----------------------------------------------------------------------------
+# Precompiled patterns for clean_text
+# ----------------------------------------------------------------------------
+# Numbers of length 3 or more, to target prices/codes ("10000" -> "num").
+# Equivalent to r'\b\d{3,}\b', but leading with \d lets the regex engine
+# skip ahead to digits instead of testing a word boundary at every position.
+_LONG_NUMBER_RE = re.compile(r'\d(?<!\w\d)\d{2,}(?!\w)')
+
+# Control and zero-width characters (all of them are non-printable)
+_STRIP_RE = re.compile('[\x00-\x08\x0B-\x0C\x0E-\x1F\u200B\u200C\u200D\u200E\u200F\uFEFF]+')
+
+_SURROGATE_RE = re.compile('[\ud800-\udfff]')
+
 # ----------------------------------------------------------------------------
 # Function to clean text for Excel compatibility
 # ----------------------------------------------------------------------------
 def clean_text(text: str | Any) -> str:
     if not isinstance(text, str):
         return text
-    
-    # Pre-clean: special handling for currency and numbers
-    text = re.sub(r'\$', ' dollar ', text)
-    text = re.sub(r'\£', ' pound ', text)
-    text = re.sub(r'\€', ' euro ', text)
-    
-    # Replace numbers with a specific token to generalize "10000" -> "num"
-    # This matches numbers of length 3 or more to target prices/codes
-    text = re.sub(r'\b\d{3,}\b', ' num ', text)
-
-    text = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\u200B\u200C\u200D\u200E\u200F\uFEFF]', '', text)
-    text = text.encode("utf-16", "surrogatepass").decode("utf-16", "ignore")
+
+    # Numbers are replaced first: neither the currency words nor the deleted
+    # characters below can change which digit runs form a number. The cheap
+    # C-level checks skip the remaining passes for the common case.
+    text = _LONG_NUMBER_RE.sub(' num ', text)
+    if '$' in text:
+        text = text.replace('$', ' dollar ')
+    if not text.isascii():
+        if '£' in text:
+            text = text.replace('£', ' pound ')
+        if '€' in text:
+            text = text.replace('€', ' euro ')
+
+    if not text.isprintable():
+        text = _STRIP_RE.sub('', text)
+        # Drop lone surrogates (and join split pairs) the way a UTF-16 round trip does
+        if not text.isascii() and _SURROGATE_RE.search(text):
+            text = text.encode("utf-16", "surrogatepass").decode("utf-16", "ignore")
+
     text = text[:32767]
     if text.startswith(("=", "+", "-", "@")):
         text = "'" + text
-    return text
\ No newline at end of file
+    return text
@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.utils.logger import get_logger
+from src.utils.model_store import file_sha256, load_features, save_features
+
+logger = get_logger(__name__)
+
+META_NAME = "meta.json"
+STORE_FORMAT = 1
+CSR_PARTS = ("data", "indices", "indptr")
+
+
+@dataclass
+class FeatureSet:
+    """The output of preprocessing and vectorizing one dataset split"""
+    train_texts: List[str]
+    test_texts: List[str]
+    train_index: np.ndarray
+    test_index: np.ndarray
+    y_train: np.ndarray
+    y_test: np.ndarray
+    X_train: sp.csr_matrix
+    X_test: sp.csr_matrix
+    vectorizer: Any
+
+
+# ----------------------------------------------------------------------------
+# Function to derive the cache key of a feature set
+# ----------------------------------------------------------------------------
+def feature_key(dataset_digest: str, vectorizer: Any, split: Dict[str, Any],
+                extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    A feature set depends on the dataset bytes, the (unfitted) vectorizer's
+    class and parameters, how the data is split, and anything in `extra`
+    such as a digest of the text preprocessing code. Change any of them and
+    the key changes.
+    """
+    description = {
+        'dataset': dataset_digest,
+        'vectorizer': type(vectorizer).__name__,
+        'params': vectorizer.get_params(),
+        'split': split,
+        'extra': extra or {},
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_digest(path: str) -> str:
+    return file_sha256(path)
+
+
+class FeatureStore:
+    """
+    Feature sets on disk, one directory per key.
+
+    The CSR matrices are stored as their raw data/indices/indptr arrays in
+    .npy files, so a cache hit memory-maps them instead of parsing anything;
+    the fitted vectorizer is stored like a bundle's. An entry is written to a
+    temporary directory and renamed into place, so a reader never sees a
+    partial one.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path(key), META_NAME))
+
+    def save(self, key: str, features: FeatureSet) -> str:
+        entry_dir = self.path(key)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name in ("X_train", "X_test"):
+            matrix = sp.csr_matrix(getattr(features, name))
+            if not matrix.has_canonical_format:
+                # Sorted, duplicate-free indices; loaded read-only, scipy could not sort them in place
+                matrix = matrix.copy()
+                matrix.sum_duplicates()
+            for part in CSR_PARTS:
+                np.save(os.path.join(tmp_dir, f"{name}.{part}.npy"), getattr(matrix, part))
+        for name in ("y_train", "y_test", "train_index", "test_index"):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(getattr(features, name)))
+        with open(os.path.join(tmp_dir, "texts.json"), "w") as f:
+            json.dump({'train': list(features.train_texts), 'test': list(features.test_texts)}, f)
+        feature_file, feature_info = save_features(features.vectorizer, tmp_dir)
+
+        meta = {
+            'format': STORE_FORMAT,
+            'key': key,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'shapes': {'X_train': list(features.X_train.shape), 'X_test': list(features.X_test.shape)},
+            'feature': dict(feature_info or {}, file=feature_file),
+        }
+        with open(os.path.join(tmp_dir, META_NAME), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another run stored the same key first; its entry is equivalent
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        logger.info(f"Stored feature set {key} in {entry_dir}")
+        return entry_dir
+
+    def load(self, key: str, mmap: bool = True) -> FeatureSet:
+        entry_dir = self.path(key)
+        with open(os.path.join(entry_dir, META_NAME)) as f:
+            meta = json.load(f)
+        if meta.get('format') != STORE_FORMAT:
+            raise ValueError(f"Unsupported feature store format {meta.get('format')} in {entry_dir}")
+        mmap_mode = "r" if mmap else None
+
+        def load_array(name: str) -> np.ndarray:
+            return np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        def load_csr(name: str) -> sp.csr_matrix:
+            data, indices, indptr = (load_array(f"{name}.{part}") for part in CSR_PARTS)
+            matrix = sp.csr_matrix((data, indices, indptr), shape=tuple(meta['shapes'][name]), copy=False)
+            matrix.has_canonical_format = True
+            return matrix
+
+        with open(os.path.join(entry_dir, "texts.json")) as f:
+            texts = json.load(f)
+        logger.info(f"Loaded feature set {key} from {entry_dir}")
+        return FeatureSet(
+            train_texts=texts['train'],
+            test_texts=texts['test'],
+            train_index=load_array("train_index"),
+            test_index=load_array("test_index"),
+            # Labels are small and often modified downstream; keep them in memory
+            y_train=np.array(load_array("y_train")),
+            y_test=np.array(load_array("y_test")),
+            X_train=load_csr("X_train"),
+            X_test=load_csr("X_test"),
+            vectorizer=load_features(os.path.join(entry_dir, meta['feature']['file']), meta['feature'], mmap=mmap),
+        )
@@ -0,0 +1,97 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.utils import murmurhash3_32
+
+
+class HashingTfidfVectorizer(TransformerMixin, BaseEstimator):
+    """
+    TF-IDF over hashed token counts.
+
+    Tokens are mapped to one of `n_features` columns by MurmurHash3 instead of
+    a fitted vocabulary, so the only learned state is the idf vector. Memory
+    is fixed by `n_features` whatever the corpus size, and the idf vector can
+    be stored (and memory-mapped) as a plain array next to the models.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, lowercase: bool = True, stop_words: Optional[str] = None,
+                 ngram_range: Tuple[int, int] = (1, 1), sublinear_tf: bool = False, norm: Optional[str] = "l2",
+                 smooth_idf: bool = True):
+        self.n_features = n_features
+        self.lowercase = lowercase
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+
+    def _hashing(self) -> HashingVectorizer:
+        # Stateless; counts only, the idf weighting and normalization come after
+        return HashingVectorizer(n_features=self.n_features, lowercase=self.lowercase, stop_words=self.stop_words,
+                                 ngram_range=tuple(self.ngram_range), alternate_sign=False, norm=None)
+
+    def _tfidf(self) -> TfidfTransformer:
+        return TfidfTransformer(norm=self.norm, sublinear_tf=self.sublinear_tf, smooth_idf=self.smooth_idf)
+
+    def fit(self, raw_documents: Iterable[str], y: Any = None) -> "HashingTfidfVectorizer":
+        self.tfidf_ = self._tfidf().fit(self._hashing().transform(raw_documents))
+        return self
+
+    def partial_fit(self, raw_documents: Iterable[str], y: Any = None) -> "HashingTfidfVectorizer":
+        """
+        Add a batch of documents to the document frequencies, for corpora
+        streamed in chunks. After the last batch the idf vector equals what
+        fit() would compute on all of them at once.
+        """
+        counts = self._hashing().transform(raw_documents)
+        if not hasattr(self, "document_frequency_"):
+            self.document_frequency_ = np.zeros(self.n_features, dtype=np.int64)
+            self.n_documents_ = 0
+        self.document_frequency_ += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents_ += counts.shape[0]
+
+        # TfidfTransformer's formula, with one extra document containing every term when smoothing
+        smooth = int(self.smooth_idf)
+        idf = np.log((self.n_documents_ + smooth) / (self.document_frequency_ + smooth)) + 1
+        self.tfidf_ = self._tfidf()
+        self.tfidf_.idf_ = idf
+        return self
+
+    def transform(self, raw_documents: Iterable[str]) -> sp.csr_matrix:
+        return self.tfidf_.transform(self._hashing().transform(raw_documents))
+
+    def fit_transform(self, raw_documents: Iterable[str], y: Any = None) -> sp.csr_matrix:
+        counts = self._hashing().transform(raw_documents)
+        self.tfidf_ = self._tfidf().fit(counts)
+        return self.tfidf_.transform(counts)
+
+    @property
+    def idf_(self) -> np.ndarray:
+        return self.tfidf_.idf_
+
+    def build_analyzer(self):
+        return self._hashing().build_analyzer()
+
+    def token_index(self, token: str) -> int:
+        """Column a token is counted in, as HashingVectorizer computes it"""
+        h = murmurhash3_32(token, seed=0)
+        if h == -2 ** 31:
+            return (2 ** 31 - 1 - (self.n_features - 1)) % self.n_features
+        return abs(h) % self.n_features
+
+    def to_params(self) -> Dict[str, Any]:
+        """JSON-serializable constructor arguments"""
+        params = self.get_params()
+        params['ngram_range'] = list(params['ngram_range'])
+        return params
+
+    @classmethod
+    def from_idf(cls, params: Dict[str, Any], idf: np.ndarray) -> "HashingTfidfVectorizer":
+        """Rebuild a fitted vectorizer from its parameters and idf vector"""
+        vectorizer = cls(**dict(params, ngram_range=tuple(params.get('ngram_range', (1, 1)))))
+        vectorizer.tfidf_ = vectorizer._tfidf()
+        vectorizer.tfidf_.idf_ = idf
+        return vectorizer
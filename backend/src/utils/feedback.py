@@ -0,0 +1,47 @@
+import os
+import json
+import threading
+from datetime import datetime
+from typing import List, Tuple
+
+from src.utils.scoring import from_label
+
+
+class FeedbackStore:
+    """
+    Append-only JSON-lines log of user-labeled emails.
+
+    Each record is written with a single append, so several API processes can
+    share one file. Readers consume it from a byte offset, which lets the
+    incremental trainer pick up only the records added since its last run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, content: str, label: str) -> None:
+        from_label(label)  # Reject unknown labels before they reach the log
+        record = {'time': datetime.now().isoformat(timespec='seconds'), 'label': label, 'content': content}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(line)
+
+    def read_from(self, offset: int = 0) -> Tuple[List[str], List[int], int]:
+        """(contents, labels, next offset) for the complete records after `offset`"""
+        contents, labels = [], []
+        if not os.path.exists(self.path):
+            return contents, labels, offset
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # A record still being written; the next run picks it up
+                offset += len(line)
+                record = json.loads(line)
+                contents.append(record['content'])
+                labels.append(from_label(record['label']))
+        return contents, labels, offset
@@ -0,0 +1,192 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import expit
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import SVC, LinearSVC
+
+from src.utils.features import HashingTfidfVectorizer
+from src.utils.scoring import to_label
+
+# How a model's linear score z is turned into a label and confidence
+LOGISTIC = "logistic"  # P(classes_[1]) = 1 / (1 + exp(-z)), as predict_proba does for binary LR and NB
+MARGIN = "margin"  # decision_function margin, squashed like score_single_pass does
+
+
+@dataclass(frozen=True)
+class LinearHead:
+    """One binary linear model folded into the token table"""
+    name: str
+    column: int
+    intercept: float
+    output: str
+    classes: Tuple[str, str]
+
+
+# ----------------------------------------------------------------------------
+# Function to express a fitted binary model as weights over TF-IDF features
+# ----------------------------------------------------------------------------
+def linear_weights(model: object) -> Optional[Tuple[np.ndarray, float, str]]:
+    """
+    (coefficients, intercept, output) for models whose binary predict_proba or
+    decision_function is a function of x @ w + b, else None.
+
+    A CalibratedClassifierCV(ensemble=False) with a sigmoid over a linear margin
+    folds too. SVC(probability=True) is not included: libsvm couples the Platt-scaled
+    pairwise probabilities iteratively, which a closed form only approximates.
+    """
+    if len(getattr(model, "classes_", ())) != 2:
+        return None
+
+    if isinstance(model, LogisticRegression):
+        return np.asarray(model.coef_[0], dtype=np.float64), float(model.intercept_[0]), LOGISTIC
+    if isinstance(model, MultinomialNB):
+        # The log-odds of a two-class multinomial NB are linear in the features
+        log_prob = model.feature_log_prob_
+        prior = model.class_log_prior_
+        return log_prob[1] - log_prob[0], float(prior[1] - prior[0]), LOGISTIC
+    if isinstance(model, SGDClassifier) and model.loss == "log_loss":
+        return np.asarray(model.coef_[0], dtype=np.float64), float(model.intercept_[0]), LOGISTIC
+    if isinstance(model, (LinearSVC, SGDClassifier)) and not hasattr(model, "predict_proba"):
+        return np.asarray(model.coef_[0], dtype=np.float64), float(model.intercept_[0]), MARGIN
+    if isinstance(model, SVC) and model.kernel == "linear" and not hasattr(model, "predict_proba"):
+        coef = model.coef_.toarray() if sp.issparse(model.coef_) else np.asarray(model.coef_)
+        return coef[0].astype(np.float64), float(model.intercept_[0]), MARGIN
+    if isinstance(model, CalibratedClassifierCV) and len(model.calibrated_classifiers_) == 1:
+        # ensemble=False: one linear margin f passed through a sigmoid, P(classes_[1]) = expit(-(a * f + b))
+        calibrated = model.calibrated_classifiers_[0]
+        inner = linear_weights(calibrated.estimator)
+        if calibrated.method == "sigmoid" and inner is not None and inner[2] == MARGIN:
+            coef, intercept, _ = inner
+            a, b = float(calibrated.calibrators[0].a_), float(calibrated.calibrators[0].b_)
+            return -a * coef, -(a * intercept + b), LOGISTIC
+    return None
+
+
+class LinearScorer:
+    """
+    Scores the linear members of the ensemble straight from text.
+
+    The vectorizer's idf weights and every supported model's coefficients are
+    folded into one table with a row per feature (a vocabulary token, or a
+    hash bucket for HashingTfidfVectorizer): column 0 holds the
+    idf, column i the idf times model i's coefficient. Scoring a document
+    tokenizes it with the vectorizer's own analyzer, counts the known tokens
+    and sums their rows, so
+
+        z = b + sum(tf * idf * w) / ||tf * idf||
+
+    without building a TF-IDF matrix or going through sklearn's validation.
+    """
+
+    def __init__(self, analyzer: Callable[[str], List[str]], token_index: Callable[[str], Optional[int]],
+                 table: np.ndarray, heads: List[LinearHead], sublinear_tf: bool, binary: bool, norm: Optional[str]):
+        self.analyzer = analyzer
+        self.token_index = token_index
+        self.table = table
+        self.heads = heads
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.norm = norm
+
+    @property
+    def model_names(self) -> List[str]:
+        return [head.name for head in self.heads]
+
+    @classmethod
+    def compile(cls, vectorizer: object, models: Dict[str, object]) -> Optional["LinearScorer"]:
+        """Fold `vectorizer` and every linear model in `models`; None when nothing qualifies"""
+        if getattr(vectorizer, "norm", None) not in ("l2", None):
+            return None
+        if isinstance(vectorizer, TfidfVectorizer) and hasattr(vectorizer, "vocabulary_"):
+            n_features = len(vectorizer.vocabulary_)
+            idf = np.asarray(vectorizer.idf_, dtype=np.float64) if vectorizer.use_idf else np.ones(n_features)
+            token_index = dict(vectorizer.vocabulary_).get
+            binary = vectorizer.binary
+        elif isinstance(vectorizer, HashingTfidfVectorizer) and hasattr(vectorizer, "tfidf_"):
+            n_features = vectorizer.n_features
+            idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+            token_index = vectorizer.token_index
+            binary = False
+        else:
+            return None
+
+        columns = [idf]
+        heads = []
+        for name, model in models.items():
+            weights = linear_weights(model)
+            if weights is None or len(weights[0]) != n_features:
+                continue
+            coef, intercept, output = weights
+            columns.append(idf * coef)
+            heads.append(LinearHead(name, len(columns) - 1, intercept, output,
+                                    (to_label(model.classes_[0]), to_label(model.classes_[1]))))
+
+        if not heads:
+            return None
+        return cls(
+            analyzer=vectorizer.build_analyzer(),
+            token_index=token_index,
+            table=np.ascontiguousarray(np.column_stack(columns)),
+            heads=heads,
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=binary,
+            norm=vectorizer.norm,
+        )
+
+    def linear_scores(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), n_models) matrix of z = x @ w + b"""
+        lookup = self.token_index
+        doc_ids, token_ids, counts = [], [], []
+        for doc_id, text in enumerate(texts):
+            token_counts = Counter(map(lookup, self.analyzer(text)))
+            token_counts.pop(None, None)
+            doc_ids.extend([doc_id] * len(token_counts))
+            token_ids.extend(token_counts.keys())
+            counts.extend(token_counts.values())
+
+        n_docs, n_heads = len(texts), len(self.heads)
+        scores = np.zeros((n_docs, n_heads))
+        if token_ids:
+            doc_ids = np.asarray(doc_ids, dtype=np.intp)
+            rows = self.table[np.asarray(token_ids, dtype=np.intp)]
+            tf = np.asarray(counts, dtype=np.float64)
+            if self.binary:
+                tf = np.ones_like(tf)
+            elif self.sublinear_tf:
+                tf = np.log(tf) + 1
+
+            if self.norm == "l2":
+                norms = np.sqrt(np.bincount(doc_ids, weights=(tf * rows[:, 0]) ** 2, minlength=n_docs))
+                # sklearn leaves all-zero rows as zeros
+                norms[norms == 0] = 1.0
+            else:
+                norms = np.ones(n_docs)
+
+            for index, head in enumerate(self.heads):
+                scores[:, index] = np.bincount(doc_ids, weights=tf * rows[:, head.column], minlength=n_docs) / norms
+
+        scores += np.array([head.intercept for head in self.heads])
+        return scores
+
+    def score(self, texts: List[str]) -> Dict[str, Tuple[List[str], List[float]]]:
+        """Labels and confidences (0-100) per model, as score_single_pass would return them"""
+        scores = self.linear_scores(texts)
+        outputs = {}
+        for index, head in enumerate(self.heads):
+            z = scores[:, index]
+            positive = z > 0
+            if head.output == LOGISTIC:
+                p_positive = expit(z)
+                confidences = np.where(positive, p_positive, 1 - p_positive) * 100
+            else:
+                confidences = expit(np.abs(z)) * 100
+            labels = [head.classes[1] if is_positive else head.classes[0] for is_positive in positive]
+            outputs[head.name] = (labels, confidences.tolist())
+        return outputs
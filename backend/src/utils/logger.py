@@ -1,34 +1,259 @@
+import os
+import sys
+import json
+import queue
+import atexit
 import logging
+import threading
+import multiprocessing
+import multiprocessing.util
 from pathlib import Path
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler, WatchedFileHandler
+from typing import Dict, Optional
+
+from src.config.config import Config
+
+TEXT_FORMAT = "[%(asctime)s]: %(filename)s - Line %(lineno)d: %(levelname)s: %(message)s"
+TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and goes into the JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled_out"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra=` fields of the call alongside the standard ones"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'file': record.filename,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if getattr(record, 'sampled_out', 0):
+            entry['sampled_out'] = record.sampled_out
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes the first `limit` records of each call site (logger and line) per
+    `window` seconds and drops the rest. The next record passed from that
+    site carries the number dropped as `sampled_out`. Records above
+    `max_level` are never sampled.
+    """
+
+    def __init__(self, limit: Optional[int], window: float = 60.0, max_level: int = logging.ERROR):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.max_level = max_level
+        self.suppressed = 0
+        self._sites: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit is None or record.levelno > self.max_level:
+            return True
+        key = (record.name, record.lineno)
+        with self._lock:
+            # [window start, records passed, records dropped]
+            site = self._sites.get(key)
+            if site is None or record.created - site[0] >= self.window:
+                if site is not None and site[2]:
+                    record.sampled_out = site[2]
+                self._sites[key] = [record.created, 1, 0]
+                return True
+            if site[1] < self.limit:
+                site[1] += 1
+                if site[2]:
+                    record.sampled_out, site[2] = site[2], 0
+                return True
+            site[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread; never waits, dropping records while the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in this process, so exc_info is kept and tracebacks are formatted by the writer
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room: records queued before shutdown are still written
+        self.queue.put(self._sentinel)
+
+
+class LogBackend:
+    """
+    Queue-based logging: callers only format the message and enqueue it, and a
+    listener thread does the formatting and file I/O.
+
+    Only the main process rotates its file. Child processes (forked scan
+    workers, spawned training searches) append to the same file and reopen
+    it after the main process rotates it. serve.py gives each of its workers
+    its own file instead, since those outlive any rotation by the parent.
+    """
+
+    def __init__(self, config: Optional[Config] = None, log_file: Optional[str] = None):
+        self.config = config or Config()
+        self.level = logging.getLevelName(self.config.log_level.upper())
+        if not isinstance(self.level, int):
+            raise ValueError(f"Unknown log level {self.config.log_level!r}")
+        self.log_file = log_file or self.config.log_file
+        self.sampler = SamplingFilter(self.config.log_sample_limit, self.config.log_sample_window)
+        self.handler = NonBlockingQueueHandler(queue.Queue(self.config.log_queue_size))
+        self.handler.addFilter(self.sampler)
+        self.listener: Optional[QueueListener] = None
+
+    def build_output(self, rotate: bool = True) -> logging.Handler:
+        if not self.log_file:
+            output = logging.StreamHandler(sys.stderr)
+        else:
+            Path(self.log_file).parent.mkdir(parents=True, exist_ok=True)
+            if not rotate:
+                output = WatchedFileHandler(self.log_file, encoding="utf-8")
+            elif self.config.log_rotation == "time":
+                output = TimedRotatingFileHandler(self.log_file, when=self.config.log_rotate_when,
+                                                  backupCount=self.config.log_backup_count, encoding="utf-8")
+            elif self.config.log_rotation == "size":
+                output = RotatingFileHandler(self.log_file, maxBytes=self.config.log_max_bytes,
+                                             backupCount=self.config.log_backup_count, encoding="utf-8")
+            else:
+                raise ValueError(f"Unknown log rotation {self.config.log_rotation!r}; expected 'size' or 'time'")
+        if self.config.log_format == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT))
+        return output
+
+    def start(self, rotate: bool = True) -> "LogBackend":
+        self.listener = _Listener(self.handler.queue, self.build_output(rotate))
+        self.listener.start()
+        return self
+
+    def stop(self) -> None:
+        """Write everything queued so far and close the output"""
+        if self.listener is None:
+            return
+        listener, self.listener = self.listener, None
+        listener.stop()
+        for output in listener.handlers:
+            output.close()
+
+    def after_fork(self) -> None:
+        # The listener thread does not exist in the child, and the queue's locks may have been held mid-fork
+        self.handler.queue = queue.Queue(self.config.log_queue_size)
+        self.sampler._lock = threading.Lock()
+        self.listener = None
+        self.start(rotate=False)
+
+    def attach(self, logger: logging.Logger) -> None:
+        logger.handlers = [self.handler]
+        logger.setLevel(self.level)
+        logger.propagate = False
+
+
+_BACKEND: Optional[LogBackend] = None
+_LOGGERS: Dict[str, logging.Logger] = {}
+_LOCK = threading.Lock()
+
+
+def configure_logging(config: Optional[Config] = None, log_file: Optional[str] = None) -> LogBackend:
+    """
+    (Re)start the logging backend and point every logger from get_logger at
+    it. Records still queued for a previous backend are written first.
+    """
+    global _BACKEND
+    with _LOCK:
+        previous = _BACKEND
+        # Only the top-level process rotates; see LogBackend
+        _BACKEND = LogBackend(config, log_file).start(rotate=multiprocessing.parent_process() is None)
+        for logger in _LOGGERS.values():
+            _BACKEND.attach(logger)
+    if previous is not None:
+        previous.stop()
+    return _BACKEND
+
+
+def worker_log_file(suffix: str, config: Optional[Config] = None) -> Optional[str]:
+    """`logs/spam-detection.log` -> `logs/spam-detection.<suffix>.log`"""
+    log_file = (config or Config()).log_file
+    if not log_file:
+        return None
+    path = Path(log_file)
+    return str(path.with_name(f"{path.stem}.{suffix}{path.suffix}"))
+
+
+def logging_stats() -> Dict[str, int]:
+    backend = _BACKEND
+    if backend is None:
+        return {'dropped': 0, 'sampled_out': 0}
+    return {'dropped': backend.handler.dropped, 'sampled_out': backend.sampler.suppressed}
+
+
+def shutdown_logging() -> None:
+    global _BACKEND
+    with _LOCK:
+        backend, _BACKEND = _BACKEND, None
+    if backend is not None:
+        backend.stop()
+
+
+def _after_fork_in_child() -> None:
+    global _LOCK
+    _LOCK = threading.Lock()
+    if _BACKEND is not None:
+        _BACKEND.after_fork()
+
+
+def _register_exit_flush(_=None) -> None:
+    # multiprocessing children end in os._exit, which skips atexit but still runs these finalizers
+    multiprocessing.util.Finalize(None, shutdown_logging, exitpriority=0)
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_after_fork_in_child)
+_register_exit_flush()
+multiprocessing.util.register_after_fork(_register_exit_flush, _register_exit_flush)
 
-# Global variable to store the log file path for the current run
-_LOG_FILE = None
 
 def get_logger(name: str):
-    global _LOG_FILE
-    
+    global _BACKEND
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-
-    if logger.handlers:
-        return logger
-
-    # Create log file path only once for the entire pipeline run
-    if _LOG_FILE is None:
-        date_dir = datetime.now().strftime("%Y-%m-%d")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        log_dir = Path("logs") / date_dir
-        log_dir.mkdir(parents=True, exist_ok=True)
-        _LOG_FILE = log_dir / f"{timestamp}.log"
-
-    handler = logging.FileHandler(_LOG_FILE, encoding="utf-8")
-    formatter = logging.Formatter(
-        "[%(asctime)s]: %(filename)s - Line %(lineno)d: %(levelname)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    handler.setFormatter(formatter)
-
-    logger.addHandler(handler)
-    logger.propagate = False
-    return logger
\ No newline at end of file
+    with _LOCK:
+        if _BACKEND is None:
+            # Configured on first use, from Config
+            _BACKEND = LogBackend().start(rotate=multiprocessing.parent_process() is None)
+        if name not in _LOGGERS:
+            _BACKEND.attach(logger)
+            _LOGGERS[name] = logger
+    return logger
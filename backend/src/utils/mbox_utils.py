@@ -0,0 +1,226 @@
+import os
+import mmap
+import mailbox
+import email.parser
+import email.policy
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+FROM_PREFIX = b"From "
+
+
+# ----------------------------------------------------------------------------
+# Function to find the next "From " separator line at or after an offset
+# ----------------------------------------------------------------------------
+def _next_from_line(f: BinaryIO, offset: int) -> Optional[int]:
+    f.seek(offset)
+    if offset > 0:
+        f.seek(offset - 1)
+        if f.read(1) != b"\n":
+            # Mid-line: skip the rest of the current line
+            f.readline()
+
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line:
+            return None
+        if line.startswith(FROM_PREFIX):
+            return position
+
+
+# ----------------------------------------------------------------------------
+# Function to split an mbox file into byte ranges on message boundaries
+# ----------------------------------------------------------------------------
+def find_shards(path: str, shard_count: int) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    starts = [0]
+    with open(path, "rb") as f:
+        for index in range(1, shard_count):
+            offset = _next_from_line(f, max(size * index // shard_count, starts[-1] + 1))
+            if offset is None:
+                break
+            if offset > starts[-1]:
+                starts.append(offset)
+
+    return list(zip(starts, starts[1:] + [size]))
+
+
+# ----------------------------------------------------------------------------
+# Function to build a message the same way mailbox.mbox.get_message does
+# ----------------------------------------------------------------------------
+def build_message(from_line: bytes, content: bytes) -> mailbox.mboxMessage:
+    message = mailbox.mboxMessage(content.replace(mailbox.linesep, b"\n"))
+    message.set_from(from_line.replace(mailbox.linesep, b"")[len(FROM_PREFIX):].decode("ascii", "replace"))
+    return message
+
+
+# ----------------------------------------------------------------------------
+# Function to iterate over the messages of one byte range of an mbox file
+# ----------------------------------------------------------------------------
+def iter_mbox_range(path: str, start: int, end: int) -> Iterator[mailbox.mboxMessage]:
+    """
+    Yield the messages whose "From " line lies in [start, end).
+
+    `start` must be a message boundary, as returned by find_shards. Like
+    mailbox.mbox, every line starting with "From " begins a new message and
+    the blank line preceding it is not part of the previous message.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        from_line = None
+        lines: List[bytes] = []
+        position = start
+
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+
+            if line.startswith(FROM_PREFIX):
+                if from_line is not None:
+                    yield build_message(from_line, _join_message(lines))
+                from_line, lines = line, []
+            elif from_line is not None:
+                lines.append(line)
+
+        if from_line is not None:
+            yield build_message(from_line, _join_message(lines))
+
+
+def _join_message(lines: List[bytes]) -> bytes:
+    if lines and lines[-1] == mailbox.linesep:
+        lines = lines[:-1]
+    return b"".join(lines)
+
+
+class MmapMbox:
+    """
+    Read-only mbox reader backed by mmap and a persisted offset index.
+
+    The first open scans the mapped file once for "From " separator lines and
+    writes the message offsets to a sidecar `<path>.idx.npz` file; later opens
+    load that index instantly as long as the mailbox size and mtime are
+    unchanged. Messages are parsed straight from memoryview slices of the map
+    and can be accessed randomly by message number.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None, persist_index: bool = True):
+        self.path = path
+        self.index_path = index_path or f"{path}.idx.npz"
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._signature = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else None
+        self._view = memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+
+        if not self._load_index():
+            self.starts, self.stops = self._build_index()
+            if persist_index:
+                self._save_index()
+
+    def _load_index(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            with np.load(self.index_path) as index:
+                if not np.array_equal(index["signature"], self._signature):
+                    return False
+                self.starts, self.stops = index["starts"], index["stops"]
+            return True
+        except (OSError, KeyError, ValueError):
+            return False
+
+    def _save_index(self) -> None:
+        try:
+            # Write to a temp file and rename so readers never see a partial index
+            tmp_path = f"{self.index_path}.tmp.npz"
+            np.savez(tmp_path, starts=self.starts, stops=self.stops, signature=self._signature)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass  # A read-only archive location just means no persisted index
+
+    def _build_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        starts = []
+        if self._mmap is not None:
+            data = self._mmap
+            position = 0 if data[:len(FROM_PREFIX)] == FROM_PREFIX else data.find(b"\n" + FROM_PREFIX)
+            if position > 0:
+                position += 1
+            while position != -1:
+                starts.append(position)
+                position = data.find(b"\n" + FROM_PREFIX, position)
+                if position != -1:
+                    position += 1
+
+        size = len(self._view)
+        stops = []
+        for start, next_start in zip(starts, starts[1:] + [size]):
+            stop = next_start
+            # Like mailbox.mbox, the blank line before the next "From " is not part of the message
+            if stop - start > len(mailbox.linesep) and self._view[stop - 2 * len(mailbox.linesep):stop] == mailbox.linesep * 2:
+                stop -= len(mailbox.linesep)
+            stops.append(stop)
+        return np.array(starts, dtype=np.int64), np.array(stops, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def get_bytes(self, index: int) -> memoryview:
+        """Zero-copy view of message `index`, including its "From " line"""
+        return self._view[int(self.starts[index]):int(self.stops[index])]
+
+    def get_message(self, index: int) -> mailbox.mboxMessage:
+        raw = self.get_bytes(index)
+        start = int(self.starts[index])
+        # Search the mapping itself: the "From " line can be of any length
+        newline = self._mmap.find(b"\n", start, int(self.stops[index]))
+        from_end = newline - start + 1 if newline >= 0 else len(raw)
+        from_line = bytes(raw[:from_end])
+        content = raw[from_end:]
+        if mailbox.linesep != b"\n":
+            content = bytes(content).replace(mailbox.linesep, b"\n")
+
+        # Decode straight from the mapped slice, as BytesParser would after copying it
+        text = str(content, "ascii", "surrogateescape")
+        message = email.parser.Parser(_class=mailbox.mboxMessage, policy=email.policy.compat32).parsestr(text)
+        message.set_from(from_line.replace(mailbox.linesep, b"")[len(FROM_PREFIX):].decode("ascii", "replace"))
+        return message
+
+    def __getitem__(self, index: int) -> mailbox.mboxMessage:
+        return self.get_message(index)
+
+    def __iter__(self) -> Iterator[mailbox.mboxMessage]:
+        for index in range(len(self)):
+            yield self.get_message(index)
+
+    def shards(self, shard_count: int) -> List[Tuple[int, int]]:
+        """Byte ranges holding roughly equal numbers of messages"""
+        if not len(self):
+            return []
+        bounds = np.unique(np.linspace(0, len(self), shard_count + 1).astype(int))
+        offsets = [int(self.starts[bound]) for bound in bounds[:-1]] + [len(self._view)]
+        return list(zip(offsets, offsets[1:]))
+
+    def iter_byte_range(self, start: int, end: int) -> Iterator[mailbox.mboxMessage]:
+        """Messages whose "From " line lies in [start, end)"""
+        first, last = np.searchsorted(self.starts, [start, end])
+        for index in range(first, last):
+            yield self.get_message(index)
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "MmapMbox":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,285 @@
+import time
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds; from the linear fast path (tens of microseconds) to a model timing out
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        self._default = None if self.labelnames else self.labels()
+
+    def labels(self, *values: str):
+        """The child for one combination of label values; keep it to skip the lookup on hot paths"""
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        with self._lock:
+            return self._children.setdefault(tuple(str(value) for value in values), self._new_child())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _unlabelled(self):
+        if self._default is None:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; call labels() first")
+        return self._default
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._expose_child(values, child))
+        return lines
+
+    def _expose_child(self, values: Tuple[str, ...], child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"]
+
+
+class _ThreadShards:
+    """
+    Per-thread slots summed at scrape time.
+
+    Each thread only ever writes its own list, so recording takes no lock;
+    a lock-protected observation cost more than the stages it timed. The lock
+    below is taken once per thread, to register its shard.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def shard(self) -> list:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0] * self.size
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._shards)
+        return [sum(values) for values in zip(*shards)] if shards else [0] * self.size
+
+
+class _Value(_ThreadShards):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.shard()[0] += amount
+
+    def get(self) -> float:
+        return self.totals()[0]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count; by convention its name ends in _total"""
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+
+class _HistogramValue(_ThreadShards):
+    def __init__(self, buckets: Tuple[float, ...]):
+        # Per-bucket (not cumulative) counts, then +Inf, then the sum of all observations
+        super().__init__(len(buckets) + 2)
+        self.buckets = buckets
+
+    def observe(self, value: float) -> None:
+        shard = self.shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        totals = self.totals()
+        return totals[:-1], totals[-1]
+
+
+class Histogram(_Metric):
+    """Counts observations into fixed buckets, exposed cumulatively like Prometheus histograms"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def _expose_child(self, values: Tuple[str, ...], child: _HistogramValue) -> List[str]:
+        counts, total = child.snapshot()
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _CallbackValue:
+    def __init__(self, fn: Callable[[], Optional[float]]):
+        self.fn = fn
+
+    def get(self) -> Optional[float]:
+        try:
+            return self.fn()
+        except Exception:
+            return None
+
+
+class CallbackMetric(_Metric):
+    """A counter or gauge read from existing state (e.g. the cache's own counters) at scrape time"""
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], Optional[float]], kind: str = "gauge"):
+        self.fn = fn
+        self.kind = kind
+        super().__init__(name, documentation)
+
+    def _new_child(self) -> _CallbackValue:
+        return _CallbackValue(self.fn)
+
+    def _expose_child(self, values: Tuple[str, ...], child: _CallbackValue) -> List[str]:
+        value = child.get()
+        # Sources that are not available (e.g. no pipeline loaded) are left out rather than reported as 0
+        return [] if value is None else [f"{self.name} {_format_value(value)}"]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # Re-registering a name replaces it, so reloading a module or app doesn't fail
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, fn: Callable[[], Optional[float]],
+                 kind: str = "gauge") -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, fn, kind))
+
+    def expose(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------------
+# Process-wide registry and the metrics of the prediction path
+# ----------------------------------------------------------------------------
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "spam_stage_seconds", "Time spent per batch in each prediction stage", ("stage",))
+MODEL_SECONDS = REGISTRY.histogram(
+    "spam_model_seconds", "Time spent per batch scoring with each sklearn model", ("model",))
+MODEL_FAILURES = REGISTRY.counter(
+    "spam_model_failures_total", "Batches a model did not score, by outcome (Error, Timeout, Skipped)",
+    ("model", "outcome"))
+BATCH_SIZE = REGISTRY.histogram(
+    "spam_batch_size", "Emails per prediction call (pipeline) and per API micro-batch (batcher)",
+    ("source",), buckets=BATCH_SIZE_BUCKETS)
+REQUESTS = REGISTRY.counter(
+    "spam_http_requests_total", "HTTP requests by route and status code", ("route", "status"))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "spam_http_request_seconds", "HTTP request latency by route", ("route",))
+
+# Stage children are looked up once here instead of on every call
+CLEAN_SECONDS = STAGE_SECONDS.labels("clean")
+VECTORIZE_SECONDS = STAGE_SECONDS.labels("vectorize")
+LINEAR_FAST_PATH_SECONDS = STAGE_SECONDS.labels("linear_fast_path")
+CONSENSUS_SECONDS = STAGE_SECONDS.labels("consensus")
+PIPELINE_BATCH_SIZE = BATCH_SIZE.labels("pipeline")
+BATCHER_BATCH_SIZE = BATCH_SIZE.labels("batcher")
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests and timing them per route.
+
+    Routes are labelled by their path template, and paths that match no
+    route share the label "unmatched", so the number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status['code'] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route = getattr(route, "path", None) or "unmatched"
+            REQUESTS.labels(route, str(status['code'])).inc()
+            REQUEST_SECONDS.labels(route).observe(time.perf_counter() - started)
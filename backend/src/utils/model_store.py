@@ -0,0 +1,335 @@
+import os
+import glob
+import json
+import pickle
+import shutil
+import tempfile
+import hashlib
+import argparse
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from src.utils.logger import get_logger
+from src.utils.features import HashingTfidfVectorizer
+from src.utils.scoring import ScoringSpec, inspect_model
+
+logger = get_logger(__name__)
+
+PICKLE_EXT = ".pkl"
+JOBLIB_EXT = ".joblib"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+IDF_FILE = "idf.npy"
+HASHING_FEATURES = "hashing_tfidf"
+
+
+class BundleError(Exception):
+    """Raised when a model bundle is missing files or fails checksum verification."""
+
+
+@dataclass
+class ModelBundle:
+    """
+    One immutable, versioned set of models plus the feature transformer they
+    were trained with. The pipeline swaps whole bundles, never single models,
+    so a request always scores with a consistent set.
+    """
+    version: Optional[str] = None
+    path: Optional[str] = None
+    feature_transformer: Any = None
+    models: Dict[str, Any] = field(default_factory=dict)
+    scoring_specs: Dict[str, ScoringSpec] = field(default_factory=dict)
+    manifest: Dict[str, Any] = field(default_factory=dict)
+    linear_scorer: Any = None # LinearScorer compiled from the models at load time, if enabled
+
+    def tag_models(self) -> None:
+        self.scoring_specs = {name: inspect_model(model) for name, model in self.models.items()}
+
+
+# ----------------------------------------------------------------------------
+# Function to resolve a model artifact, preferring the memory-mappable format
+# ----------------------------------------------------------------------------
+def resolve_artifact(path: str) -> Optional[str]:
+    """
+    `outputs/models/SVM_model.pkl` resolves to `SVM_model.joblib` when that
+    export exists next to it, else to the pickle itself.
+    """
+    stem, _ = os.path.splitext(path)
+    for candidate in (stem + JOBLIB_EXT, stem + PICKLE_EXT):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+# ----------------------------------------------------------------------------
+# Function to load a model artifact
+# ----------------------------------------------------------------------------
+def load_artifact(path: str, mmap: bool = True) -> Any:
+    """
+    Joblib artifacts are loaded with mmap_mode="r": their large numpy arrays
+    (SVM support vectors, coefficients, idf weights) stay backed by the page
+    cache and are shared by every process that maps the same file.
+    """
+    if path.endswith(JOBLIB_EXT):
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# ----------------------------------------------------------------------------
+# Function to save a model artifact in the memory-mappable format
+# ----------------------------------------------------------------------------
+def save_artifact(obj: Any, path: str) -> str:
+    # Compression would prevent memory-mapping on load
+    joblib.dump(obj, path, compress=0)
+    return path
+
+
+# ----------------------------------------------------------------------------
+# Function to export every pickle in a models directory to joblib
+# ----------------------------------------------------------------------------
+def export_joblib(models_dir: str) -> List[str]:
+    exported = []
+    for pickle_path in sorted(glob.glob(os.path.join(models_dir, f"*{PICKLE_EXT}"))):
+        joblib_path = os.path.splitext(pickle_path)[0] + JOBLIB_EXT
+        save_artifact(load_artifact(pickle_path), joblib_path)
+        logger.info(f"Exported {pickle_path} -> {joblib_path}")
+        exported.append(joblib_path)
+    return exported
+
+
+# ----------------------------------------------------------------------------
+# Function to compute the SHA-256 checksum of a file
+# ----------------------------------------------------------------------------
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------------
+# Function to write a bundle manifest for artifacts already in a directory
+# ----------------------------------------------------------------------------
+def write_manifest(bundle_dir: str, feature_file: str, model_files: Dict[str, str],
+                   metadata: Optional[Dict[str, Any]] = None, parent_version: Optional[str] = None,
+                   feature_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    `feature_file` and `model_files` are file names relative to `bundle_dir`;
+    `feature_info` describes a feature file that is not a pickled transformer.
+    The version combines the creation time with a digest of every checksum,
+    so two bundles with different contents never share a version.
+    """
+    created_at = datetime.now()
+    feature = dict(feature_info or {}, file=feature_file, sha256=file_sha256(os.path.join(bundle_dir, feature_file)))
+    models = {
+        name: {'file': filename, 'sha256': file_sha256(os.path.join(bundle_dir, filename))}
+        for name, filename in model_files.items()
+    }
+    digest = hashlib.sha256(json.dumps([feature, models], sort_keys=True).encode("utf-8")).hexdigest()
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'version': f"{created_at.strftime('%Y-%m-%d_%H-%M-%S')}-{digest[:8]}",
+        # Microseconds: find_latest_bundle orders bundles by this
+        'created_at': created_at.isoformat(timespec='microseconds'),
+        'parent_version': parent_version,
+        'feature': feature,
+        'models': models,
+        'metadata': metadata or {},
+    }
+    tmp_path = os.path.join(bundle_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    # The manifest appears last and atomically: a bundle without one is incomplete
+    os.replace(tmp_path, os.path.join(bundle_dir, MANIFEST_NAME))
+    logger.info(f"Wrote bundle {manifest['version']} to {bundle_dir}")
+    return manifest
+
+
+# ----------------------------------------------------------------------------
+# Function to save a vectorizer and models as a new bundle
+# ----------------------------------------------------------------------------
+def write_bundle(bundle_dir: str, feature_transformer: Any, models: Dict[str, Any],
+                 metadata: Optional[Dict[str, Any]] = None, parent_version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bundles are immutable: the files are written to a temporary sibling
+    directory that is renamed to `bundle_dir` once complete, and an existing
+    `bundle_dir` is refused. Rewriting a bundle in place would truncate files
+    that serving workers have memory-mapped.
+    """
+    bundle_dir = os.path.normpath(bundle_dir)
+    if os.path.exists(bundle_dir):
+        raise FileExistsError(f"Bundle directory {bundle_dir} already exists; bundles are never overwritten")
+    os.makedirs(os.path.dirname(bundle_dir) or ".", exist_ok=True)
+    # A dot-prefixed name, so find_latest_bundle's glob never sees a half-written bundle
+    tmp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(bundle_dir)}.tmp-", dir=os.path.dirname(bundle_dir) or ".")
+    try:
+        # mkdtemp creates the directory as 0700; bundles are read by serving workers
+        os.chmod(tmp_dir, 0o755)
+        feature_file, feature_info = save_features(feature_transformer, tmp_dir)
+
+        model_files = {}
+        for name, model in models.items():
+            model_files[name] = f"{name}_model{JOBLIB_EXT}"
+            save_artifact(model, os.path.join(tmp_dir, model_files[name]))
+
+        manifest = write_manifest(tmp_dir, feature_file, model_files, metadata, parent_version, feature_info)
+        # Fails if another writer created bundle_dir meanwhile (a non-empty directory is never replaced)
+        os.rename(tmp_dir, bundle_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    logger.info(f"Moved bundle {manifest['version']} into {bundle_dir}")
+    return manifest
+
+
+# ----------------------------------------------------------------------------
+# Function to name a new bundle directory
+# ----------------------------------------------------------------------------
+def new_bundle_dir(root_dir: str) -> str:
+    # Microseconds, so two bundles written in the same second get different directories
+    return os.path.join(root_dir, datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f"))
+
+
+# ----------------------------------------------------------------------------
+# Function to save the feature transformer of a bundle
+# ----------------------------------------------------------------------------
+def save_features(feature_transformer: Any, bundle_dir: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    A HashingTfidfVectorizer has no vocabulary; only its idf vector is stored,
+    as a plain .npy array, with the constructor arguments in the manifest.
+    Anything else is saved as a joblib artifact.
+    """
+    if isinstance(feature_transformer, HashingTfidfVectorizer):
+        np.save(os.path.join(bundle_dir, IDF_FILE), np.asarray(feature_transformer.idf_))
+        return IDF_FILE, {'type': HASHING_FEATURES, 'params': feature_transformer.to_params()}
+
+    feature_file = "vectorizer" + JOBLIB_EXT
+    save_artifact(feature_transformer, os.path.join(bundle_dir, feature_file))
+    return feature_file, None
+
+
+def load_features(path: str, feature_info: Optional[Dict[str, Any]] = None, mmap: bool = True) -> Any:
+    """Load a feature transformer written by save_features, given the info it returned"""
+    if feature_info and feature_info.get('type') == HASHING_FEATURES:
+        return HashingTfidfVectorizer.from_idf(feature_info['params'], np.load(path, mmap_mode="r" if mmap else None))
+    return load_artifact(path, mmap=mmap)
+
+
+def read_manifest(bundle_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(bundle_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise BundleError(f"Unsupported manifest format {manifest.get('format')} in {bundle_dir}")
+    return manifest
+
+
+# ----------------------------------------------------------------------------
+# Function to load a bundle described by its manifest
+# ----------------------------------------------------------------------------
+def load_bundle(bundle_dir: str, mmap: bool = True, verify: bool = True) -> ModelBundle:
+    manifest = read_manifest(bundle_dir)
+
+    def load_entry(entry: Dict[str, Any]) -> Any:
+        path = os.path.join(bundle_dir, entry['file'])
+        if not os.path.exists(path):
+            raise BundleError(f"Bundle file missing: {path}")
+        if verify and file_sha256(path) != entry['sha256']:
+            raise BundleError(f"Checksum mismatch for {path}")
+        return load_features(path, entry, mmap=mmap)
+
+    bundle = ModelBundle(
+        version=manifest['version'],
+        path=bundle_dir,
+        feature_transformer=load_entry(manifest['feature']),
+        models={name: load_entry(entry) for name, entry in manifest['models'].items()},
+        manifest=manifest,
+    )
+    bundle.tag_models()
+    return bundle
+
+
+# ----------------------------------------------------------------------------
+# Function to load the unversioned outputs/models layout
+# ----------------------------------------------------------------------------
+def load_legacy_bundle(models_dir: str, feature_path: str, model_names: List[str], mmap: bool = True) -> ModelBundle:
+    feature_path = resolve_artifact(feature_path) or feature_path
+    bundle = ModelBundle(path=models_dir, feature_transformer=load_artifact(feature_path, mmap=mmap))
+    paths = [feature_path]
+
+    for model_name in model_names:
+        try:
+            path = resolve_artifact(os.path.join(models_dir, f"{model_name}_model.pkl"))
+            if path is not None:
+                bundle.models[model_name] = load_artifact(path, mmap=mmap)
+                paths.append(path)
+                logger.info(f"Loaded {model_name} from {path}")
+            else:
+                logger.warning(f"Model file not found for {model_name} in {models_dir}")
+        except Exception as e:
+            logger.error(f"Failed to load {model_name}: {e}")
+
+    # Without a manifest the version is derived from the files' size and mtime
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    bundle.version = f"legacy-{digest.hexdigest()[:12]}"
+    bundle.tag_models()
+    return bundle
+
+
+# ----------------------------------------------------------------------------
+# Function to find the most recently created bundle under a directory
+# ----------------------------------------------------------------------------
+def find_latest_bundle(root_dir: str) -> Optional[str]:
+    """
+    The bundle with the newest `created_at`. Ties (e.g. older manifests that
+    only stored seconds) go to the greater version and then the greater
+    directory, so the answer does not depend on the order glob returns.
+    """
+    latest, latest_key = None, None
+    for manifest_path in glob.glob(os.path.join(root_dir, "**", MANIFEST_NAME), recursive=True):
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        bundle_dir = os.path.dirname(manifest_path)
+        key = (manifest.get('created_at', ""), manifest.get('version', ""), bundle_dir)
+        if latest_key is None or key > latest_key:
+            latest, latest_key = bundle_dir, key
+    return latest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model artifact tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Export pickled models to memory-mappable joblib files")
+    export_parser.add_argument("models_dir", nargs="?", default="outputs/models")
+
+    bundle_parser = commands.add_parser("bundle", help="Package a legacy models directory as a versioned bundle")
+    bundle_parser.add_argument("models_dir", nargs="?", default="outputs/models")
+    bundle_parser.add_argument("--feature-path", default="outputs/models/vectorizer.pkl")
+    bundle_parser.add_argument("--output", default=None, help="Bundle directory (default: outputs/bundles/<timestamp>)")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        for path in export_joblib(args.models_dir):
+            print(f"Exported {path}")
+    else:
+        model_names = [
+            os.path.basename(path)[:-len(f"_model{PICKLE_EXT}")]
+            for path in sorted(glob.glob(os.path.join(args.models_dir, f"*_model{PICKLE_EXT}")))
+        ]
+        legacy = load_legacy_bundle(args.models_dir, args.feature_path, model_names, mmap=False)
+        output = args.output or new_bundle_dir(os.path.join("outputs", "bundles"))
+        manifest = write_bundle(output, legacy.feature_transformer, legacy.models)
+        print(f"Wrote bundle {manifest['version']} with {len(legacy.models)} models to {output}")
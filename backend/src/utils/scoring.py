@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+# Scoring methods a model can be tagged with at load time
+PREDICT_PROBA = "predict_proba"
+DECISION_FUNCTION = "decision_function"
+PREDICT = "predict"
+
+
+@dataclass(frozen=True)
+class ScoringSpec:
+    method: str
+    dense_input: bool = False
+
+
+# ----------------------------------------------------------------------------
+# Function to inspect a model once and record how it should be scored
+# ----------------------------------------------------------------------------
+def inspect_model(model: object) -> ScoringSpec:
+    # SVC only exposes predict_proba when trained with probability=True
+    if hasattr(model, "predict_proba"):
+        method = PREDICT_PROBA
+    elif hasattr(model, "decision_function"):
+        method = DECISION_FUNCTION
+    else:
+        method = PREDICT
+
+    # libsvm-based models fitted on a dense matrix refuse sparse input at predict time
+    dense_input = getattr(model, "_sparse", None) is False
+    return ScoringSpec(method=method, dense_input=dense_input)
+
+
+def to_label(raw_label: object) -> str:
+    # In our mapping Spam = 0, Ham = 1
+    return "Spam" if str(raw_label) == "0" else "Ham"
+
+
+def from_label(label: str) -> int:
+    """Inverse of to_label for "Spam"/"Ham" (any case)"""
+    normalized = label.strip().lower()
+    if normalized not in ("spam", "ham"):
+        raise ValueError(f"Unknown label {label!r}; expected Spam or Ham")
+    return 0 if normalized == "spam" else 1
+
+
+# ----------------------------------------------------------------------------
+# Function to score a feature matrix with a single model invocation
+# ----------------------------------------------------------------------------
+def score_single_pass(model: object, spec: ScoringSpec, features: object) -> Tuple[List[str], List[float]]:
+    """
+    Derive labels and confidences (0-100) from one call to the model.
+
+    For `SVC(probability=True)` the label is the argmax of the Platt-scaled
+    probabilities, which can differ from `predict` for points very close to
+    the decision boundary.
+    """
+    if spec.method == PREDICT_PROBA:
+        proba = model.predict_proba(features)
+        best = proba.argmax(axis=1)
+        labels = model.classes_[best]
+        confidences = proba[np.arange(len(best)), best] * 100
+    elif spec.method == DECISION_FUNCTION:
+        scores = np.asarray(model.decision_function(features))
+        if scores.ndim == 1:
+            labels = model.classes_[(scores > 0).astype(int)]
+        else:
+            labels = model.classes_[scores.argmax(axis=1)]
+        confidences = margin_confidences(scores)
+    else:
+        labels = model.predict(features)
+        confidences = np.zeros(len(labels))
+
+    return [to_label(label) for label in labels], confidences.tolist()
+
+
+# ----------------------------------------------------------------------------
+# Function to score with separate predict and predict_proba calls
+# ----------------------------------------------------------------------------
+def score_two_pass(model: object, spec: ScoringSpec, features: object) -> Tuple[List[str], List[float]]:
+    """Confidences are derived exactly as in score_single_pass; only the labels come from predict"""
+    labels = [to_label(label) for label in model.predict(features)]
+    confidences = [0.0] * len(labels)
+    if spec.method == PREDICT_PROBA:
+        proba = model.predict_proba(features)
+        confidences = (proba.max(axis=1) * 100).tolist()
+    elif spec.method == DECISION_FUNCTION:
+        confidences = margin_confidences(np.asarray(model.decision_function(features))).tolist()
+    return labels, confidences
+
+
+# ----------------------------------------------------------------------------
+# Function to turn decision_function margins into confidences
+# ----------------------------------------------------------------------------
+def margin_confidences(scores: np.ndarray) -> np.ndarray:
+    if scores.ndim == 1:
+        # Squash the margin into (50, 100) so it reads like a probability
+        return 100 / (1 + np.exp(-np.abs(scores)))
+    # Multi-class margins have no such reading
+    return np.zeros(len(scores))
@@ -4,6 +4,8 @@ import pandas as pd
 class TrainingState:
     training_data_path: Optional[str] = None
     training_data: Optional[pd.DataFrame] = None
+    feature_key: Optional[str] = None # FeatureStore key of this dataset and vectorizer configuration
+    features_cached: bool = False # The feature store already holds this run's features
     transformed_data: Optional[pd.DataFrame] = None
     X_train: Optional[pd.Series] = None
     X_test: Optional[pd.Series] = None
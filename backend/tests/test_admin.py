@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from fastapi.testclient import TestClient
+import main
+from src.utils.model_store import read_manifest, write_bundle
+from tests.test_prediction_pipeline import build_pipeline
+
+
+class TestAdminEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bundles_dir = os.path.join(self.tmp_dir.name, "bundles")
+        self.saved = (main.config.admin_token, main.config.bundles_dir)
+        main.config.bundles_dir = self.bundles_dir
+        # No `with`: the lifespan would start loading the served models in the background
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        main.config.admin_token, main.config.bundles_dir = self.saved
+        self.tmp_dir.cleanup()
+
+    def reload(self, bundle_dir: str, token: str = "secret"):
+        return self.client.post("/admin/reload", json={'bundle_dir': bundle_dir}, headers={'X-Admin-Token': token})
+
+    def test_disabled_without_token(self):
+        main.config.admin_token = None
+        self.assertEqual(self.reload("anything").status_code, 404)
+        self.assertEqual(self.client.get("/admin/bundle").status_code, 404)
+
+    def test_wrong_token(self):
+        main.config.admin_token = "secret"
+        self.assertEqual(self.reload("anything", token="guess").status_code, 401)
+
+    def test_rejects_paths_outside_bundles_dir(self):
+        main.config.admin_token = "secret"
+        source = build_pipeline()
+        outside = os.path.join(self.tmp_dir.name, "elsewhere")
+        write_bundle(outside, source.feature_transformer, source.models)
+
+        for bundle_dir in (outside, "../elsewhere", self.bundles_dir, "."):
+            with self.subTest(bundle_dir=bundle_dir):
+                self.assertEqual(self.reload(bundle_dir).status_code, 400)
+
+    def test_reloads_bundle_inside_bundles_dir(self):
+        main.config.admin_token = "secret"
+        source = build_pipeline()
+        inside = os.path.join(self.bundles_dir, "b1")
+        write_bundle(inside, source.feature_transformer, source.models)
+
+        response = self.reload("b1")
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(response.json()['model_version'], read_manifest(inside)['version'])
+
+
+if __name__ == "__main__":
+    unittest.main()
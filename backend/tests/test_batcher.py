@@ -0,0 +1,96 @@
+import time
+import asyncio
+import unittest
+from src.pipeline.batcher import MicroBatcher, QueueFullError
+
+
+class RecordingPredictor:
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def __call__(self, contents):
+        self.batches.append(list(contents))
+        time.sleep(self.delay)
+        return [{"prediction": content.upper()} for content in contents]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_a_batch(self):
+        predictor = RecordingPredictor()
+
+        async def scenario():
+            batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=50)
+            await batcher.start()
+            results = await asyncio.gather(*(batcher.submit(f"email {i}") for i in range(5)))
+            await batcher.stop()
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertEqual([r["prediction"] for r in results], [f"EMAIL {i}" for i in range(5)])
+        self.assertEqual(len(predictor.batches), 1)
+
+    def test_batches_respect_max_size(self):
+        predictor = RecordingPredictor()
+
+        async def scenario():
+            batcher = MicroBatcher(predictor, max_batch_size=3, max_wait_ms=20)
+            await batcher.start()
+            await asyncio.gather(*(batcher.submit(str(i)) for i in range(7)))
+            await batcher.stop()
+
+        asyncio.run(scenario())
+        self.assertEqual(sorted(len(batch) for batch in predictor.batches), [1, 3, 3])
+
+    def test_queue_full(self):
+        async def scenario():
+            batcher = MicroBatcher(RecordingPredictor(delay=0.2), max_batch_size=1, max_wait_ms=0,
+                                   max_queue_size=1, max_concurrent_batches=1)
+            await batcher.start()
+            first = asyncio.ensure_future(batcher.submit("a"))
+            await asyncio.sleep(0.05)  # "a" is being scored
+            second = asyncio.ensure_future(batcher.submit("b"))  # collected, waiting for a scoring slot
+            await asyncio.sleep(0.01)
+            third = asyncio.ensure_future(batcher.submit("c"))  # fills the queue
+            await asyncio.sleep(0.05)
+            with self.assertRaises(QueueFullError):
+                await batcher.submit("d")
+            await asyncio.gather(first, second, third)
+            await batcher.stop()
+
+        asyncio.run(scenario())
+
+    def test_stop_fails_the_batch_waiting_for_a_slot(self):
+        async def scenario():
+            batcher = MicroBatcher(RecordingPredictor(delay=0.2), max_batch_size=1, max_wait_ms=0,
+                                   max_concurrent_batches=1)
+            await batcher.start()
+            first = asyncio.ensure_future(batcher.submit("a"))
+            await asyncio.sleep(0.05)  # "a" is being scored
+            second = asyncio.ensure_future(batcher.submit("b"))  # collected, waiting for a scoring slot
+            await asyncio.sleep(0.01)
+            await batcher.stop()
+
+            self.assertEqual((await first)["prediction"], "A")
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(second, timeout=1)
+
+        asyncio.run(scenario())
+
+    def test_predictor_errors_propagate(self):
+        def failing(contents):
+            raise ValueError("boom")
+
+        async def scenario():
+            batcher = MicroBatcher(failing, max_wait_ms=1)
+            await batcher.start()
+            try:
+                with self.assertRaises(ValueError):
+                    await batcher.submit("x")
+            finally:
+                await batcher.stop()
+
+        asyncio.run(scenario())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+import unittest
+from src.utils.cache import PredictionCache
+
+
+class TestPredictionCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = PredictionCache(max_entries=2, ttl_seconds=None)
+        cache.put("a", {"prediction": "Spam"})
+        cache.put("b", {"prediction": "Ham"})
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", {"prediction": "Ham"})
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        cache = PredictionCache(max_entries=10, ttl_seconds=0.01)
+        cache.put("a", {"prediction": "Spam"})
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_hit_miss_counters(self):
+        cache = PredictionCache()
+        cache.get("missing")
+        cache.put("a", {"prediction": "Spam"})
+        cache.get("a")
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_returned_values_are_copies(self):
+        cache = PredictionCache()
+        cache.put("a", {"detailed_results": {"SVM": {"prediction": "Spam"}}})
+        cache.get("a")["detailed_results"]["SVM"]["prediction"] = "Ham"
+
+        self.assertEqual(cache.get("a")["detailed_results"]["SVM"]["prediction"], "Spam")
+
+    def test_key_depends_on_model_version(self):
+        self.assertNotEqual(PredictionCache.make_key("win cash", "v1"), PredictionCache.make_key("win cash", "v2"))
+        self.assertEqual(PredictionCache.make_key("win cash", "v1"), PredictionCache.make_key("win cash", "v1"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import re
+import random
+import unittest
+import pandas as pd
+from src.config.config import Config
+from src.utils.email_utils import clean_text
+
+
+def legacy_clean_text(text):
+    """The original six-pass implementation, kept as the reference behaviour."""
+    if not isinstance(text, str):
+        return text
+    text = re.sub(r'\$', ' dollar ', text)
+    text = re.sub(r'\£', ' pound ', text)
+    text = re.sub(r'\€', ' euro ', text)
+    text = re.sub(r'\b\d{3,}\b', ' num ', text)
+    text = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\u200B\u200C\u200D\u200E\u200F\uFEFF]', '', text)
+    text = text.encode("utf-16", "surrogatepass").decode("utf-16", "ignore")
+    text = text[:32767]
+    if text.startswith(("=", "+", "-", "@")):
+        text = "'" + text
+    return text
+
+
+EDGE_CASES = [
+    "",
+    "Hello World",
+    "Price is $50, was £1000 or €25000",
+    "$100$200£300€",
+    "call 09061701461 now",
+    "12 123 1234 12a345 a123",
+    "1\u200B23 and 12\u200B3456",
+    "x\x00y\x07z\x0b\x0c\x0e\x1f\x7f\t\n\r",
+    "\uFEFFBOM at start",
+    "=SUM(A1:A3)",
+    "+44 7700 900000",
+    "-dash",
+    "@mention",
+    "\u200B=hidden formula",
+    "'already quoted",
+    "emoji \U0001F600 and pair 😀",
+    "lone high \ud800 and lone low \udc00",
+    "split pair \ud83d\u200B\ude00",
+    "high then ascii \ud83dA",
+    "arabic digits ١٢٣ and fullwidth １２３",
+    "a" * 40000,
+    "$" * 5000,
+    None,
+    12345,
+]
+
+
+class TestCleanTextGolden(unittest.TestCase):
+    def test_edge_cases(self):
+        for text in EDGE_CASES:
+            with self.subTest(text=repr(text)[:60]):
+                self.assertEqual(clean_text(text), legacy_clean_text(text))
+
+    def test_dataset(self):
+        messages = pd.read_csv(Config().training_data_path)['Message']
+        for text in messages:
+            self.assertEqual(clean_text(text), legacy_clean_text(text))
+
+    def test_random_strings(self):
+        alphabet = list("ab Z09$£€=+-@\t\n\r\x00\x1b\u200B\u200F\uFEFF١😀\ud800\ud83d\ude00\udc00é漢") + ["\U0001F600"]
+        rng = random.Random(1234)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            self.assertEqual(clean_text(text), legacy_clean_text(text), repr(text))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from email.message import EmailMessage
+from src.utils.email_utils import _capped_payload, extract_body, html_to_text
+
+HTML_SAMPLES = [
+    "<html><body><p>Hello <b>there</b>,</p><p>Claim your &pound;1000 prize</p></body></html>",
+    "<div>Line one<br>Line two</div><script>var x = '<b>no</b>';</script><style>p {color: red}</style>",
+    "<table><tr><td>Cell&nbsp;A</td><td>Cell B</td></tr></table><!-- hidden comment -->",
+    "Unclosed <p>paragraph <a href='x'>link",
+    "Text with \\\\ backslashes and\ttabs\r\nand newlines",
+]
+
+
+def make_message(plain=None, html=None):
+    message = EmailMessage()
+    message["Subject"] = "Test"
+    if plain is not None:
+        message.set_content(plain)
+    if html is not None:
+        if plain is None:
+            message.set_content(html, subtype="html")
+        else:
+            message.add_alternative(html, subtype="html")
+    return message
+
+
+class TestExtractBody(unittest.TestCase):
+    def test_fast_extractor_matches_bs4(self):
+        for html in HTML_SAMPLES:
+            with self.subTest(html=html):
+                message = make_message(html=html)
+                self.assertEqual(extract_body(message), extract_body(message, html_extractor="bs4"))
+
+    def test_script_and_style_dropped(self):
+        text = html_to_text("<p>Visible</p><script>hidden()</script><style>.x{}</style>")
+        self.assertEqual(text.strip(), "Visible")
+
+    def test_plain_text_is_not_parsed(self):
+        message = make_message(plain="Use a <b> tag & 2 < 3")
+        self.assertEqual(extract_body(message), "Use a <b> tag & 2 < 3")
+
+    def test_multipart_joins_parts(self):
+        message = make_message(plain="Plain part", html="<p>HTML part</p>")
+        self.assertEqual(extract_body(message), "Plain part HTML part")
+
+    def test_part_size_cap(self):
+        message = make_message(plain="a" * 1000)
+        self.assertEqual(extract_body(message, max_part_bytes=100), "a" * 100)
+
+    def test_part_size_cap_applies_before_transfer_decoding(self):
+        body = "Claim your prize = now \u00e9t\u00e9 " * 5000
+        for cte in ("base64", "quoted-printable"):
+            with self.subTest(cte=cte):
+                message = EmailMessage()
+                message.set_content(body, cte=cte)
+                full = message.get_payload(decode=True)
+                # Only a few times the cap is decoded, not the whole part
+                payload = _capped_payload(message, 1000)
+                self.assertTrue(1000 <= len(payload) <= 3000 < len(full))
+                self.assertTrue(full.startswith(payload))
+                self.assertTrue(extract_body(message).startswith(extract_body(message, max_part_bytes=1000)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import time
+import threading
+import unittest
+from src.pipeline.ensemble import EnsembleExecutor, ERROR, TIMEOUT, SKIPPED
+
+
+def make_task(labels, delay=0.0):
+    def task():
+        time.sleep(delay)
+        return labels, [90.0] * len(labels)
+    return task
+
+
+def failing_task():
+    raise RuntimeError("model exploded")
+
+
+class TestEnsembleExecutor(unittest.TestCase):
+    def test_parallel_collects_all_models(self):
+        executor = EnsembleExecutor(max_workers=3)
+        outputs = executor.run({
+            "a": make_task(["Spam", "Ham"]),
+            "b": make_task(["Ham", "Ham"]),
+            "c": failing_task,
+        }, batch_size=2)
+        executor.shutdown()
+
+        self.assertEqual(list(outputs), ["a", "b", "c"])
+        self.assertEqual(outputs["a"][0], ["Spam", "Ham"])
+        self.assertEqual(outputs["c"], ERROR)
+
+    def test_model_timeout(self):
+        executor = EnsembleExecutor(max_workers=2, model_timeout=0.05)
+        start = time.perf_counter()
+        outputs = executor.run({
+            "fast": make_task(["Ham"]),
+            "slow": make_task(["Spam"], delay=1.0),
+        }, batch_size=1)
+        executor.shutdown()
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(outputs["slow"], TIMEOUT)
+        self.assertEqual(outputs["fast"][0], ["Ham"])
+
+    def test_model_timeout_covers_queued_tasks(self):
+        executor = EnsembleExecutor(max_workers=2, model_timeout=0.2)
+        release = threading.Event()
+        queued_ran = threading.Event()
+
+        def blocking_task():
+            release.wait(5)
+            return ["Spam"], [90.0]
+
+        def queued_task():
+            queued_ran.set()
+            return ["Ham"], [90.0]
+
+        start = time.perf_counter()
+        # Both workers are taken by the blocking tasks, so "queued" never starts before the deadline
+        outputs = executor.run({
+            "blocking_1": blocking_task,
+            "blocking_2": blocking_task,
+            "queued": queued_task,
+        }, batch_size=1)
+        elapsed = time.perf_counter() - start
+        release.set()
+        executor.pool.shutdown(wait=True)
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(outputs, {"blocking_1": TIMEOUT, "blocking_2": TIMEOUT, "queued": TIMEOUT})
+        # The queued task was cancelled rather than left to run on a pool thread
+        self.assertFalse(queued_ran.is_set())
+
+    def test_sequential_model_timeout(self):
+        executor = EnsembleExecutor(max_workers=1, model_timeout=0.05)
+        outputs = executor.run({
+            "slow": make_task(["Spam"], delay=0.1),
+            "next": make_task(["Ham"]),
+        }, batch_size=1)
+
+        # The running model finishes, the ones after the deadline are never started
+        self.assertEqual(outputs["slow"][0], ["Spam"])
+        self.assertEqual(outputs["next"], TIMEOUT)
+
+    def test_fast_path_skips_undecidable_models(self):
+        executor = EnsembleExecutor(max_workers=3, fast_path=True)
+        outputs = executor.run({
+            "a": make_task(["Spam", "Ham"]),
+            "b": make_task(["Spam", "Ham"]),
+            "slow": make_task(["Ham", "Spam"], delay=1.0),
+        }, batch_size=2)
+        executor.shutdown()
+
+        self.assertEqual(outputs["slow"], SKIPPED)
+
+    def test_sequential_fast_path(self):
+        executor = EnsembleExecutor(max_workers=1, fast_path=True)
+        outputs = executor.run({
+            "a": make_task(["Ham"]),
+            "b": make_task(["Ham"]),
+            "c": make_task(["Spam"]),
+            "d": make_task(["Spam"]),
+        }, batch_size=1)
+
+        # Two Ham votes out of four already rule out a strict Spam majority
+        self.assertEqual(outputs["c"], SKIPPED)
+        self.assertEqual(outputs["d"], SKIPPED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation
+from src.utils.feature_store import FeatureSet, FeatureStore, dataset_digest, feature_key
+from src.utils.state import TrainingState
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS
+
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = FeatureStore(os.path.join(self.tmp_dir.name, "features"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        vectorizer = TfidfVectorizer()
+        X = vectorizer.fit_transform(TRAIN_TEXTS)
+        labels = np.array(TRAIN_LABELS)
+        features = FeatureSet(
+            train_texts=TRAIN_TEXTS[:6], test_texts=TRAIN_TEXTS[6:],
+            train_index=np.arange(6), test_index=np.arange(6, len(TRAIN_TEXTS)),
+            y_train=labels[:6], y_test=labels[6:], X_train=X[:6], X_test=X[6:], vectorizer=vectorizer,
+        )
+        self.assertFalse(self.store.has("k1"))
+        self.store.save("k1", features)
+        self.assertTrue(self.store.has("k1"))
+
+        loaded = self.store.load("k1")
+        # Memory-mapped read-only, not copied
+        self.assertFalse(loaded.X_train.data.flags.writeable)
+        self.assertEqual(abs(loaded.X_train - X[:6]).max(), 0)
+        self.assertEqual(abs(loaded.X_test - X[6:]).max(), 0)
+        self.assertEqual(loaded.y_test.tolist(), labels[6:].tolist())
+        self.assertEqual(loaded.test_texts, TRAIN_TEXTS[6:])
+        self.assertEqual(abs(loaded.vectorizer.transform(TRAIN_TEXTS) - X).max(), 0)
+
+    def test_key(self):
+        split = {'test_size': 0.3}
+        key = feature_key("abc", TfidfVectorizer(), split)
+        self.assertEqual(key, feature_key("abc", TfidfVectorizer(), split))
+        self.assertNotEqual(key, feature_key("abd", TfidfVectorizer(), split))
+        self.assertNotEqual(key, feature_key("abc", TfidfVectorizer(max_features=10), split))
+        self.assertNotEqual(key, feature_key("abc", TfidfVectorizer(), {'test_size': 0.2}))
+
+    def test_pipeline_cache_hit(self):
+        data_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        categories = ["spam" if label == 0 else "ham" for label in TRAIN_LABELS]
+        pd.DataFrame({'Category': categories * 2, 'Message': TRAIN_TEXTS * 2}).to_csv(data_path, index=False)
+
+        def run() -> TrainingState:
+            ingestion, transformation = DataIngestion(), DataTransformation()
+            ingestion.config.training_data_path = data_path
+            ingestion.config.feature_store_dir = self.store.root
+            transformation.feature_store = self.store
+            return transformation.transform_data(ingestion.load_data(TrainingState()))
+
+        first = run()
+        self.assertFalse(first.features_cached)
+        self.assertIsNotNone(first.training_data)
+        self.assertTrue(self.store.has(first.feature_key))
+        self.assertEqual(first.feature_key, DataTransformation().feature_key(dataset_digest(data_path)))
+
+        second = run()
+        self.assertTrue(second.features_cached)
+        self.assertIsNone(second.training_data)
+        self.assertEqual(abs(second.X_train_tfidf - first.X_train_tfidf).max(), 0)
+        self.assertEqual(second.y_train.tolist(), first.y_train.tolist())
+        self.assertEqual(second.X_test.tolist(), first.X_test.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from src.components.model_factory import build_vectorizer
+from src.config.config import Config
+from src.utils.features import HashingTfidfVectorizer
+from tests.test_prediction_pipeline import TRAIN_TEXTS
+
+
+class TestHashingTfidfVectorizer(unittest.TestCase):
+    def test_matches_hashing_plus_tfidf(self):
+        vectorizer = HashingTfidfVectorizer(n_features=2 ** 12, stop_words='english')
+        features = vectorizer.fit_transform(TRAIN_TEXTS)
+
+        counts = HashingVectorizer(n_features=2 ** 12, stop_words='english', alternate_sign=False, norm=None)
+        expected = TfidfTransformer().fit_transform(counts.transform(TRAIN_TEXTS))
+        self.assertEqual(features.shape, (len(TRAIN_TEXTS), 2 ** 12))
+        self.assertAlmostEqual(abs(features - expected).max(), 0)
+        self.assertAlmostEqual(abs(vectorizer.transform(TRAIN_TEXTS) - features).max(), 0)
+
+    def test_rebuild_from_idf(self):
+        vectorizer = HashingTfidfVectorizer(n_features=2 ** 10, ngram_range=(1, 2)).fit(TRAIN_TEXTS)
+        rebuilt = HashingTfidfVectorizer.from_idf(vectorizer.to_params(), np.array(vectorizer.idf_))
+        self.assertAlmostEqual(abs(rebuilt.transform(TRAIN_TEXTS) - vectorizer.transform(TRAIN_TEXTS)).max(), 0)
+
+    def test_partial_fit_matches_fit(self):
+        vectorizer = HashingTfidfVectorizer(n_features=2 ** 12).fit(TRAIN_TEXTS)
+        streamed = HashingTfidfVectorizer(n_features=2 ** 12)
+        for start in range(0, len(TRAIN_TEXTS), 3):
+            streamed.partial_fit(TRAIN_TEXTS[start:start + 3])
+        self.assertEqual(streamed.n_documents_, len(TRAIN_TEXTS))
+        self.assertAlmostEqual(abs(streamed.idf_ - vectorizer.idf_).max(), 0)
+        self.assertAlmostEqual(abs(streamed.transform(TRAIN_TEXTS) - vectorizer.transform(TRAIN_TEXTS)).max(), 0)
+
+    def test_token_index(self):
+        vectorizer = HashingTfidfVectorizer(n_features=2 ** 10).fit(TRAIN_TEXTS)
+        analyzer = vectorizer.build_analyzer()
+        features = vectorizer.transform(TRAIN_TEXTS)
+        for row, text in enumerate(TRAIN_TEXTS):
+            self.assertEqual(sorted({vectorizer.token_index(token) for token in analyzer(text)}),
+                             sorted(features[row].indices))
+
+    def test_build_vectorizer(self):
+        config = Config()
+        self.assertIsInstance(build_vectorizer(config, max_features=5000), TfidfVectorizer)
+        config.feature_mode = "hashing"
+        vectorizer = build_vectorizer(config, max_features=5000, stop_words='english')
+        self.assertIsInstance(vectorizer, HashingTfidfVectorizer)
+        self.assertEqual(vectorizer.n_features, config.hashing_n_features)
+        config.feature_mode = "bag_of_words"
+        with self.assertRaises(ValueError):
+            build_vectorizer(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from src.components.hyperparameter_search import (
+    SEARCH_STRATEGIES, build_search, cached_folds, candidates_evaluated
+)
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS
+
+PARAM_GRID = {'alpha': [0.01, 0.1, 0.5, 1.0, 2.0, 5.0], 'fit_prior': [True, False]}
+
+
+class TestHyperparameterSearch(unittest.TestCase):
+    def setUp(self):
+        # Repeat the corpus so every halving round has enough samples per fold
+        self.texts = TRAIN_TEXTS * 6
+        self.labels = np.array(TRAIN_LABELS * 6)
+        self.features = TfidfVectorizer().fit_transform(self.texts)
+        self.folds = cached_folds(self.labels, n_splits=3)
+
+    def test_cached_folds(self):
+        self.assertEqual(len(self.folds), 3)
+        for train, test in self.folds:
+            self.assertEqual(len(set(train) & set(test)), 0)
+            # Stratified: both classes in every test fold
+            self.assertEqual(set(self.labels[test]), {0, 1})
+        self.assertEqual([test.tolist() for _, test in cached_folds(self.labels, n_splits=3)],
+                         [test.tolist() for _, test in self.folds])
+
+    def test_strategies(self):
+        for strategy in SEARCH_STRATEGIES:
+            with self.subTest(strategy=strategy):
+                search = build_search(MultinomialNB(), PARAM_GRID, strategy, cv=self.folds, n_jobs=1, n_iter=4)
+                search.fit(self.features, self.labels)
+                self.assertIn(search.best_params_['alpha'], PARAM_GRID['alpha'])
+                self.assertFalse(search.budget_exhausted_)
+                if strategy == "random":
+                    self.assertEqual(candidates_evaluated(search), 4)
+                if strategy == "grid":
+                    self.assertEqual(candidates_evaluated(search), 12)
+
+    def test_time_budget(self):
+        search = build_search(MultinomialNB(), PARAM_GRID, "grid", cv=self.folds, n_jobs=1, time_budget=0)
+        search.fit(self.features, self.labels)
+        self.assertTrue(search.budget_exhausted_)
+        # The first chunk always runs, then the search stops with what it has
+        self.assertEqual(candidates_evaluated(search), 1)
+        self.assertEqual(search.best_estimator_.predict(self.features).shape, (len(self.texts),))
+
+    def test_time_budget_every_strategy(self):
+        for strategy in SEARCH_STRATEGIES:
+            with self.subTest(strategy=strategy):
+                search = build_search(MultinomialNB(), PARAM_GRID, strategy, cv=self.folds, n_jobs=1, n_iter=4,
+                                      time_budget=0)
+                search.fit(self.features, self.labels)
+                self.assertTrue(search.budget_exhausted_)
+                self.assertIn(search.best_params_['alpha'], PARAM_GRID['alpha'])
+                self.assertEqual(search.best_estimator_.alpha, search.best_params_['alpha'])
+
+    def test_unspent_budget_matches_plain_search(self):
+        for strategy in ("grid", "random"):
+            with self.subTest(strategy=strategy):
+                plain = build_search(MultinomialNB(), PARAM_GRID, strategy, cv=self.folds, n_jobs=1, n_iter=4)
+                budgeted = build_search(MultinomialNB(), PARAM_GRID, strategy, cv=self.folds, n_jobs=1, n_iter=4,
+                                        time_budget=600)
+                plain.fit(self.features, self.labels)
+                budgeted.fit(self.features, self.labels)
+                self.assertFalse(budgeted.budget_exhausted_)
+                self.assertEqual(candidates_evaluated(budgeted), candidates_evaluated(plain))
+                self.assertAlmostEqual(budgeted.best_score_, plain.best_score_)
+                self.assertEqual(budgeted.cv_results_['rank_test_score'].min(), 1)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            build_search(MultinomialNB(), PARAM_GRID, "bayesian")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from src.components.incremental_training import IncrementalTraining
+from src.components.model_factory import build_logistic, LOGISTIC_SGD
+from src.utils.feedback import FeedbackStore
+from src.utils.model_store import BundleError, load_bundle, read_manifest, write_bundle
+from src.utils.scoring import from_label
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS
+
+NEW_SPAM = ["Exclusive crypto bonus, claim your reward token now"] * 5
+
+
+class TestIncrementalTraining(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        vectorizer = TfidfVectorizer().fit(TRAIN_TEXTS + NEW_SPAM)
+        features = vectorizer.transform(TRAIN_TEXTS)
+        self.models = {
+            "Naive_Bayes": MultinomialNB().fit(features, TRAIN_LABELS),
+            "Logistic_Regression": build_logistic(LOGISTIC_SGD).fit(features, TRAIN_LABELS),
+        }
+        self.bundle_dir = os.path.join(self.tmp_dir.name, "base")
+        write_bundle(self.bundle_dir, vectorizer, self.models)
+        self.trainer = IncrementalTraining()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_update_writes_new_bundle(self):
+        output_dir = os.path.join(self.tmp_dir.name, "updated")
+        base = load_bundle(self.bundle_dir)
+        base_counts = base.models["Naive_Bayes"].feature_count_.copy()
+        manifest = self.trainer.update_bundle(NEW_SPAM, [0] * len(NEW_SPAM), bundle_dir=self.bundle_dir,
+                                              output_dir=output_dir, metadata={'source': "test"})
+
+        self.assertEqual(manifest['parent_version'], read_manifest(self.bundle_dir)['version'])
+        self.assertEqual(manifest['metadata']['samples'], len(NEW_SPAM))
+        self.assertEqual(manifest['metadata']['source'], "test")
+
+        updated = load_bundle(output_dir)
+        features = updated.feature_transformer.transform(NEW_SPAM[:1])
+        for name in ("Naive_Bayes", "Logistic_Regression"):
+            self.assertIn(name, manifest['metadata']['updated_models'])
+            before = base.models[name].predict_proba(features)[0, 0]
+            self.assertGreater(updated.models[name].predict_proba(features)[0, 0], before)
+        # The source bundle is left untouched
+        np.testing.assert_array_equal(load_bundle(self.bundle_dir).models["Naive_Bayes"].feature_count_, base_counts)
+
+    def test_requires_partial_fit_model(self):
+        bundle_dir = os.path.join(self.tmp_dir.name, "static")
+        bundle = load_bundle(self.bundle_dir)
+        lr = LogisticRegression().fit(bundle.feature_transformer.transform(TRAIN_TEXTS), TRAIN_LABELS)
+        write_bundle(bundle_dir, bundle.feature_transformer, {"Logistic_Regression": lr})
+        with self.assertRaises(BundleError):
+            self.trainer.update_bundle(NEW_SPAM, [0] * len(NEW_SPAM), bundle_dir=bundle_dir)
+        with self.assertRaises(ValueError):
+            self.trainer.update_bundle([], [], bundle_dir=self.bundle_dir)
+
+
+class TestFeedbackStore(unittest.TestCase):
+    def test_read_from_offset(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = FeedbackStore(os.path.join(tmp_dir, "feedback", "feedback.jsonl"))
+            self.assertEqual(store.read_from(0), ([], [], 0))
+
+            store.append("Win a prize", "Spam")
+            store.append("Lunch at 1? café", "ham")
+            contents, labels, offset = store.read_from(0)
+            self.assertEqual((contents, labels), (["Win a prize", "Lunch at 1? café"], [0, 1]))
+
+            store.append("Free entry", "SPAM")
+            self.assertEqual(store.read_from(offset)[:2], (["Free entry"], [0]))
+
+            # A partially written record is left for the next reader
+            with open(store.path, "ab") as f:
+                f.write(b'{"label": "Spam"')
+            self.assertEqual(store.read_from(offset)[0], ["Free entry"])
+
+    def test_rejects_unknown_label(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = FeedbackStore(os.path.join(tmp_dir, "feedback.jsonl"))
+            with self.assertRaises(ValueError):
+                store.append("hello", "Promotions")
+            self.assertFalse(os.path.exists(store.path))
+        self.assertEqual(from_label(" Ham "), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import SVC, LinearSVC
+from src.components.model_factory import SVM_LINEAR, build_svm
+from src.utils.features import HashingTfidfVectorizer
+from src.utils.linear_scorer import LinearScorer
+from src.utils.scoring import inspect_model, score_single_pass
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS, build_pipeline
+
+TEST_TEXTS = [
+    "Claim your free prize now",
+    "lunch tomorrow? lunch lunch",
+    "",
+    "zzz qqq words the vectorizer never saw",
+    "URGENT you have won won won a free holiday, call now",
+]
+
+
+class TestLinearScorer(unittest.TestCase):
+    def fit(self, vectorizer: object, models: dict) -> dict:
+        features = vectorizer.fit_transform(TRAIN_TEXTS)
+        return {name: model.fit(features, TRAIN_LABELS) for name, model in models.items()}
+
+    def assert_matches_sklearn(self, vectorizer: object, models: dict) -> None:
+        scorer = LinearScorer.compile(vectorizer, models)
+        self.assertEqual(scorer.model_names, list(models))
+
+        outputs = scorer.score(TEST_TEXTS)
+        features = vectorizer.transform(TEST_TEXTS)
+        for name, model in models.items():
+            with self.subTest(model=name):
+                labels, confidences = score_single_pass(model, inspect_model(model), features)
+                self.assertEqual(outputs[name][0], labels)
+                np.testing.assert_allclose(outputs[name][1], confidences, rtol=1e-9, atol=1e-9)
+
+    def test_matches_predict_proba(self):
+        vectorizer = TfidfVectorizer()
+        models = self.fit(vectorizer, {
+            "Naive_Bayes": MultinomialNB(),
+            "Logistic_Regression": LogisticRegression(C=10),
+            "SGD": SGDClassifier(loss="log_loss", random_state=0),
+        })
+        self.assert_matches_sklearn(vectorizer, models)
+
+    def test_matches_decision_function(self):
+        vectorizer = TfidfVectorizer()
+        models = self.fit(vectorizer, {"SVM": SVC(kernel='linear'), "LinearSVC": LinearSVC()})
+        self.assert_matches_sklearn(vectorizer, models)
+
+    def test_matches_calibrated_linear_svc(self):
+        vectorizer = TfidfVectorizer()
+        models = self.fit(vectorizer, {"SVM": build_svm(SVM_LINEAR)})
+        self.assert_matches_sklearn(vectorizer, models)
+
+    def test_vectorizer_options(self):
+        for options in ({'sublinear_tf': True}, {'norm': None}, {'use_idf': False}, {'binary': True},
+                        {'ngram_range': (1, 2), 'stop_words': 'english'}):
+            with self.subTest(options=options):
+                vectorizer = TfidfVectorizer(**options)
+                models = self.fit(vectorizer, {"Logistic_Regression": LogisticRegression()})
+                self.assert_matches_sklearn(vectorizer, models)
+
+    def test_hashing_features(self):
+        vectorizer = HashingTfidfVectorizer(n_features=2 ** 10, sublinear_tf=True)
+        models = self.fit(vectorizer, {"Naive_Bayes": MultinomialNB(), "Logistic_Regression": LogisticRegression()})
+        self.assert_matches_sklearn(vectorizer, models)
+
+    def test_skips_non_linear_models(self):
+        vectorizer = TfidfVectorizer()
+        models = self.fit(vectorizer, {
+            "SVM": SVC(kernel='linear', probability=True),
+            "RBF": SVC(kernel='rbf'),
+            "Logistic_Regression": LogisticRegression(),
+        })
+        self.assertEqual(LinearScorer.compile(vectorizer, models).model_names, ["Logistic_Regression"])
+        self.assertIsNone(LinearScorer.compile(vectorizer, {"RBF": models["RBF"]}))
+
+    def test_pipeline_fast_path(self):
+        slow = build_pipeline()
+        fast = build_pipeline()
+        fast.bundle.linear_scorer = LinearScorer.compile(fast.feature_transformer, fast.models)
+        fast.models["SVM"] = slow.models["SVM"] = SVC(kernel='rbf', probability=True).fit(
+            slow.feature_transformer.transform(TRAIN_TEXTS), TRAIN_LABELS)
+
+        for fast_result, slow_result in zip(fast.predict_batch(TEST_TEXTS), slow.predict_batch(TEST_TEXTS)):
+            self.assertEqual(fast_result['prediction'], slow_result['prediction'])
+            self.assertEqual(list(fast_result['detailed_results']), list(slow_result['detailed_results']))
+            for name, detail in fast_result['detailed_results'].items():
+                self.assertEqual(detail['prediction'], slow_result['detailed_results'][name]['prediction'])
+                self.assertAlmostEqual(detail['confidence'], slow_result['detailed_results'][name]['confidence'])
+
+
+if __name__ == "__main__":
+    unittest.main()
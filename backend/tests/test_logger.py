@@ -0,0 +1,105 @@
+import os
+import json
+import logging
+import tempfile
+import unittest
+from src.config.config import Config
+from src.utils.logger import LogBackend, SamplingFilter, worker_log_file
+
+
+def make_record(message: str, level: int = logging.INFO, lineno: int = 10, created: float = 0.0) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, "test.py", lineno, message, None, None)
+    record.created = created
+    return record
+
+
+class TestLogBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = Config()
+        self.config.log_file = os.path.join(self.tmp_dir.name, "app.log")
+        self.logger = logging.getLogger(f"test_logger.{self.id()}")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_lines(self):
+        with open(self.config.log_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_records(self):
+        backend = LogBackend(self.config).start()
+        backend.attach(self.logger)
+        self.logger.info("scored %d emails", 3, extra={'model': "SVM"})
+        try:
+            raise ValueError("bad input")
+        except ValueError:
+            self.logger.error("model failed", exc_info=True)
+        backend.stop()
+
+        info, error = self.read_lines()
+        self.assertEqual(info['message'], "scored 3 emails")
+        self.assertEqual(info['level'], "INFO")
+        self.assertEqual(info['model'], "SVM")
+        self.assertNotIn('exception', info)
+        self.assertIn("ValueError: bad input", error['exception'])
+
+    def test_level(self):
+        self.config.log_level = "warning"
+        backend = LogBackend(self.config).start()
+        backend.attach(self.logger)
+        self.logger.info("hidden")
+        self.logger.warning("shown")
+        backend.stop()
+        self.assertEqual([line['message'] for line in self.read_lines()], ["shown"])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        self.config.log_queue_size = 2
+        self.config.log_sample_limit = None
+        # Not started: nothing drains the queue
+        backend = LogBackend(self.config)
+        backend.attach(self.logger)
+        for index in range(5):
+            self.logger.info(f"record {index}")
+        self.assertEqual(backend.handler.dropped, 3)
+
+        backend.start()
+        backend.stop()
+        self.assertEqual([line['message'] for line in self.read_lines()], ["record 0", "record 1"])
+
+    def test_size_rotation(self):
+        self.config.log_max_bytes = 1000
+        self.config.log_backup_count = 2
+        self.config.log_sample_limit = None
+        backend = LogBackend(self.config).start()
+        backend.attach(self.logger)
+        for index in range(100):
+            self.logger.info(f"record {index}")
+        backend.stop()
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["app.log", "app.log.1", "app.log.2"])
+
+    def test_worker_log_file(self):
+        self.assertEqual(worker_log_file("worker-0", self.config), os.path.join(self.tmp_dir.name, "app.worker-0.log"))
+
+
+class TestSamplingFilter(unittest.TestCase):
+    def test_limit_per_call_site(self):
+        sampler = SamplingFilter(limit=2, window=60)
+        passed = [sampler.filter(make_record(f"hot {index}", created=index)) for index in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+        # Other call sites are counted separately, and records above ERROR are never sampled
+        self.assertTrue(sampler.filter(make_record("other", lineno=20, created=5)))
+        self.assertTrue(sampler.filter(make_record("critical", level=logging.CRITICAL, created=5)))
+        self.assertEqual(sampler.suppressed, 3)
+
+    def test_dropped_count_is_reported_after_window(self):
+        sampler = SamplingFilter(limit=1, window=60)
+        for index in range(4):
+            sampler.filter(make_record("hot", created=index))
+        record = make_record("hot", created=61)
+        self.assertTrue(sampler.filter(record))
+        self.assertEqual(record.sampled_out, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
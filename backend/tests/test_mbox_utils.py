@@ -0,0 +1,105 @@
+import os
+import mailbox
+import tempfile
+import unittest
+from email.message import EmailMessage
+from src.utils.mbox_utils import MmapMbox, find_shards, iter_mbox_range
+
+
+class MboxTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "box.mbox")
+        box = mailbox.mbox(self.path)
+        for index in range(25):
+            message = EmailMessage()
+            message["Subject"] = f"Message {index}"
+            # Escaped and unescaped "From" inside bodies must not confuse the splitter
+            message.set_content(f"Body {index}\n>From the archive\nFrom-ish line\n" + "x" * (index * 37))
+            box.add(message)
+        box.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+class TestMboxSharding(MboxTestCase):
+    def test_shards_cover_file(self):
+        shards = find_shards(self.path, 7)
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], os.path.getsize(self.path))
+        for (_, end), (start, _) in zip(shards, shards[1:]):
+            self.assertEqual(end, start)
+
+    def test_sharded_messages_match_mailbox(self):
+        expected = [message.as_bytes() for message in mailbox.mbox(self.path)]
+        for shard_count in (1, 3, 7, 50):
+            messages = [
+                message.as_bytes()
+                for start, end in find_shards(self.path, shard_count)
+                for message in iter_mbox_range(self.path, start, end)
+            ]
+            self.assertEqual(messages, expected, f"{shard_count} shards")
+
+    def test_empty_file(self):
+        open(self.path, "wb").close()
+        self.assertEqual(find_shards(self.path, 4), [])
+
+class TestMmapMbox(MboxTestCase):
+    def test_messages_match_mailbox(self):
+        expected = list(mailbox.mbox(self.path))
+        with MmapMbox(self.path) as box:
+            self.assertEqual(len(box), len(expected))
+            self.assertEqual([m.as_bytes() for m in box], [m.as_bytes() for m in expected])
+            self.assertEqual([m.get_from() for m in box], [m.get_from() for m in expected])
+            self.assertEqual(box[13]["Subject"], "Message 13")
+
+    def test_long_from_line(self):
+        box = mailbox.mbox(self.path)
+        message = mailbox.mboxMessage()
+        message.set_from("sender@example.com " + "x" * 2000)
+        message["Subject"] = "Long envelope"
+        message.set_payload("Body after a long From line\n")
+        box.add(message)
+        box.close()
+
+        expected = list(mailbox.mbox(self.path))[-1]
+        with MmapMbox(self.path) as reopened:
+            loaded = reopened[len(reopened) - 1]
+        self.assertEqual(loaded["Subject"], "Long envelope")
+        self.assertEqual(loaded.get_payload(), "Body after a long From line\n")
+        self.assertEqual(loaded.get_from(), expected.get_from())
+
+    def test_index_is_persisted_and_reused(self):
+        with MmapMbox(self.path) as box:
+            starts = box.starts.copy()
+        self.assertTrue(os.path.exists(self.path + ".idx.npz"))
+
+        with MmapMbox(self.path) as box:
+            box._build_index = None  # Reopening must not rescan the file
+            self.assertTrue((box.starts == starts).all())
+
+    def test_stale_index_is_rebuilt(self):
+        MmapMbox(self.path).close()
+        box = mailbox.mbox(self.path)
+        message = EmailMessage()
+        message["Subject"] = "Late arrival"
+        message.set_content("new")
+        box.add(message)
+        box.close()
+
+        with MmapMbox(self.path) as reopened:
+            self.assertEqual(len(reopened), 26)
+            self.assertEqual(reopened[25]["Subject"], "Late arrival")
+
+    def test_index_shards(self):
+        with MmapMbox(self.path) as box:
+            messages = [
+                message.as_bytes()
+                for start, end in box.shards(4)
+                for message in box.iter_byte_range(start, end)
+            ]
+            self.assertEqual(messages, [m.as_bytes() for m in box])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import unittest
+from src.utils.metrics import MODEL_SECONDS, STAGE_SECONDS, MetricsRegistry
+from tests.test_prediction_pipeline import build_pipeline
+
+
+def sample(text: str, line_start: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not found in:\n{text}")
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        counter = self.registry.counter("requests_total", "Requests", ("route",))
+        counter.labels("/predict").inc()
+        counter.labels("/predict").inc(2)
+        text = self.registry.expose()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertEqual(sample(text, 'requests_total{route="/predict"}'), 3)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        text = self.registry.expose()
+        self.assertEqual(sample(text, 'latency_seconds_bucket{le="0.1"}'), 2)
+        self.assertEqual(sample(text, 'latency_seconds_bucket{le="1"}'), 3)
+        self.assertEqual(sample(text, 'latency_seconds_bucket{le="+Inf"}'), 4)
+        self.assertEqual(sample(text, "latency_seconds_count"), 4)
+        self.assertAlmostEqual(sample(text, "latency_seconds_sum"), 2.65)
+
+    def test_observations_from_many_threads(self):
+        counter = self.registry.counter("events_total", "Events")
+
+        def work() -> None:
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sample(self.registry.expose(), "events_total"), 8000)
+
+    def test_callback(self):
+        values = [None]
+        self.registry.callback("queue_depth", "Queue depth", lambda: values[0])
+        self.assertNotIn("\nqueue_depth ", self.registry.expose())
+        values[0] = 7
+        self.assertEqual(sample(self.registry.expose(), "queue_depth"), 7)
+
+    def test_label_values_are_escaped(self):
+        self.registry.counter("odd_total", "Odd", ("name",)).labels('a"b\\c').inc()
+        self.assertIn('odd_total{name="a\\"b\\\\c"} 1', self.registry.expose())
+
+
+class TestPipelineInstrumentation(unittest.TestCase):
+    def count(self, child) -> float:
+        counts, _ = child.snapshot()
+        return sum(counts)
+
+    def test_stages_and_models_are_timed(self):
+        pipeline = build_pipeline()
+        pipeline.cache = None
+        stages = {stage: STAGE_SECONDS.labels(stage) for stage in ("clean", "vectorize", "consensus")}
+        models = {name: MODEL_SECONDS.labels(name) for name in pipeline.models}
+        before = {child: self.count(child) for child in list(stages.values()) + list(models.values())}
+
+        pipeline.predict_batch(["Claim your free prize", "Lunch tomorrow?"])
+        for child, count in before.items():
+            self.assertEqual(self.count(child), count + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
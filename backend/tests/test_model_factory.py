@@ -0,0 +1,31 @@
+import unittest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.components.model_factory import SVM_VARIANTS, build_ensemble_models, build_svm
+from src.config.config import Config
+from src.utils.scoring import inspect_model, PREDICT_PROBA
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS
+
+
+class TestModelFactory(unittest.TestCase):
+    def test_svm_variants(self):
+        features = TfidfVectorizer().fit_transform(TRAIN_TEXTS)
+        for variant in SVM_VARIANTS:
+            with self.subTest(variant=variant):
+                model = build_svm(variant, n_components=4).fit(features, TRAIN_LABELS)
+                self.assertEqual(inspect_model(model).method, PREDICT_PROBA)
+                self.assertEqual(model.predict_proba(features).shape, (len(TRAIN_TEXTS), 2))
+
+    def test_unknown_variant(self):
+        with self.assertRaises(ValueError):
+            build_svm("rbf")
+
+    def test_ensemble_follows_config(self):
+        config = Config()
+        config.svm_variant = "linear_svc"
+        models = build_ensemble_models(config)
+        self.assertEqual(list(models), ["SVM", "Naive_Bayes", "Random_Forest", "Logistic_Regression"])
+        self.assertEqual(type(models["SVM"]).__name__, "CalibratedClassifierCV")
+
+
+if __name__ == "__main__":
+    unittest.main()
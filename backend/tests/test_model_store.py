@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from src.utils.features import HashingTfidfVectorizer
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.model_store import (
+    BundleError, MANIFEST_NAME, find_latest_bundle, load_bundle, read_manifest, write_bundle
+)
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS, build_pipeline
+
+
+class ModelStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source = build_pipeline()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_bundle(self, name: str, C: float = 1.0) -> str:
+        models = dict(self.source.models)
+        if C != 1.0:
+            # A different model gives the bundle a different version
+            features = self.source.feature_transformer.transform(TRAIN_TEXTS)
+            models["Logistic_Regression"] = LogisticRegression(C=C).fit(features, TRAIN_LABELS)
+        bundle_dir = os.path.join(self.tmp_dir.name, name)
+        write_bundle(bundle_dir, self.source.feature_transformer, models, metadata={'note': name})
+        return bundle_dir
+
+
+class TestModelBundle(ModelStoreTestCase):
+    def test_round_trip(self):
+        bundle_dir = self.write_bundle("b1")
+        manifest = read_manifest(bundle_dir)
+        self.assertEqual(set(manifest['models']), {"Naive_Bayes", "Logistic_Regression"})
+        self.assertEqual(manifest['metadata'], {'note': "b1"})
+
+        bundle = load_bundle(bundle_dir)
+        self.assertEqual(bundle.version, manifest['version'])
+        self.assertEqual(set(bundle.scoring_specs), set(bundle.models))
+        features = bundle.feature_transformer.transform(["Claim your free prize"])
+        for name, model in bundle.models.items():
+            expected = self.source.models[name].predict_proba(self.source.feature_transformer.transform(["Claim your free prize"]))
+            self.assertEqual(model.predict_proba(features).tolist(), expected.tolist())
+
+    def test_hashing_features(self):
+        vectorizer = HashingTfidfVectorizer(n_features=2 ** 12)
+        features = vectorizer.fit_transform(TRAIN_TEXTS)
+        bundle_dir = os.path.join(self.tmp_dir.name, "hashing")
+        write_bundle(bundle_dir, vectorizer, {"Naive_Bayes": MultinomialNB().fit(features, TRAIN_LABELS)})
+
+        manifest = read_manifest(bundle_dir)
+        self.assertEqual(manifest['feature']['file'], "idf.npy")
+        self.assertFalse(os.path.exists(os.path.join(bundle_dir, "vectorizer.joblib")))
+
+        bundle = load_bundle(bundle_dir)
+        self.assertIsInstance(bundle.feature_transformer, HashingTfidfVectorizer)
+        self.assertAlmostEqual(abs(bundle.feature_transformer.transform(TRAIN_TEXTS) - features).max(), 0)
+
+        pipeline = PredictionPipeline(load_models=False)
+        pipeline.config.bundle_dir = bundle_dir
+        self.assertEqual(pipeline.predict_single_email("Claim your free prize now")['prediction'], "Spam")
+        self.assertEqual(pipeline.bundle.linear_scorer.model_names, ["Naive_Bayes"])
+
+    def test_checksum_mismatch(self):
+        bundle_dir = self.write_bundle("b1")
+        with open(os.path.join(bundle_dir, "Naive_Bayes_model.joblib"), "ab") as f:
+            f.write(b"tampered")
+
+        with self.assertRaises(BundleError):
+            load_bundle(bundle_dir)
+        load_bundle(bundle_dir, verify=False)
+
+    def test_existing_bundle_is_never_overwritten(self):
+        bundle_dir = self.write_bundle("b1")
+        version = read_manifest(bundle_dir)['version']
+        with self.assertRaises(FileExistsError):
+            self.write_bundle("b1", C=10.0)
+
+        self.assertEqual(load_bundle(bundle_dir).version, version)
+        # No temporary directory is left behind
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["b1"])
+
+    def edit_manifest(self, bundle_dir: str, **changes) -> None:
+        manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest.update(changes)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+    def test_find_latest_bundle(self):
+        self.assertIsNone(find_latest_bundle(self.tmp_dir.name))
+        older, newer = self.write_bundle("older"), self.write_bundle("newer")
+        # Written within the same second, still told apart
+        self.assertEqual(find_latest_bundle(self.tmp_dir.name), newer)
+
+        self.edit_manifest(newer, created_at="2000-01-01T00:00:00")
+        self.assertEqual(find_latest_bundle(self.tmp_dir.name), older)
+
+    def test_find_latest_bundle_ties(self):
+        first, second = self.write_bundle("b1"), self.write_bundle("b2")
+        self.edit_manifest(first, created_at="2000-01-01T00:00:00", version="2000-01-01_00-00-00-bbbbbbbb")
+        self.edit_manifest(second, created_at="2000-01-01T00:00:00", version="2000-01-01_00-00-00-aaaaaaaa")
+        self.assertEqual(find_latest_bundle(self.tmp_dir.name), first)
+
+
+class TestPipelineBundleLoading(ModelStoreTestCase):
+    def build(self, bundle_dir: str) -> PredictionPipeline:
+        pipeline = PredictionPipeline(load_models=False)
+        pipeline.config.bundle_dir = bundle_dir
+        return pipeline
+
+    def test_background_load(self):
+        bundle_dir = self.write_bundle("b1")
+        pipeline = self.build(bundle_dir)
+        self.assertFalse(pipeline.is_ready())
+
+        pipeline.start_background_load().join(timeout=30)
+        self.assertTrue(pipeline.is_ready())
+        self.assertEqual(pipeline.model_version, read_manifest(bundle_dir)['version'])
+        loaded, = pipeline.predict_batch(["Claim your free prize now"])
+        expected, = self.source.predict_batch(["Claim your free prize now"])
+        self.assertEqual(loaded['prediction'], expected['prediction'])
+        self.assertAlmostEqual(loaded['confidence'], expected['confidence'], places=6)
+
+    def test_background_load_failure(self):
+        pipeline = self.build(os.path.join(self.tmp_dir.name, "missing"))
+        pipeline.start_background_load().join(timeout=30)
+        self.assertFalse(pipeline.is_ready())
+        self.assertIsNotNone(pipeline.load_error)
+
+    def test_predict_loads_lazily(self):
+        pipeline = self.build(self.write_bundle("b1"))
+        self.assertFalse(pipeline.is_ready())
+        self.assertEqual(pipeline.predict_single_email("See you at lunch")['prediction'], "Ham")
+        self.assertTrue(pipeline.is_ready())
+
+
+class TestHotReload(ModelStoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pipeline = PredictionPipeline(load_models=False)
+        self.pipeline.config.bundle_dir = self.write_bundle("b1")
+        self.pipeline.ensure_loaded()
+
+    def test_reload_swaps_bundle(self):
+        old_bundle = self.pipeline.bundle
+        self.pipeline.predict_single_email("See you at lunch")
+        new_dir = self.write_bundle("b2", C=10.0)
+
+        info = self.pipeline.reload_bundle(new_dir)
+        self.assertEqual(info['previous_version'], old_bundle.version)
+        self.assertEqual(info['model_version'], read_manifest(new_dir)['version'])
+        self.assertNotEqual(info['model_version'], info['previous_version'])
+        self.assertIsNot(self.pipeline.bundle, old_bundle)
+        self.assertEqual(self.pipeline.cache_stats()['entries'], 0)
+
+        # A request that took the old bundle before the swap still scores with it
+        self.assertEqual(len(self.pipeline._score_cleaned(["see you at lunch"], old_bundle)), 1)
+
+    def test_failed_reload_keeps_bundle(self):
+        version = self.pipeline.model_version
+        bad_dir = self.write_bundle("bad", C=10.0)
+        with open(os.path.join(bad_dir, "vectorizer.joblib"), "ab") as f:
+            f.write(b"tampered")
+
+        with self.assertRaises(BundleError):
+            self.pipeline.reload_bundle(bad_dir)
+        self.assertEqual(self.pipeline.model_version, version)
+        self.assertTrue(self.pipeline.is_ready())
+
+    def test_predictions_continue_during_reload(self):
+        new_dir = self.write_bundle("b2", C=10.0)
+        errors, stop = [], threading.Event()
+
+        def predict() -> None:
+            while not stop.is_set():
+                for result in self.pipeline.predict_batch(["Claim your free prize", "lunch tomorrow?"]):
+                    if result['prediction'] not in ("Spam", "Ham"):
+                        errors.append(result)
+
+        workers = [threading.Thread(target=predict) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        try:
+            for bundle_dir in (new_dir, self.pipeline.config.bundle_dir, new_dir):
+                self.pipeline.reload_bundle(bundle_dir)
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        self.assertEqual(errors, [])
+
+    def test_bundle_watcher(self):
+        self.pipeline.config.bundle_dir = None
+        self.pipeline.config.bundles_dir = os.path.join(self.tmp_dir.name, "watched")
+        self.pipeline.start_bundle_watcher(interval=0.05)
+        try:
+            new_dir = self.write_bundle(os.path.join("watched", "b2"), C=10.0)
+            expected = read_manifest(new_dir)['version']
+            deadline = time.time() + 10
+            while self.pipeline.model_version != expected and time.time() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(self.pipeline.model_version, expected)
+        finally:
+            self.pipeline.stop_bundle_watcher()
+
+
+if __name__ == "__main__":
+    unittest.main()
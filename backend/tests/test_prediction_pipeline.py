@@ -0,0 +1,192 @@
+import os
+import csv
+import mailbox
+import tempfile
+import unittest
+from email.message import EmailMessage
+from sklearn.dummy import DummyClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import SVC, LinearSVC
+from src.pipeline.ensemble import EnsembleExecutor
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.linear_scorer import LinearScorer
+from src.utils.scoring import inspect_model, score_single_pass, score_two_pass, DECISION_FUNCTION, PREDICT_PROBA
+
+TRAIN_TEXTS = [
+    "WINNER! Claim your free prize now, call 09061701461",
+    "Free entry to win cash prizes, text WIN to 80086",
+    "URGENT! You have won a guaranteed dollar num award",
+    "Congratulations, you won a free holiday, claim now",
+    "Are we still meeting for lunch tomorrow?",
+    "I'll call you when I get home tonight",
+    "Can you send me the notes from class?",
+    "Thanks for dinner, see you at the weekend",
+]
+TRAIN_LABELS = [0, 0, 0, 0, 1, 1, 1, 1]
+
+
+def build_pipeline() -> PredictionPipeline:
+    vectorizer = TfidfVectorizer()
+    features = vectorizer.fit_transform(TRAIN_TEXTS)
+
+    pipeline = PredictionPipeline(load_models=False)
+    pipeline.feature_transformer = vectorizer
+    pipeline.models = {
+        "Naive_Bayes": MultinomialNB().fit(features, TRAIN_LABELS),
+        "Logistic_Regression": LogisticRegression().fit(features, TRAIN_LABELS),
+    }
+    return pipeline
+
+
+class TestPredictionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = build_pipeline()
+
+    def test_predict_batch_matches_single(self):
+        emails = ["Claim your free prize now", "See you at lunch tomorrow", ""]
+        batch_results = self.pipeline.predict_batch(emails)
+
+        self.assertEqual(len(batch_results), len(emails))
+        for email, batch_result in zip(emails, batch_results):
+            self.assertEqual(batch_result, self.pipeline.predict_single_email(email))
+
+    def test_predict_batch_empty(self):
+        self.assertEqual(self.pipeline.predict_batch([]), [])
+
+    def test_predict_batch_consensus(self):
+        spam, ham = self.pipeline.predict_batch(["WINNER! Claim your free prize now", "See you at dinner tonight"])
+        self.assertEqual(spam['prediction'], "Spam")
+        self.assertEqual(spam['spam_score'], "2/2 Models")
+        self.assertEqual(ham['prediction'], "Ham")
+        self.assertEqual(set(ham['detailed_results']), {"Naive_Bayes", "Logistic_Regression"})
+
+    def test_dense_fitted_svm_still_scored(self):
+        # SVC fitted on a dense matrix rejects CSR input, so the pipeline densifies for it
+        dense_features = self.pipeline.feature_transformer.transform(TRAIN_TEXTS).toarray()
+        self.pipeline.models["SVM"] = SVC(kernel='linear', probability=True).fit(dense_features, TRAIN_LABELS)
+
+        result = self.pipeline.predict_single_email("Claim your free prize now")
+        self.assertIn(result['detailed_results']["SVM"]['prediction'], ("Spam", "Ham"))
+
+    def test_ensemble_fast_path_counts_linear_votes(self):
+        # LR and NB are scored on the linear fast path, the two constant models by the ensemble executor
+        features = self.pipeline.feature_transformer.transform(TRAIN_TEXTS)
+        self.pipeline.models["HamModel"] = DummyClassifier(strategy="constant", constant=1).fit(features, TRAIN_LABELS)
+        self.pipeline.models["SpamModel"] = DummyClassifier(strategy="constant", constant=0).fit(features, TRAIN_LABELS)
+        self.pipeline.bundle.linear_scorer = LinearScorer.compile(self.pipeline.feature_transformer, self.pipeline.models)
+        self.assertEqual(self.pipeline.bundle.linear_scorer.model_names, ["Naive_Bayes", "Logistic_Regression"])
+        self.pipeline.ensemble = EnsembleExecutor(max_workers=1, fast_path=True)
+
+        result = self.pipeline.predict_single_email("WINNER! Claim your free prize now")
+        self.assertEqual(result['prediction'], "Spam")
+        self.assertEqual(result['spam_score'], "3/4 Models")
+        self.assertEqual(result['detailed_results']["SpamModel"]['prediction'], "Spam")
+
+    def test_reset_after_fork_keeps_ensemble_workers(self):
+        self.pipeline.config.ensemble_workers = 3
+        self.pipeline.config.model_timeout = 2.0
+        # As serve.py workers do after the fork
+        self.pipeline.reset_after_fork()
+        self.addCleanup(self.pipeline.ensemble.shutdown)
+        self.assertEqual(self.pipeline.ensemble.max_workers, 3)
+        self.assertEqual(self.pipeline.ensemble.model_timeout, 2.0)
+        self.assertEqual(self.pipeline.predict_single_email("See you at lunch")['prediction'], "Ham")
+
+        # Mailbox scan shards parallelise across processes instead
+        self.pipeline.reset_after_fork(workers=1)
+        self.assertIsNone(self.pipeline.ensemble.pool)
+
+    def test_repeated_emails_served_from_cache(self):
+        self.pipeline.predict_batch(["Claim your free prize now", "Claim your free prize now"])
+        stats = self.pipeline.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (0, 1, 1))
+
+        self.pipeline.predict_single_email("Claim your free prize now")
+        self.assertEqual(self.pipeline.cache_stats()['hits'], 1)
+
+    def test_single_pass_matches_two_pass(self):
+        features = self.pipeline.feature_transformer.transform(["Claim your free prize", "lunch tomorrow?"])
+        for model in self.pipeline.models.values():
+            spec = inspect_model(model)
+            self.assertEqual(spec.method, PREDICT_PROBA)
+            single_labels, single_conf = score_single_pass(model, spec, features)
+            two_labels, two_conf = score_two_pass(model, spec, features)
+            self.assertEqual(single_labels, two_labels)
+            for a, b in zip(single_conf, two_conf):
+                self.assertAlmostEqual(a, b)
+
+    def test_decision_function_model(self):
+        features = self.pipeline.feature_transformer.transform(TRAIN_TEXTS)
+        model = LinearSVC().fit(features, TRAIN_LABELS)
+        spec = inspect_model(model)
+        self.assertEqual(spec.method, DECISION_FUNCTION)
+
+        labels, confidences = score_single_pass(model, spec, features)
+        self.assertEqual(labels, ["Spam" if str(label) == "0" else "Ham" for label in model.predict(features)])
+        self.assertTrue(all(50 <= confidence <= 100 for confidence in confidences))
+
+        # Both scoring modes report the same confidence for margin-based models
+        two_labels, two_confidences = score_two_pass(model, spec, features)
+        self.assertEqual(two_labels, labels)
+        for a, b in zip(confidences, two_confidences):
+            self.assertAlmostEqual(a, b)
+
+def write_mbox(path: str, bodies) -> None:
+    box = mailbox.mbox(path)
+    for index, body in enumerate(bodies):
+        message = EmailMessage()
+        message["From"] = f"sender{index}@example.com"
+        message["To"] = "me@example.com"
+        message["Subject"] = f"Message {index}"
+        message["X-Gmail-Labels"] = "Inbox"
+        message.set_content(body)
+        box.add(message)
+    box.close()
+
+
+class TestMailboxStreaming(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = build_pipeline()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.mbox_path = os.path.join(self.tmp_dir.name, "inbox.mbox")
+        self.bodies = ["WINNER! Claim your free prize now", "See you at lunch tomorrow"] * 5
+        write_mbox(self.mbox_path, self.bodies)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stream_mbox_predictions(self):
+        output_path = os.path.join(self.tmp_dir.name, "predictions.csv")
+        count = self.pipeline.stream_mbox_predictions(self.mbox_path, output_path, batch_size=3)
+
+        with open(output_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(count, len(self.bodies))
+        self.assertEqual([row["Subject"] for row in rows], [f"Message {i}" for i in range(len(self.bodies))])
+        self.assertEqual([row["Prediction"] for row in rows[:2]], ["Spam", "Ham"])
+
+    def test_parallel_scan_matches_sequential(self):
+        sequential_path = os.path.join(self.tmp_dir.name, "sequential.csv")
+        parallel_path = os.path.join(self.tmp_dir.name, "parallel.csv")
+        self.pipeline.stream_mbox_predictions(self.mbox_path, sequential_path, workers=1)
+        count = self.pipeline.stream_mbox_predictions(self.mbox_path, parallel_path, batch_size=2, workers=3)
+
+        with open(sequential_path, encoding="utf-8") as f1, open(parallel_path, encoding="utf-8") as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(count, len(self.bodies))
+
+    def test_iter_mailbox_is_lazy(self):
+        records = self.pipeline.iter_mailbox(self.mbox_path)
+        first = next(records)
+        self.assertEqual(first["Body"], self.bodies[0])
+        records.close()
+
+    def test_run_prediction(self):
+        mail_data = self.pipeline.run_prediction(self.pipeline.process_mailbox(self.mbox_path))
+        self.assertEqual(len(mail_data), len(self.bodies))
+        self.assertEqual(mail_data[0]["Prediction"], "Spam")
+
+if __name__ == '__main__':
+    unittest.main()
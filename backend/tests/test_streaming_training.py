@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.components.data_ingestion import DataIngestion
+from src.components.streaming_training import StreamingTraining
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.model_store import load_bundle
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS
+
+
+class TestStreamingTraining(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        # Numbered copies so the held-out rows (chosen by text hash) include both classes
+        texts = [f"{text} {index}" for index in range(20) for text in TRAIN_TEXTS]
+        categories = ["spam" if label == 0 else "ham" for label in TRAIN_LABELS] * 20
+        pd.DataFrame({'Category': categories + ["unknown"], 'Message': texts + ["unlabeled"]}).to_csv(self.data_path, index=False)
+        self.ingestion = DataIngestion()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_chunks(self):
+        chunks = list(self.ingestion.iter_chunks(self.data_path, chunk_size=50))
+        self.assertTrue(all(len(chunk) == 50 for chunk in chunks[:-1]))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(TRAIN_TEXTS) * 20 + 1)
+        self.assertEqual(str(chunks[0]['Message'].dtype), "string")
+        self.assertEqual(str(chunks[0]['Category'].dtype), "category")
+
+    def test_train_bundle(self):
+        trainer = StreamingTraining()
+        trainer.config.hashing_n_features = 2 ** 12
+        output_dir = os.path.join(self.tmp_dir.name, "bundle")
+        manifest = trainer.train(lambda: self.ingestion.iter_chunks(self.data_path, chunk_size=37), output_dir=output_dir)
+
+        metadata = manifest['metadata']
+        test_samples = metadata['metrics']['Naive_Bayes']['test_samples']
+        # The unknown label is dropped; every labeled row is either trained on or held out
+        self.assertEqual(metadata['train_samples'] + test_samples, len(TRAIN_TEXTS) * 20)
+        self.assertGreater(test_samples, 0)
+        self.assertEqual(set(metadata['metrics']), {"Naive_Bayes", "Logistic_Regression"})
+
+        self.assertEqual(set(load_bundle(output_dir).models), {"Naive_Bayes", "Logistic_Regression"})
+        pipeline = PredictionPipeline(load_models=False)
+        pipeline.config.bundle_dir = output_dir
+        self.assertEqual(pipeline.predict_single_email("Claim your free prize now")['prediction'], "Spam")
+        self.assertEqual(pipeline.predict_single_email("See you at lunch tomorrow")['prediction'], "Ham")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+from src.components.hyperparameter_search import build_search, cached_folds
+from src.components.training_scheduler import CpuBudget, SearchJob, TrainingScheduler
+from tests.test_prediction_pipeline import TRAIN_LABELS, TRAIN_TEXTS
+
+
+class TestTrainingScheduler(unittest.TestCase):
+    def setUp(self):
+        self.features = TfidfVectorizer().fit_transform(TRAIN_TEXTS * 3)
+        self.labels = np.array(TRAIN_LABELS * 3)
+        self.folds = cached_folds(self.labels, n_splits=3)
+
+    def jobs(self):
+        return [
+            SearchJob("Naive_Bayes", build_search(MultinomialNB(), {'alpha': [0.1, 1.0]}, cv=self.folds), cost=2),
+            SearchJob("Logistic_Regression", build_search(LogisticRegression(), {'C': [0.1, 1, 10]}, cv=self.folds), cost=6),
+        ]
+
+    def test_allocate(self):
+        jobs = TrainingScheduler(cpu_budget=8).allocate(self.jobs())
+        self.assertEqual([job.name for job in jobs], ["Logistic_Regression", "Naive_Bayes"])
+        self.assertEqual([job.cores for job in jobs], [6, 2])
+
+        # Every job gets at least one core and never more than the budget
+        jobs = TrainingScheduler(cpu_budget=1).allocate(self.jobs())
+        self.assertEqual([job.cores for job in jobs], [1, 1])
+
+    def test_parallel_matches_sequential(self):
+        parallel = TrainingScheduler(cpu_budget=2).run(self.jobs(), self.features, self.labels)
+        sequential = TrainingScheduler(cpu_budget=2, parallel=False).run(self.jobs(), self.features, self.labels)
+        self.assertEqual(set(parallel), {"Naive_Bayes", "Logistic_Regression"})
+        for name, (search, seconds) in parallel.items():
+            self.assertGreater(seconds, 0)
+            self.assertEqual(search.best_params_, sequential[name][0].best_params_)
+            self.assertEqual(search.best_estimator_.predict(self.features).tolist(),
+                             sequential[name][0].best_estimator_.predict(self.features).tolist())
+
+    def test_cpu_budget_blocks(self):
+        budget = CpuBudget(2)
+        budget.acquire(2)
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (budget.acquire(1), acquired.set()))
+        waiter.start()
+        self.assertFalse(acquired.wait(0.1))
+        budget.release(2)
+        self.assertTrue(acquired.wait(5))
+        waiter.join()
+        self.assertEqual(budget.available, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,24 @@
 import pandas as pd
+import numpy as np
 import pickle
+import inspect
+import hashlib
 import os
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.model_selection import train_test_split
-from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score, confusion_matrix, roc_curve, auc, classification_report
 from src.utils.email_utils import clean_text
+from src.utils.model_store import new_bundle_dir, write_bundle
+from src.utils.feature_store import FeatureSet, FeatureStore, dataset_digest, feature_key
+from src.components.model_factory import build_ensemble_models, build_vectorizer
+from src.config.config import Config
 
 # Paths
 DATA_PATH = "backend/data/dataset/dataset.csv"
 MODEL_OUTPUT_DIR = "backend/outputs/models"
+BUNDLE_OUTPUT_DIR = "backend/outputs/bundles"
+FEATURE_STORE_DIR = "backend/outputs/feature_store"
 IMAGE_OUTPUT_DIR = "frontend/public/images"
 
 # Ensure directories exist
@@ -19,13 +26,19 @@ os.makedirs(MODEL_OUTPUT_DIR, exist_ok=True)
 os.makedirs(IMAGE_OUTPUT_DIR, exist_ok=True)
 
 import json
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
 
 # ... (Previous imports remain, ensure all necessary are present)
 
-def train_and_evaluate():
+def load_features(vectorizer):
+    """Cleaned text, fitted vectorizer and train/test split, from the feature store when unchanged"""
+    store = FeatureStore(FEATURE_STORE_DIR)
+    # The key covers the dataset bytes, the vectorizer settings, the split and the text cleaning code
+    key = feature_key(dataset_digest(DATA_PATH), vectorizer, {'test_size': 0.2, 'random_state': 42},
+                      extra={'clean_text': hashlib.sha256(inspect.getsource(clean_text).encode("utf-8")).hexdigest()})
+    if store.has(key):
+        print(f"Using cached features {key}...")
+        return store.load(key)
+
     print("Loading dataset...")
     df = pd.read_csv(DATA_PATH)
     
@@ -41,20 +54,28 @@ def train_and_evaluate():
     
     # Vectorization
     print("Vectorizing text...")
-    vectorizer = TfidfVectorizer(max_features=5000)
-    X = vectorizer.fit_transform(df['clean_text']).toarray()
-    y = df['target']
+    # Kept as a CSR matrix: every model below trains natively on sparse input
+    X = vectorizer.fit_transform(df['clean_text'])
+    y = df['target'].to_numpy()
     
     # Split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    train_index, test_index = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+    features = FeatureSet(
+        train_texts=df['clean_text'].iloc[train_index].tolist(), test_texts=df['clean_text'].iloc[test_index].tolist(),
+        train_index=train_index, test_index=test_index, y_train=y[train_index], y_test=y[test_index],
+        X_train=X[train_index], X_test=X[test_index], vectorizer=vectorizer
+    )
+    store.save(key, features)
+    return features
+
+def train_and_evaluate():
+    features = load_features(build_vectorizer(Config(), max_features=5000))
+    vectorizer = features.vectorizer
+    X_train, X_test, y_train, y_test = features.X_train, features.X_test, features.y_train, features.y_test
     
     # Define Models
-    models = {
-        "SVM": SVC(kernel='sigmoid', gamma=1.0, probability=True),
-        "Naive Bayes": MultinomialNB(),
-        "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
-        "Logistic Regression": LogisticRegression(max_iter=1000)
-    }
+    # The SVM implementation follows Config.svm_variant
+    models = {name.replace("_", " "): model for name, model in build_ensemble_models(Config()).items()}
     
     results = {}
     best_model_name = ""
@@ -99,6 +120,12 @@ def train_and_evaluate():
     # Save Vectorizer (Common for all)
     print("Saving vectorizer...")
     pickle.dump(vectorizer, open(os.path.join(MODEL_OUTPUT_DIR, "vectorizer.pkl"), "wb"))
+
+    # Versioned bundle with a checksummed manifest; the API serves the newest one
+    bundle_dir = new_bundle_dir(BUNDLE_OUTPUT_DIR)
+    trained = {name.replace(" ", "_"): model for name, model in models.items()}
+    manifest = write_bundle(bundle_dir, vectorizer, trained, metadata={'best_model': best_model_name})
+    print(f"Saved bundle {manifest['version']} to {bundle_dir}")
     
     # --- Visualization ---
     
@@ -0,0 +1,54 @@
+import argparse
+from src.config.config import Config
+from src.components.incremental_training import IncrementalTraining
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.feedback import FeedbackStore
+from src.utils.model_store import find_latest_bundle, read_manifest
+
+
+def main():
+    config = Config()
+    parser = argparse.ArgumentParser(
+        description="Update the partial_fit models of a bundle with newly labeled emails and write a new bundle")
+    parser.add_argument("--bundle", default=None, help="Bundle to update (default: newest in Config.bundles_dir)")
+    parser.add_argument("--feedback", default=config.feedback_path,
+                        help="Feedback log; only records added since the bundle was built are used")
+    parser.add_argument("--mbox", default=None, help="Labeled .mbox file to train on")
+    parser.add_argument("--mbox-label", choices=["spam", "ham", "gmail"], default="gmail",
+                        help="Label for every message of --mbox, or 'gmail' to use its X-Gmail-Labels")
+    parser.add_argument("-o", "--output", default=None, help="New bundle directory (default: Config.bundles_dir/<timestamp>)")
+    args = parser.parse_args()
+
+    bundle_dir = args.bundle or find_latest_bundle(config.bundles_dir)
+    if bundle_dir is None:
+        raise SystemExit(f"No bundle found in {config.bundles_dir}; run `python -m src.utils.model_store bundle` first")
+
+    # Continue the feedback log where the parent bundle stopped reading it
+    parent_metadata = read_manifest(bundle_dir).get('metadata', {})
+    offset = parent_metadata.get('feedback_offset', 0) if parent_metadata.get('feedback_path') == args.feedback else 0
+    emails, labels, offset = FeedbackStore(args.feedback).read_from(offset)
+    print(f"{len(emails)} new feedback labels")
+
+    if args.mbox:
+        reader = PredictionPipeline(load_models=False)
+        mbox_count = 0
+        for record in reader.iter_mailbox(args.mbox):
+            is_spam = record["Category"] == "Spam" if args.mbox_label == "gmail" else args.mbox_label == "spam"
+            emails.append(record["Body"])
+            labels.append(0 if is_spam else 1)
+            mbox_count += 1
+        print(f"{mbox_count} labeled emails from {args.mbox}")
+
+    if not emails:
+        print("No new labeled emails; bundle unchanged")
+        return
+
+    manifest = IncrementalTraining().update_bundle(
+        emails, labels, bundle_dir=bundle_dir, output_dir=args.output,
+        metadata={'feedback_path': args.feedback, 'feedback_offset': offset}
+    )
+    print(f"Wrote bundle {manifest['version']} (updated {', '.join(manifest['metadata']['updated_models'])})")
+
+
+if __name__ == "__main__":
+    main()